@@ -5,17 +5,23 @@ Uses Crawlee for intelligent crawling and Trafilatura for universal content extr
 """
 
 import asyncio
-import xml.etree.ElementTree as ET
+import inspect
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 import re
 
 from crawlee.crawlers import BeautifulSoupCrawler, BeautifulSoupCrawlingContext
 from crawlee.storages import Dataset
 from trafilatura import extract, extract_metadata
 from trafilatura.settings import use_config
+from trafilatura.utils import load_html
 import trafilatura
 
+from crawl_profiler import PageProfiler
+from html_cache import HtmlCache
+from html_parsers import PARSER_BACKENDS, parse_html, resolve_parser
+from sitemap_reader import SitemapEntry, iter_sitemap_urls
+
 
 class AdvancedMultiSiteCrawler:
     """
@@ -28,45 +34,44 @@ class AdvancedMultiSiteCrawler:
     - Better handling of different website structures
     """
     
-    def __init__(self, sitemap_path: str, output_dir: str = "output"):
+    def __init__(self, sitemap_path: str, output_dir: str = "output", parser: str = "lxml",
+                 profile: bool = False):
         """Initialize the advanced crawler."""
         self.sitemap_path = sitemap_path
         self.output_dir = Path(output_dir)
         self.dataset = None
+        # BeautifulSoup backend used by Crawlee for code/link extraction
+        self.parser = resolve_parser(parser)
+        # Profiles the extraction of each page (profile.* in the output directory)
+        self.profiler: Optional[PageProfiler] = PageProfiler() if profile else None
         
         # Configure trafilatura for better extraction
         self.config = use_config()
         self.config.set("DEFAULT", "EXTRACTION_TIMEOUT", "0")
         
-    def parse_sitemap(self) -> List[Dict[str, str]]:
-        """Parse sitemap XML and extract URLs."""
-        tree = ET.parse(self.sitemap_path)
-        root = tree.getroot()
-        namespace = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-        
-        urls = []
-        for url_elem in root.findall('ns:url', namespace):
-            loc = url_elem.find('ns:loc', namespace)
-            lastmod = url_elem.find('ns:lastmod', namespace)
-            priority = url_elem.find('ns:priority', namespace)
-            
-            if loc is not None:
-                urls.append({
-                    'url': loc.text,
-                    'lastmod': lastmod.text if lastmod is not None else '',
-                    'priority': priority.text if priority is not None else ''
-                })
+    def parse_sitemap(self) -> Dict[str, SitemapEntry]:
+        """
+        Parse sitemap XML and extract URLs (plain, gzip-compressed or
+        sitemap index), streamed entry by entry.
         
-        return urls
+        Returns:
+            Sitemap entries keyed by URL, in sitemap order
+        """
+        return {entry.url: entry for entry in iter_sitemap_urls(self.sitemap_path)}
     
-    def extract_with_trafilatura(self, html: str, url: str) -> Dict:
+    def extract_with_trafilatura(self, html, url: str) -> Dict:
         """
         Use Trafilatura to intelligently extract content from any website.
         This works across different website structures automatically.
         """
+        # Parse once and share the tree (extract() works on a copy of it)
+        tree = load_html(html)
+        if tree is None:
+            tree = html
+        
         # Extract main content with metadata
         extracted_text = extract(
-            html,
+            tree,
             output_format='markdown',
             include_comments=False,
             include_tables=True,
@@ -75,12 +80,9 @@ class AdvancedMultiSiteCrawler:
             config=self.config
         )
         
-        # Extract metadata separately for more control
-        metadata = extract_metadata(html)
-        
         # Also get JSON format for structured data
         extracted_json = extract(
-            html,
+            tree,
             output_format='json',
             include_comments=False,
             include_tables=True,
@@ -89,6 +91,9 @@ class AdvancedMultiSiteCrawler:
             config=self.config
         )
         
+        # Extract metadata separately for more control
+        metadata = extract_metadata(tree)
+        
         result = {
             'url': url,
             'markdown_content': extracted_text or '',
@@ -288,6 +293,91 @@ class AdvancedMultiSiteCrawler:
         
         return filename
     
+    def process_page(self, html, soup, url: str, sitemap_meta: Dict) -> Dict:
+        """
+        Extract a fetched page and save its markdown file.
+        
+        Args:
+            html: Raw HTML of the page
+            soup: BeautifulSoup object of the page
+            url: Page URL
+            sitemap_meta: Sitemap data of the page
+        
+        Returns:
+            Dictionary with the filename, extracted data, code snippets and links
+        """
+        # Use Trafilatura for intelligent content extraction
+        extracted_data = self.extract_with_trafilatura(html, url)
+        
+        # Extract additional elements
+        code_snippets = self.extract_code_snippets(soup)
+        links = self.extract_links(soup, url)
+        
+        # Create markdown
+        markdown = self.create_markdown_output(
+            extracted_data, 
+            code_snippets, 
+            links,
+            sitemap_meta
+        )
+        
+        # Save to file
+        filename = self.url_to_filename(url)
+        output_path = self.output_dir / filename
+        
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(markdown)
+        
+        return {
+            'filename': filename,
+            'extracted_data': extracted_data,
+            'code_snippets': code_snippets,
+            'links': links
+        }
+    
+    def profile_page(self, source: str, cache_dir: Optional[str] = None, repeat: int = 20) -> bool:
+        """
+        Profile the parsing and extraction of one page, repeated to get stable
+        numbers, without crawling.
+        
+        Args:
+            source: Page URL (read from the HTML cache) or path of an HTML file
+            cache_dir: HTML cache directory written by crawler.py --cache-dir
+            repeat: Number of times the page is processed
+        
+        Returns:
+            True if the page was profiled, False if it could not be loaded
+        """
+        if not self.profiler:
+            self.profiler = PageProfiler()
+        
+        if Path(source).is_file():
+            html = Path(source).read_bytes()
+            url = f"https://example.com/{Path(source).stem}"
+        else:
+            url = source
+            response = None
+            if cache_dir:
+                cache = HtmlCache(Path(cache_dir))
+                cache.load()
+                response = cache.get(url)
+            if response is None:
+                print(f"✗ {source} is neither an HTML file nor a page in the HTML cache")
+                return False
+            html = response.content
+        
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        print(f"⏱ Profiling {url} ({len(html) / 1024:.1f} KB) x {repeat}")
+        
+        def parse_and_process():
+            return self.process_page(html, parse_html(html, self.parser), url, {})
+        
+        for _ in range(max(1, repeat)):
+            self.profiler.call(url, parse_and_process)
+        
+        self.profiler.print_summary(self.profiler.write(self.output_dir))
+        return True
+    
     async def crawl(self):
         """Main crawl method using Crawlee and Trafilatura."""
         # Create output directory
@@ -295,11 +385,8 @@ class AdvancedMultiSiteCrawler:
         print(f"📁 Output directory: {self.output_dir}")
         
         # Parse sitemap
-        urls = self.parse_sitemap()
-        print(f"🔍 Found {len(urls)} URLs in sitemap\n")
-        
-        # Create sitemap lookup for metadata
-        sitemap_lookup = {item['url']: item for item in urls}
+        sitemap_lookup = self.parse_sitemap()
+        print(f"🔍 Found {len(sitemap_lookup)} URLs in sitemap\n")
         
         # Statistics
         stats = {
@@ -310,7 +397,8 @@ class AdvancedMultiSiteCrawler:
         
         # Initialize Crawlee crawler with adjusted settings
         crawler = BeautifulSoupCrawler(
-            max_requests_per_crawl=len(urls) + 10,  # Add buffer
+            parser=self.parser,
+            max_requests_per_crawl=len(sitemap_lookup) + 10,  # Add buffer
             max_request_retries=3,
             max_crawl_depth=0,  # Don't follow links, only crawl provided URLs
             max_session_rotations=1,
@@ -327,36 +415,25 @@ class AdvancedMultiSiteCrawler:
             url = context.request.url
             stats['processed'] += 1
             
-            print(f"[{stats['processed']}/{len(urls)}] Processing: {url}")
+            print(f"[{stats['processed']}/{len(sitemap_lookup)}] Processing: {url}")
             
             try:
-                # Get the HTML content
-                html = str(context.soup)
-                
-                # Use Trafilatura for intelligent content extraction
-                extracted_data = self.extract_with_trafilatura(html, url)
-                
-                # Extract additional elements
-                code_snippets = self.extract_code_snippets(context.soup)
-                links = self.extract_links(context.soup, url)
+                # Get the raw HTML instead of re-serializing the parsed soup
+                html = context.http_response.read()
+                if inspect.isawaitable(html):
+                    html = await html
                 
                 # Get sitemap metadata
                 sitemap_meta = sitemap_lookup.get(url, {})
                 
-                # Create markdown
-                markdown = self.create_markdown_output(
-                    extracted_data, 
-                    code_snippets, 
-                    links,
-                    sitemap_meta
-                )
-                
-                # Save to file
-                filename = self.url_to_filename(url)
-                output_path = self.output_dir / filename
-                
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(markdown)
+                if self.profiler:
+                    page = self.profiler.call(url, self.process_page, html, context.soup, url, sitemap_meta)
+                else:
+                    page = self.process_page(html, context.soup, url, sitemap_meta)
+                filename = page['filename']
+                extracted_data = page['extracted_data']
+                code_snippets = page['code_snippets']
+                links = page['links']
                 
                 print(f"  ✓ Saved: {filename}")
                 print(f"    - {len(code_snippets)} code snippets")
@@ -378,7 +455,7 @@ class AdvancedMultiSiteCrawler:
                 print(f"  ✗ Error: {e}")
         
         # Run the crawler with all URLs from sitemap
-        url_list = [url_data['url'] for url_data in urls]
+        url_list = list(sitemap_lookup)
         print(f"🚀 Starting crawl of {len(url_list)} URLs...\n")
         
         await crawler.run(url_list)
@@ -387,10 +464,12 @@ class AdvancedMultiSiteCrawler:
         print("\n" + "="*50)
         print("📊 Crawling Summary")
         print("="*50)
-        print(f"Total URLs: {len(urls)}")
+        print(f"Total URLs: {len(sitemap_lookup)}")
         print(f"✓ Successful: {stats['successful']}")
         print(f"✗ Failed: {stats['failed']}")
         print(f"📁 Files saved to: {self.output_dir.absolute()}")
+        if self.profiler:
+            self.profiler.print_summary(self.profiler.write(self.output_dir))
         print("="*50)
 
 
@@ -411,9 +490,42 @@ async def main():
         default='output',
         help='Output directory for markdown files'
     )
+    parser.add_argument(
+        '--parser',
+        default='lxml',
+        choices=['auto'] + PARSER_BACKENDS,
+        help='BeautifulSoup parser backend for code and link extraction (default: lxml)'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Profile page extraction and write profile.txt, profile.pstats and '
+             'profile.collapsed (flamegraph input) to the output directory'
+    )
+    parser.add_argument(
+        '--profile-page',
+        metavar='URL_OR_FILE',
+        help='Only profile the extraction of one page, read from --cache-dir or a local HTML file'
+    )
+    parser.add_argument(
+        '--profile-repeat',
+        type=int,
+        default=20,
+        help='Times --profile-page processes the page (default: 20)'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        help='HTML cache written by crawler.py --cache-dir, for --profile-page URLs'
+    )
     
     args = parser.parse_args()
     
+    if args.profile_page:
+        crawler = AdvancedMultiSiteCrawler(args.sitemap, args.output, parser=args.parser, profile=True)
+        if not crawler.profile_page(args.profile_page, args.cache_dir, args.profile_repeat):
+            raise SystemExit(1)
+        return
+    
     print("🚀 Advanced Multi-Website Crawler")
     print("=" * 50)
     print("Features:")
@@ -426,7 +538,8 @@ async def main():
     print("=" * 50)
     print()
     
-    crawler = AdvancedMultiSiteCrawler(args.sitemap, args.output)
+    crawler = AdvancedMultiSiteCrawler(args.sitemap, args.output, parser=args.parser,
+                                       profile=args.profile)
     await crawler.crawl()
 
 
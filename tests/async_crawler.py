@@ -0,0 +1,682 @@
+#!/usr/bin/env python3
+"""
+Async Safe Documentation Crawler
+asyncio engine for SafeDocsCrawler on httpx: HTTP/2 multiplexing, pooled
+connections and streamed response bodies. Sitemap discovery, page fetching,
+navigation link harvesting and recursive enqueueing all run on one event
+loop, so several sites can be crawled in one process. Extraction and outputs
+are shared with the threaded crawler.
+
+Usage:
+    python crawler.py --engine async [options]
+    python async_crawler.py --site SITEMAP BASE_DOMAIN OUTPUT [--site ...]
+"""
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from crawler import SafeDocsCrawler, extract_page_in_worker
+from html_cache import CachedResponse
+from sitemap_reader import SitemapEntry
+
+
+# Pages larger than this are abandoned while their body streams in
+MAX_PAGE_BYTES = 20 * 1024 * 1024
+
+
+class StreamedResponse(CachedResponse):
+    """
+    Response-like object holding a page body read from an httpx stream,
+    accepted everywhere the crawler handles a requests.Response.
+    """
+    
+    def __init__(self, url: str, status_code: int, content: bytes, headers: Dict[str, str]):
+        super().__init__(url, content, headers)
+        self.status_code = status_code
+
+
+class AsyncSafeDocsCrawler(SafeDocsCrawler):
+    """
+    SafeDocsCrawler driven by asyncio. crawl() and process_page() keep their
+    signatures and outputs; crawl_async() and process_page_async() are the
+    coroutines behind them for callers that already run an event loop.
+    """
+    
+    def __init__(self, *args, http2: bool = True, max_page_bytes: int = MAX_PAGE_BYTES, **kwargs):
+        """
+        Initialize the crawler.
+        
+        Args:
+            *args, **kwargs: SafeDocsCrawler arguments; concurrency is the
+                number of requests in flight at first, max_concurrency the
+                most the adaptive rate control may grow to
+            http2: Whether to negotiate HTTP/2 (needs the h2 package)
+            max_page_bytes: Size above which a page download is abandoned
+        """
+        super().__init__(*args, **kwargs)
+        self.http2 = http2
+        self.max_page_bytes = max_page_bytes
+        self.client: Optional[httpx.AsyncClient] = None
+        self.request_slots: Optional[asyncio.Semaphore] = None
+        # Set whenever a host's request slot is released or its limit changes
+        self.slot_released: Optional[asyncio.Event] = None
+        # Loop the client runs on, and robots.txt downloads in flight per origin
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.robots_refreshes: Dict[str, asyncio.Task] = {}
+    
+    def build_client(self) -> httpx.AsyncClient:
+        """
+        Create the HTTP client, falling back to HTTP/1.1 without the h2 package.
+        
+        Returns:
+            httpx.AsyncClient with one pooled connection per request in flight
+        """
+        options = {
+            'headers': {'User-Agent': self.session.headers['User-Agent']},
+            'limits': httpx.Limits(max_connections=self.max_concurrency,
+                                   max_keepalive_connections=self.max_concurrency),
+            'follow_redirects': True,
+            'timeout': 30,
+        }
+        if self.http2:
+            try:
+                return httpx.AsyncClient(http2=True, **options)
+            except ImportError:
+                print("⚠ HTTP/2 needs the h2 package (pip install 'httpx[http2]'), using HTTP/1.1")
+                self.http2 = False
+        return httpx.AsyncClient(**options)
+    
+    @asynccontextmanager
+    async def client_session(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Open the HTTP client unless it is already open, and close it on exit."""
+        if self.client is not None:
+            yield self.client
+            return
+        self.request_slots = asyncio.Semaphore(self.max_concurrency)
+        self.slot_released = asyncio.Event()
+        async with self.build_client() as client:
+            self.client = client
+            self.loop = asyncio.get_running_loop()
+            try:
+                yield client
+            finally:
+                for task in self.robots_refreshes.values():
+                    task.cancel()
+                self.client = None
+                self.loop = None
+    
+    def crawl(self, delay: float = 1.0, resume: bool = False):
+        """
+        Crawl on a new event loop. See crawl_async.
+        
+        Args:
+            delay: Delay between requests in seconds (per host and request slot)
+            resume: Whether to continue an interrupted crawl from its journal
+        """
+        asyncio.run(self.crawl_async(delay, resume))
+    
+    async def crawl_async(self, delay: float = 1.0, resume: bool = False):
+        """
+        Crawl all URLs from the sitemap and recursively follow links.
+        Politeness comes from the per-host adaptive rate control (starting at
+        concurrency / delay requests per second unless requests_per_second is
+        set).
+        
+        Args:
+            delay: Delay between requests in seconds
+            resume: Whether to continue an interrupted crawl from its journal
+        """
+        delay = self.open_crawl(delay)
+        self.setup_rate_limiter(delay)
+        
+        async with self.client_session():
+            restored = False
+            if self.checkpoint_every or resume:
+                restored = self.open_journal(resume)
+            if not restored:
+                await self.initialize_queue_async()
+            if self.journal:
+                self.write_checkpoint()
+            
+            if self.extract_workers and self.profiler:
+                # Extraction processes are out of the profiler's reach
+                print("⚠ --profile extracts on worker threads, ignoring --extract-workers")
+                self.extract_workers = 0
+            if self.extract_workers:
+                self.start_extract_pool()
+            protocol = 'HTTP/2 where offered (TLS)' if self.http2 else 'HTTP/1.1'
+            print(f"Async crawling: {self.concurrency} requests in flight (up to {self.max_concurrency}) "
+                  f"over {protocol}, {self.rate_limiter.rate:.2f} req/s per host")
+            
+            try:
+                if self.crawl_phase == 'main':
+                    await self.process_queue_async()
+                    self.end_main_phase()
+                
+                # Process the navigation links
+                await self.process_queue_async(navigation=True)
+            finally:
+                self.close_crawl()
+        
+        self.finish_crawl()
+    
+    async def initialize_queue_async(self):
+        """Seed the queue with the sitemap URLs at depth 0."""
+        if self.use_xml_sitemaps:
+            # Rarely used; the xml-sitemaps.com client stays on requests
+            await asyncio.to_thread(self.resolve_sitemap_source)
+        sitemap_urls = await self.parse_sitemap_async(self.sitemap_path)
+        if self.respect_robots:
+            # Load robots.txt here so seeding does not block the event loop on it
+            origins = dict.fromkeys(self.robots.origin(entry.url) for entry in sitemap_urls)
+            await asyncio.gather(*(self.load_robots_async(origin) for origin in origins))
+        self.seed_queue(sitemap_urls)
+    
+    async def process_queue_async(self, navigation: bool = False):
+        """
+        Process the URL queue until it is empty.
+        
+        Like the threaded concurrent mode, the queue is drained one depth
+        level at a time through a bounded window of tasks whose results are
+        merged in queue order, so the crawl matches a sequential one.
+        
+        Args:
+            navigation: Whether this is the navigation link pass
+        """
+        window_size = self.max_concurrency * 2 + self.extract_workers * 2
+        
+        while self.url_queue:
+            level_depth = self.url_queue.peek()[2]
+            window = deque()
+            try:
+                while True:
+                    while (len(window) < window_size and self.url_queue
+                           and self.url_queue.peek()[2] == level_depth):
+                        entry = self.url_queue.popleft()
+                        url, _, depth, _ = entry
+                        if self.claim_url(url, depth, count_skipped=not navigation):
+                            task = asyncio.ensure_future(self.fetch_and_extract_async(*entry))
+                            window.append((self.stats['total_visited'], entry, task))
+                    if not window:
+                        break
+                    
+                    number, (url, parent_url, depth, _), task = window[0]
+                    result = await task
+                    window.popleft()
+                    self.print_page_header(number, url, parent_url, depth, navigation)
+                    if result and self.auto_discover_sitemaps and depth == 0:
+                        await self.enqueue_discovered_sitemaps_async(url)
+                    # Entries still in flight go back to the frontier if a checkpoint is written
+                    self.complete_page(url, parent_url, depth, result, navigation,
+                                       pending=[pending_entry for _, pending_entry, _ in window])
+            finally:
+                for _, _, task in window:
+                    task.cancel()
+    
+    def process_page(self, url: str, parent_url: Optional[str] = None,
+                     depth: int = 0, sitemap_data: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Process a single page on a new event loop. See process_page_async.
+        
+        Returns:
+            Dictionary with all extracted data or None if failed
+        """
+        return asyncio.run(self.process_page_async(url, parent_url, depth, sitemap_data))
+    
+    async def process_page_async(self, url: str, parent_url: Optional[str] = None,
+                                 depth: int = 0, sitemap_data: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Process a single page and extract all data.
+        
+        Args:
+            url: URL to process
+            parent_url: Parent URL that linked to this page
+            depth: Current crawling depth
+            sitemap_data: Optional data from sitemap
+        
+        Returns:
+            Dictionary with all extracted data or None if failed
+        """
+        async with self.client_session():
+            result = await self.fetch_and_extract_async(url, parent_url, depth, sitemap_data)
+            if not result:
+                return None
+            if self.auto_discover_sitemaps and depth == 0:
+                await self.enqueue_discovered_sitemaps_async(url)
+        
+        page_data, nav_links = result
+        self.merge_page(url, parent_url, depth, page_data, nav_links)
+        return page_data
+    
+    async def fetch_and_extract_async(self, url: str, parent_url: Optional[str] = None,
+                                      depth: int = 0, sitemap_data: Optional[Dict] = None
+                                      ) -> Optional[Tuple[Dict, List[str]]]:
+        """
+        Fetch a page and extract its data without touching shared crawl state.
+        Extraction runs on a worker thread, or in the extraction pool, so the
+        event loop keeps fetching meanwhile.
+        
+        Args:
+            url: URL to process
+            parent_url: Parent URL that linked to this page
+            depth: Current crawling depth
+            sitemap_data: Optional data from sitemap
+        
+        Returns:
+            Tuple of (page data, navigation links) or None if failed
+        """
+        if self.respect_robots and self.robots.cached(url) is None:
+            # Links to a host without rules yet were queued unchecked
+            await self.load_robots_async(url)
+            if not self.robots_allowed(url):
+                return None
+        
+        headers = None
+        if self.incremental and self.can_reuse_page(url):
+            lastmod = (sitemap_data or {}).get('lastmod', '')
+            if self.manifest.is_unchanged(url, lastmod):
+                return self.reuse_page(url, parent_url, depth, sitemap_data)
+            headers = self.manifest.conditional_headers(url)
+        
+        response = await self.fetch_response_async(url, headers)
+        if response is None:
+            return None
+        if response.status_code == 304:
+            return self.reuse_page(url, parent_url, depth, sitemap_data, response)
+        
+        if self.extract_pool:
+            loop = asyncio.get_running_loop()
+            extracted, histograms = await loop.run_in_executor(
+                self.extract_pool, extract_page_in_worker, response.content,
+                url, parent_url, depth, sitemap_data)
+            # Stage timings recorded in the extraction process
+            self.metrics.merge_histograms(histograms)
+        elif self.profiler:
+            extracted = await asyncio.to_thread(self.profiler.call, url, self.extract_content,
+                                                url, response.content, parent_url, depth, sitemap_data)
+        else:
+            extracted = await asyncio.to_thread(self.extract_content, url, response.content,
+                                                parent_url, depth, sitemap_data)
+        if not extracted:
+            return None
+        
+        page_data, nav_links = extracted
+        return self.record_extraction(url, page_data, nav_links, response)
+    
+    async def fetch_response_async(self, url: str, headers: Optional[Dict[str, str]] = None):
+        """
+        Fetch a page, streaming its body.
+        
+        Args:
+            url: URL to fetch
+            headers: Optional extra request headers (e.g. conditional headers)
+        
+        Returns:
+            StreamedResponse (a CachedResponse when rebuilding from the
+            cache), or None if the request failed
+        """
+        if self.from_cache:
+            return self.fetch_response(url, headers)
+        
+        try:
+            started = time.monotonic()
+            response = None
+            claimed = cancelled = False
+            try:
+                if self.rate_limiter:
+                    await self.claim_slot_async(url)
+                    claimed = True
+                    wait = self.rate_limiter.reserve(url)
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    started = time.monotonic()
+                async with self.request_slots:
+                    self.metrics.add_gauge('requests_in_flight', 1)
+                    try:
+                        with self.metrics.time('fetch_seconds', source='network'):
+                            response = await self.stream_page(url, headers)
+                    except httpx.HTTPStatusError as e:
+                        response = e.response
+                        raise
+                    finally:
+                        self.metrics.add_gauge('requests_in_flight', -1)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                # Always free the host's request slot; a cancelled request
+                # says nothing about the server, so it is not reported
+                if cancelled and claimed:
+                    self.rate_limiter.release(url)
+                    self.slot_released.set()
+                elif claimed:
+                    self.report_response(url, response, time.monotonic() - started)
+        except Exception as e:
+            print(f"Error fetching {url}: {e}")
+            self.metrics.inc('fetch_errors_total')
+            return None
+        
+        self.record_download(url, response)
+        return response
+    
+    async def claim_slot_async(self, url: str):
+        """
+        Wait on the event loop until the URL's host has a free request slot
+        and claim it. The request must be reported with report_response.
+        
+        Args:
+            url: URL about to be requested
+        """
+        while not self.rate_limiter.try_start(url):
+            self.slot_released.clear()
+            await self.slot_released.wait()
+    
+    def report_response(self, url: str, response, seconds: float):
+        """
+        Report a finished request and wake the requests waiting for a slot.
+        See SafeDocsCrawler.report_response.
+        """
+        super().report_response(url, response, seconds)
+        if self.slot_released:
+            self.slot_released.set()
+    
+    async def stream_page(self, url: str, headers: Optional[Dict[str, str]] = None) -> StreamedResponse:
+        """
+        Send a GET request and read the body as it streams in.
+        
+        Args:
+            url: URL to fetch
+            headers: Optional extra request headers
+        
+        Returns:
+            StreamedResponse with the complete body
+        
+        Raises:
+            httpx.HTTPError: If the request fails or the server answers with an error
+            ValueError: If the page exceeds max_page_bytes
+        """
+        async with self.client.stream('GET', url, headers=headers) as response:
+            if response.status_code >= 400:
+                response.raise_for_status()
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body.extend(chunk)
+                if len(body) > self.max_page_bytes:
+                    raise ValueError(f"page is larger than {self.max_page_bytes} bytes")
+            return StreamedResponse(str(response.url), response.status_code, bytes(body),
+                                    dict(response.headers))
+    
+    async def fetch_document_async(self, url: str, timeout: float = 30):
+        """
+        Fetch a sitemap or robots.txt, through the HTML cache when it is enabled.
+        
+        Args:
+            url: URL to fetch
+            timeout: Request timeout in seconds
+        
+        Returns:
+            httpx.Response (a CachedResponse when rebuilding from the cache)
+        
+        Raises:
+            LookupError: If rebuilding from the cache and the URL is not cached
+            httpx.HTTPError: If the request fails
+        """
+        if self.from_cache:
+            return self.fetch_document(url, timeout)
+        
+        response = await self.client.get(url, timeout=timeout)
+        response.raise_for_status()
+        if self.html_cache:
+            self.store_in_cache(url, response)
+        return response
+    
+    async def parse_sitemap_async(self, sitemap_source: str) -> List[SitemapEntry]:
+        """
+        Parse a sitemap file or URL; the sub-sitemaps of a sitemap index are
+        fetched concurrently.
+        
+        Args:
+            sitemap_source: Path to local sitemap file or URL to remote sitemap
+        
+        Returns:
+            List of sitemap entries (url, lastmod, priority)
+        """
+        content = None
+        if sitemap_source.startswith(('http://', 'https://')):
+            try:
+                content = (await self.fetch_document_async(sitemap_source, timeout=30)).content
+            except Exception as e:
+                print(f"  ✗ Failed to parse sitemap {sitemap_source}: {e}")
+                return []
+        
+        sub_sitemaps = []
+        # The document is already downloaded; iter_sitemap only parses it
+        urls = list(self.iter_sitemap(sitemap_source, content, sub_sitemaps))
+        
+        sub_results = await asyncio.gather(*(self.parse_sitemap_async(sub_sitemap)
+                                             for sub_sitemap in self.claim_sub_sitemaps(sub_sitemaps)))
+        for sub_urls in sub_results:
+            urls.extend(sub_urls)
+        return urls
+    
+    async def discover_sitemaps_async(self, base_url: str) -> List[str]:
+        """
+        Discover potential sitemap URLs for a given base URL, probing all
+        candidate locations at once.
+        
+        Args:
+            base_url: Base URL to check for sitemaps
+        
+        Returns:
+            List of discovered sitemap URLs
+        """
+        if self.from_cache:
+            # Offline lookups only, nothing to wait for
+            return self.discover_sitemaps(base_url)
+        
+        candidates = self.sitemap_candidates(base_url)
+        responses, _ = await asyncio.gather(
+            asyncio.gather(*(self.client.head(sitemap_url, timeout=10) for sitemap_url in candidates),
+                           return_exceptions=True),
+            self.load_robots_async(base_url))
+        discovered = []
+        for sitemap_url, response in zip(candidates, responses):
+            # Failed attempts are skipped silently
+            if isinstance(response, Exception) or response.status_code != 200:
+                continue
+            if self.is_sitemap_response(sitemap_url, response):
+                discovered.append(sitemap_url)
+                print(f"  ✓ Discovered sitemap: {sitemap_url}")
+        discovered.extend(self.sitemaps_in_robots(base_url))
+        return discovered
+    
+    def robots_allowed(self, url: str) -> bool:
+        """
+        Check a URL against its host's robots.txt without blocking the event
+        loop: expired rules keep applying while a refresh is scheduled, and a
+        host without rules yet is allowed here and checked again before its
+        pages are fetched (see fetch_and_extract_async).
+        
+        Args:
+            url: URL to check
+        
+        Returns:
+            True if the URL may be crawled (always, with respect_robots off)
+        """
+        if not self.respect_robots or self.loop is None or self.robots.is_fresh(url):
+            return super().robots_allowed(url)
+        # Also called from extraction threads, so hand the refresh to the loop
+        self.loop.call_soon_threadsafe(self.refresh_robots, url)
+        rules = self.robots.cached(url)
+        if rules is None or rules.can_fetch(self.robots.user_agent, url):
+            return True
+        self.metrics.inc('robots_disallowed_total')
+        return False
+    
+    def refresh_robots(self, url: str) -> asyncio.Task:
+        """
+        Start downloading the robots.txt of the URL's host, unless a download
+        is already in flight. Must be called on the event loop.
+        
+        Args:
+            url: Any URL on the host
+        
+        Returns:
+            Task of the download
+        """
+        origin = self.robots.origin(url)
+        task = self.robots_refreshes.get(origin)
+        if task is None:
+            task = asyncio.ensure_future(self.download_robots_async(origin))
+            self.robots_refreshes[origin] = task
+            task.add_done_callback(lambda _: self.robots_refreshes.pop(origin, None))
+        return task
+    
+    async def load_robots_async(self, url: str):
+        """
+        Fetch the robots.txt of the URL's host into the robots cache unless
+        it is cached, so later lookups do not block the event loop.
+        
+        Args:
+            url: Any URL on the host
+        """
+        if self.robots.is_fresh(url):
+            return
+        # Shielded: the download is shared with other waiters on the host
+        await asyncio.shield(self.refresh_robots(url))
+    
+    async def download_robots_async(self, url: str):
+        """
+        Fetch the robots.txt of the URL's host into the robots cache.
+        
+        Args:
+            url: Any URL on the host
+        """
+        robots_url = f"{self.robots.origin(url)}/robots.txt"
+        try:
+            response = await self.fetch_document_async(robots_url, timeout=10)
+        except httpx.HTTPStatusError as e:
+            self.robots.store(url, e.response.status_code, '')
+        except Exception:
+            self.robots.store(url, None, '')
+        else:
+            self.robots.store(url, response.status_code, response.text)
+    
+    def enqueue_discovered_sitemaps(self, url: str):
+        """
+        Sitemap discovery is awaited by enqueue_discovered_sitemaps_async
+        before a page is merged, so merge_page has nothing left to do.
+        """
+    
+    async def enqueue_discovered_sitemaps_async(self, url: str):
+        """
+        Discover sitemaps on the host of the given page and queue their URLs.
+        Each host is only probed once per crawl.
+        
+        Args:
+            url: Page URL whose host should be probed
+        """
+        host = urlparse(url).netloc
+        if host in self.discovered_hosts:
+            return
+        self.discovered_hosts.add(host)
+        
+        new_sitemaps = []
+        for sitemap_url in dict.fromkeys(await self.discover_sitemaps_async(url)):
+            if sitemap_url not in self.processed_sitemaps:
+                self.processed_sitemaps.add(sitemap_url)
+                self.stats['sitemaps_discovered'] += 1
+                new_sitemaps.append(sitemap_url)
+        
+        # Parse the discovered sitemaps concurrently, queue their URLs in order
+        for new_urls in await asyncio.gather(*(self.parse_sitemap_async(sitemap_url)
+                                               for sitemap_url in new_sitemaps)):
+            self.enqueue_sitemap_urls(new_urls, url)
+
+
+async def crawl_sites(crawlers: List[AsyncSafeDocsCrawler], delay: float = 1.0):
+    """
+    Crawl several sites concurrently on the running event loop.
+    
+    Args:
+        crawlers: One crawler per site (each with its own output directory)
+        delay: Delay between requests in seconds, for each crawler
+    """
+    await asyncio.gather(*(crawler.crawl_async(delay) for crawler in crawlers))
+
+
+def main():
+    """Main entry point."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description='Crawl one or more documentation sites on a single event loop'
+    )
+    parser.add_argument(
+        '--site',
+        nargs=3,
+        action='append',
+        required=True,
+        metavar=('SITEMAP', 'BASE_DOMAIN', 'OUTPUT'),
+        help='Sitemap file or URL, domain to stay on and output directory of a site (repeatable)'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=8,
+        help='Requests in flight per site (default: 8)'
+    )
+    parser.add_argument(
+        '--delay',
+        type=float,
+        default=1.0,
+        help='Delay between requests in seconds; the per-host rate is concurrency / delay (default: 1.0)'
+    )
+    parser.add_argument(
+        '--rate',
+        type=float,
+        help='Initial requests per second per host (overrides the rate derived from --delay)'
+    )
+    parser.add_argument(
+        '--max-concurrency',
+        type=int,
+        help='Requests in flight per host the adaptive rate control may grow to (default: --concurrency)'
+    )
+    parser.add_argument(
+        '--max-depth',
+        type=int,
+        default=5,
+        help='Maximum crawling depth (default: 5)'
+    )
+    parser.add_argument(
+        '--no-http2',
+        action='store_true',
+        help='Use HTTP/1.1 only'
+    )
+    
+    args = parser.parse_args()
+    
+    crawlers = [
+        AsyncSafeDocsCrawler(
+            sitemap,
+            output,
+            base_domain=base_domain,
+            max_depth=args.max_depth,
+            concurrency=args.concurrency,
+            requests_per_second=args.rate,
+            max_concurrency=args.max_concurrency,
+            http2=not args.no_http2
+        )
+        for sitemap, base_domain, output in args.site
+    ]
+    asyncio.run(crawl_sites(crawlers, delay=args.delay))
+
+
+if __name__ == '__main__':
+    main()
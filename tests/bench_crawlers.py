@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Crawler Benchmark
+
+Runs the documentation crawlers against a local fixture_site.py and reports
+pages/sec, per-stage CPU time (fetch, parse, extract, markdown, write) and
+peak RSS. The fixture site runs in its own process and every crawler run in
+a fresh process, so CPU and memory figures belong to the crawler alone.
+Results are stored as JSON (named after the time and git commit) and can be
+compared with an earlier run to catch regressions.
+
+Usage:
+    python bench_crawlers.py --pages 10000 --latency 0.01
+    python bench_crawlers.py --crawlers safe_docs,safe_docs_concurrent --compare latest
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+from queue import Empty
+from typing import Dict, List, Optional
+
+from fixture_site import FixtureSite, start_site
+
+
+RESULTS_DIR = 'bench_results'
+
+# Stages timed in every crawler, in report order
+STAGES = ['fetch', 'parse', 'extract', 'markdown', 'write']
+
+# Benchmarked configurations: name -> (crawler, options)
+CONFIGURATIONS = {
+    'safe_docs': ('safe_docs', {}),
+    'safe_docs_concurrent': ('safe_docs', {'concurrency': 8}),
+    'safe_docs_async': ('safe_docs_async', {'concurrency': 8}),
+    'advanced': ('advanced', {}),
+    'javascript': ('javascript', {}),
+}
+
+
+class StageTimer:
+    """
+    Wraps crawler methods to accumulate wall and CPU time per stage.
+    
+    Times are exclusive: a stage called from inside another (e.g. markdown
+    conversion inside extraction) is subtracted from its caller. CPU time is
+    per thread, so concurrent crawls are measured correctly.
+    """
+    
+    def __init__(self):
+        self.totals = {stage: {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0} for stage in STAGES}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+    
+    def wrap(self, obj, method_name: str, stage: str):
+        """Replace obj.method_name with a timed version counted under stage."""
+        original = getattr(obj, method_name)
+        if asyncio.iscoroutinefunction(original):
+            raise TypeError(f"{method_name} is a coroutine; only synchronous stages can be timed")
+        timer = self
+        
+        def timed(*args, **kwargs):
+            stack = timer._local.__dict__.setdefault('stack', [])
+            # [child wall, child cpu] accumulated by nested stages
+            stack.append([0.0, 0.0])
+            wall_start, cpu_start = time.perf_counter(), time.thread_time()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                wall = time.perf_counter() - wall_start
+                cpu = time.thread_time() - cpu_start
+                child_wall, child_cpu = stack.pop()
+                if stack:
+                    stack[-1][0] += wall
+                    stack[-1][1] += cpu
+                timer.add(stage, wall - child_wall, cpu - child_cpu)
+        
+        setattr(obj, method_name, timed)
+    
+    def add(self, stage: str, wall: float, cpu: float):
+        with self._lock:
+            totals = self.totals[stage]
+            totals['calls'] += 1
+            totals['wall_seconds'] += wall
+            totals['cpu_seconds'] += cpu
+    
+    def report(self) -> Dict:
+        return {stage: {key: round(value, 4) if isinstance(value, float) else value
+                        for key, value in totals.items()}
+                for stage, totals in self.totals.items()}
+
+
+def run_safe_docs(sitemap: str, output_dir: str, host: str, options: Dict, timer: StageTimer) -> Dict:
+    """Crawl the fixture site with SafeDocsCrawler."""
+    from crawler import SafeDocsCrawler
+    
+    crawler = SafeDocsCrawler(sitemap, output_dir, base_domain=host,
+                              concurrency=options.get('concurrency', 1),
+                              requests_per_second=options.get('requests_per_second', 1000.0),
+                              parser=options.get('parser', 'auto'))
+    timer.wrap(crawler, 'fetch_response', 'fetch')
+    timer.wrap(crawler, 'parse_response', 'parse')
+    timer.wrap(crawler, 'extract_page', 'extract')
+    timer.wrap(crawler, 'convert_to_markdown', 'markdown')
+    timer.wrap(crawler, 'write_markdown', 'write')
+    crawler.crawl(delay=0)
+    return {'pages': crawler.stats['total_visited'] - crawler.stats['total_failed'],
+            'failed': crawler.stats['total_failed']}
+
+
+def run_safe_docs_async(sitemap: str, output_dir: str, host: str, options: Dict, timer: StageTimer) -> Dict:
+    """Crawl the fixture site with AsyncSafeDocsCrawler (needs httpx)."""
+    from async_crawler import AsyncSafeDocsCrawler
+    
+    crawler = AsyncSafeDocsCrawler(sitemap, output_dir, base_domain=host,
+                                   concurrency=options.get('concurrency', 1),
+                                   requests_per_second=options.get('requests_per_second', 1000.0),
+                                   parser=options.get('parser', 'auto'))
+    # Fetching is a coroutine and only counts towards the total wall time
+    timer.wrap(crawler, 'parse_response', 'parse')
+    timer.wrap(crawler, 'extract_page', 'extract')
+    timer.wrap(crawler, 'convert_to_markdown', 'markdown')
+    timer.wrap(crawler, 'write_markdown', 'write')
+    crawler.crawl(delay=0)
+    return {'pages': crawler.stats['total_visited'] - crawler.stats['total_failed'],
+            'failed': crawler.stats['total_failed']}
+
+
+def run_advanced(sitemap: str, output_dir: str, host: str, options: Dict, timer: StageTimer) -> Dict:
+    """Crawl the fixture site with AdvancedMultiSiteCrawler (needs crawlee and trafilatura)."""
+    from advanced_crawler import AdvancedMultiSiteCrawler
+    
+    crawler = AdvancedMultiSiteCrawler(sitemap, output_dir, parser=options.get('parser', 'lxml'))
+    timer.wrap(crawler, 'extract_with_trafilatura', 'extract')
+    timer.wrap(crawler, 'extract_code_snippets', 'extract')
+    timer.wrap(crawler, 'extract_links', 'extract')
+    timer.wrap(crawler, 'create_markdown_output', 'markdown')
+    asyncio.run(crawler.crawl())
+    return {'pages': len(list(Path(output_dir).glob('*.md'))), 'failed': None}
+
+
+def run_javascript(sitemap: str, output_dir: str, host: str, options: Dict, timer: StageTimer) -> Dict:
+    """Crawl the fixture site with JavaScriptSiteCrawler (needs crawlee and Playwright)."""
+    from playwright_crawler import JavaScriptSiteCrawler
+    
+    crawler = JavaScriptSiteCrawler(sitemap, output_dir)
+    timer.wrap(crawler, 'extract_content', 'extract')
+    timer.wrap(crawler, 'create_markdown', 'markdown')
+    asyncio.run(crawler.crawl())
+    return {'pages': len(list(Path(output_dir).glob('*.md'))), 'failed': None}
+
+
+RUNNERS = {
+    'safe_docs': run_safe_docs,
+    'safe_docs_async': run_safe_docs_async,
+    'advanced': run_advanced,
+    'javascript': run_javascript,
+}
+
+
+def directory_size(path: Path) -> int:
+    """Total size in bytes of the files below a directory."""
+    return sum(file.stat().st_size for file in path.rglob('*') if file.is_file())
+
+
+def run_configuration(name: str, sitemap: str, host: str, verbose: bool, results) -> None:
+    """
+    Run one benchmark configuration. Executed in a fresh process; puts the
+    result dictionary on the results queue.
+    """
+    crawler_name, options = CONFIGURATIONS[name]
+    timer = StageTimer()
+    result = {'configuration': name, 'crawler': crawler_name, 'options': options}
+    with tempfile.TemporaryDirectory(prefix=f'bench-{name}-') as output_dir:
+        usage_before = resource.getrusage(resource.RUSAGE_SELF)
+        start = time.perf_counter()
+        try:
+            with open(os.devnull, 'w') as devnull, redirect_stdout(sys.stdout if verbose else devnull):
+                outcome = RUNNERS[crawler_name](sitemap, output_dir, host, options, timer)
+        except ImportError as e:
+            results.put(dict(result, skipped=f"missing dependency: {e.name or e}"))
+            return
+        elapsed = time.perf_counter() - start
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        stages = timer.report()
+        cpu = (usage.ru_utime - usage_before.ru_utime) + (usage.ru_stime - usage_before.ru_stime)
+        result.update(outcome)
+        result.update({
+            'seconds': round(elapsed, 3),
+            'pages_per_second': round(outcome['pages'] / elapsed, 2) if elapsed else 0.0,
+            'cpu_seconds': round(cpu, 3),
+            'child_cpu_seconds': round(children.ru_utime + children.ru_stime, 3),
+            'stages': stages,
+            'other_cpu_seconds': round(cpu - sum(stage['cpu_seconds'] for stage in stages.values()), 3),
+            # ru_maxrss is in kilobytes on Linux (bytes on macOS)
+            'peak_rss_mb': round(usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1),
+            'peak_child_rss_mb': round(children.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1),
+            'output_bytes': directory_size(Path(output_dir)),
+        })
+    results.put(result)
+
+
+def serve_fixture(pages: int, latency: float, padding_kb: int, sitemap_path: str, ready) -> None:
+    """Run the fixture site in its own process; reports the bound port on ready."""
+    site = FixtureSite(pages=pages, latency=latency, padding_kb=padding_kb)
+    server = start_site(site)
+    origin = f"http://127.0.0.1:{server.server_address[1]}"
+    site.write_sitemap(sitemap_path, origin)
+    ready.put(server.server_address[1])
+    while True:
+        time.sleep(3600)
+
+
+def git_commit() -> str:
+    """Short hash of the checked-out commit ('unknown' outside a repository)."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True, cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def load_baseline(compare: str, results_dir: Path) -> Optional[Dict]:
+    """
+    Load the run to compare with.
+    
+    Args:
+        compare: Path to a results file, or 'latest' for the newest file in results_dir
+        results_dir: Directory of stored results
+    
+    Returns:
+        Stored benchmark run, or None if there is nothing to compare with
+    """
+    if compare == 'latest':
+        candidates = sorted(results_dir.glob('*.json'))
+        if not candidates:
+            return None
+        compare = str(candidates[-1])
+    with open(compare, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def print_results(results: List[Dict], baseline: Optional[Dict] = None):
+    """Print one block per configuration, with changes against the baseline."""
+    previous = {result['configuration']: result for result in (baseline or {}).get('results', [])}
+    print("\n" + "="*70)
+    print("📊 CRAWLER BENCHMARK")
+    print("="*70)
+    for result in results:
+        if result.get('skipped'):
+            print(f"  {result['configuration']:<24} skipped ({result['skipped']})")
+            continue
+        before = previous.get(result['configuration'])
+        change = ''
+        if before and not before.get('skipped') and before.get('pages_per_second'):
+            delta = (result['pages_per_second'] / before['pages_per_second'] - 1) * 100
+            change = f"  ({delta:+.1f}% vs {baseline.get('commit', '?')})"
+        print(f"  {result['configuration']:<24} {result['pages']} pages in {result['seconds']:.2f}s = "
+              f"{result['pages_per_second']:.1f} pages/s{change}")
+        stage_line = ', '.join(f"{stage} {times['cpu_seconds']:.2f}s"
+                               for stage, times in result['stages'].items() if times['calls'])
+        print(f"  {'':<24} CPU {result['cpu_seconds']:.2f}s ({stage_line}, other "
+              f"{result['other_cpu_seconds']:.2f}s), peak RSS {result['peak_rss_mb']:.1f} MB")
+    print("="*70)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark the documentation crawlers against a local fixture site'
+    )
+    parser.add_argument(
+        '--crawlers',
+        default='safe_docs,safe_docs_concurrent,safe_docs_async,advanced',
+        help=f"Comma-separated configurations to run (available: {', '.join(CONFIGURATIONS)})"
+    )
+    parser.add_argument(
+        '--pages',
+        type=int,
+        default=1000,
+        help='Number of pages of the fixture site (default: 1000)'
+    )
+    parser.add_argument(
+        '--latency',
+        type=float,
+        default=0.0,
+        help='Fixture response latency in seconds (default: 0)'
+    )
+    parser.add_argument(
+        '--padding-kb',
+        type=int,
+        default=32,
+        help='Inline script payload per page, in KB (default: 32)'
+    )
+    parser.add_argument(
+        '--results-dir',
+        default=RESULTS_DIR,
+        help=f'Directory the results are stored in (default: {RESULTS_DIR})'
+    )
+    parser.add_argument(
+        '--compare',
+        help="Results file to compare with, or 'latest' for the newest stored run"
+    )
+    parser.add_argument(
+        '--verbose',
+        action='store_true',
+        help="Show the crawlers' own output"
+    )
+    
+    args = parser.parse_args()
+    names = [name.strip() for name in args.crawlers.split(',') if name.strip()]
+    unknown = [name for name in names if name not in CONFIGURATIONS]
+    if unknown:
+        parser.error(f"unknown configuration(s): {', '.join(unknown)}")
+    
+    results_dir = Path(args.results_dir)
+    baseline = load_baseline(args.compare, results_dir) if args.compare else None
+    
+    # Fresh interpreters: peak RSS and CPU are not inherited from this process
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory(prefix='bench-site-') as site_dir:
+        sitemap = str(Path(site_dir) / 'sitemap.xml')
+        ready = context.Queue()
+        site_process = context.Process(target=serve_fixture, daemon=True,
+                                       args=(args.pages, args.latency, args.padding_kb, sitemap, ready))
+        site_process.start()
+        host = f"127.0.0.1:{ready.get(timeout=60)}"
+        print(f"🧪 Fixture site: {args.pages} pages on http://{host}, {args.latency * 1000:g}ms latency")
+        
+        results = []
+        try:
+            for name in names:
+                print(f"⏱️  Running {name}...")
+                queue = context.Queue()
+                process = context.Process(target=run_configuration,
+                                          args=(name, sitemap, host, args.verbose, queue))
+                process.start()
+                process.join()
+                try:
+                    results.append(queue.get(timeout=5))
+                except Empty:
+                    results.append({'configuration': name, 'skipped': f'exit code {process.exitcode}'})
+        finally:
+            site_process.terminate()
+    
+    run = {
+        'commit': git_commit(),
+        'generated_at': datetime.now().isoformat(),
+        'python': sys.version.split()[0],
+        'options': {'pages': args.pages, 'latency': args.latency, 'padding_kb': args.padding_kb},
+        'results': results,
+    }
+    results_dir.mkdir(parents=True, exist_ok=True)
+    results_path = results_dir / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{run['commit']}.json"
+    with open(results_path, 'w', encoding='utf-8') as f:
+        json.dump(run, f, indent=2)
+    
+    print_results(results, baseline)
+    print(f"✅ Results saved to: {results_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Safe API Client Benchmark
+
+Runs the API scripts' hot paths against an in-process mock_safe_service.py
+and reports throughput and request latency for each scenario: Safe info
+lookups (cached and uncached), paginated queue walks with and without
+prefetch, the multi-Safe dashboard and batch transaction lookups.
+
+Usage:
+    python bench_safe_api.py [--latency 0.02] [--safes 20] [--json bench.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from mock_safe_service import running_mock_service
+from safe_api_client import get_client
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of values (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_scenario(name: str, action: Callable[[], object], service, latencies: List[float]) -> Dict:
+    """
+    Time one scenario.
+    
+    Args:
+        name: Scenario name
+        action: Called once; does the work
+        service: MockSafeService the client talks to
+        latencies: List the client's response hook appends to
+    
+    Returns:
+        Scenario result with wall time, request count, rate and latency percentiles
+    """
+    latencies.clear()
+    requests_before = service.stats()['requests']
+    start = time.perf_counter()
+    action()
+    elapsed = time.perf_counter() - start
+    requests = service.stats()['requests'] - requests_before
+    result = {
+        'scenario': name,
+        'seconds': round(elapsed, 3),
+        'requests': requests,
+        'requests_per_second': round(requests / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 1),
+        'mean_ms': round(statistics.mean(latencies) * 1000, 1) if latencies else 0.0,
+    }
+    print(f"  {name:<28} {result['seconds']:>7.2f}s {requests:>6} req "
+          f"{result['requests_per_second']:>8.1f} req/s  p50 {result['p50_ms']:>6.1f}ms  "
+          f"p95 {result['p95_ms']:>6.1f}ms")
+    return result
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark the Safe API client against a local mock service'
+    )
+    parser.add_argument(
+        '--safes',
+        type=int,
+        default=20,
+        help='Number of synthetic Safes (default: 20)'
+    )
+    parser.add_argument(
+        '--queue-depth',
+        type=int,
+        default=250,
+        help='Pending transactions per Safe (default: 250)'
+    )
+    parser.add_argument(
+        '--latency',
+        type=float,
+        default=0.02,
+        help='Server latency per request in seconds (default: 0.02)'
+    )
+    parser.add_argument(
+        '--error-rate',
+        type=float,
+        default=0.0,
+        help='Fraction of requests answered with a 5xx (default: 0)'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=8,
+        help='Concurrency of the dashboard and batch scenarios (default: 8)'
+    )
+    parser.add_argument(
+        '--json',
+        help='Write the results to this JSON file'
+    )
+    
+    args = parser.parse_args()
+    
+    # Imported here: these modules build the shared client at import time
+    # and require an API key, which the mock service does not check
+    os.environ.setdefault('SAFE_API_KEY', 'mock')
+    from generate_safe_transaction_link import get_transaction_details_batch
+    from pending_dashboard import build_report
+    
+    safes = [('eth', '0x' + f"{i:040x}") for i in range(1, args.safes + 1)]
+    results = []
+    
+    with running_mock_service(queue_depth=args.queue_depth, history_depth=10,
+                              latency=args.latency, error_rate=args.error_rate) as (service, base_url):
+        client = get_client()
+        client.base_url = base_url
+        client.limiter = None
+        client.backoff_factor = 0.01
+        latencies: List[float] = []
+        client.session.hooks['response'].append(
+            lambda response, *hook_args, **hook_kwargs: latencies.append(response.elapsed.total_seconds()))
+        
+        chain, safe = safes[0]
+        path = f"safes/{safe}/multisig-transactions/"
+        print(f"🏁 Safe API benchmark: {args.safes} Safes x {args.queue_depth} pending, "
+              f"{args.latency * 1000:g}ms latency, {args.error_rate:.0%} errors")
+        
+        results.append(run_scenario('safe_info_uncached', lambda: [
+            client.get(chain, f"safes/{address}/") for chain, address in safes], service, latencies))
+        client.cache.clear()
+        results.append(run_scenario('safe_info_cached_x10', lambda: [
+            client.get_cached(chain, address) for _ in range(10) for chain, address in safes],
+            service, latencies))
+        results.append(run_scenario('queue_walk', lambda: list(
+            client.iter_results(chain, path, {'executed': 'false'})), service, latencies))
+        results.append(run_scenario('queue_walk_prefetch', lambda: list(
+            client.iter_results(chain, path, {'executed': 'false'}, prefetch=True)), service, latencies))
+        results.append(run_scenario('dashboard', lambda: build_report(
+            safes, concurrency=args.concurrency, chain_rate=1000.0), service, latencies))
+        
+        hashes = [(chain, tx['safeTxHash'])
+                  for tx in client.iter_results(chain, path, {'executed': 'false'}, max_items=100)]
+        results.append(run_scenario('batch_details', lambda: get_transaction_details_batch(
+            hashes, concurrency=args.concurrency), service, latencies))
+        
+        server_stats = service.stats()
+    
+    print(f"📊 Server statuses: {server_stats['statuses']}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'options': vars(args),
+                'results': results,
+                'server': server_stats,
+            }, f, indent=2)
+        print(f"✅ Results saved to: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
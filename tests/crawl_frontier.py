@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Crawl Frontier
+URL queue for the crawlers with O(1) "seen or queued" membership checks
+and optional priority ordering inside each crawl depth.
+"""
+
+import heapq
+import itertools
+from collections import deque
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+
+# Queue entries are (url, parent_url, depth, sitemap_data), the same tuples
+# the crawlers used to keep in a plain deque.
+FrontierEntry = Tuple[str, Optional[str], int, Optional[Dict]]
+
+
+class CrawlFrontier:
+    """
+    Deque-compatible crawl queue with a hashed index of queued URLs.
+    
+    Without prioritization entries come out in FIFO order, exactly like a
+    deque. With prioritization they come out ordered by depth first (so BFS
+    depth semantics are preserved) and by descending priority within a depth.
+    """
+    
+    def __init__(self, seen: Optional[Set[str]] = None, prioritize: bool = False):
+        """
+        Initialize the frontier.
+        
+        Args:
+            seen: Set of already visited URLs (shared with the crawler);
+                push() rejects URLs found in it
+            prioritize: Whether to order entries by priority within a depth
+        """
+        self.seen = seen if seen is not None else set()
+        self.prioritize = prioritize
+        self.queued: Dict[str, int] = {}
+        self.fifo: deque = deque()
+        self.heap: list = []
+        self.counter = itertools.count()
+    
+    def __len__(self) -> int:
+        return len(self.heap) if self.prioritize else len(self.fifo)
+    
+    def __bool__(self) -> bool:
+        return len(self) > 0
+    
+    def __contains__(self, url: str) -> bool:
+        return url in self.queued
+    
+    def __iter__(self) -> Iterator[FrontierEntry]:
+        """Iterate over queued entries in pop order."""
+        if self.prioritize:
+            return (item[-1] for item in sorted(self.heap))
+        return iter(self.fifo)
+    
+    def is_known(self, url: str) -> bool:
+        """
+        Check whether a URL was already visited or is waiting in the queue.
+        
+        Args:
+            url: Normalized URL
+        
+        Returns:
+            True if the URL is seen or queued
+        """
+        return url in self.queued or url in self.seen
+    
+    def append(self, entry: FrontierEntry, priority: float = 0.0):
+        """
+        Add an entry unconditionally (deque-compatible).
+        
+        Args:
+            entry: Tuple of (url, parent_url, depth, sitemap_data)
+            priority: Priority within the entry's depth (higher comes first)
+        """
+        url = entry[0]
+        self.queued[url] = self.queued.get(url, 0) + 1
+        if self.prioritize:
+            heapq.heappush(self.heap, (entry[2], -priority, next(self.counter), entry))
+        else:
+            self.fifo.append(entry)
+    
+    def push(self, url: str, parent_url: Optional[str] = None, depth: int = 0,
+             sitemap_data: Optional[Dict] = None, priority: float = 0.0) -> bool:
+        """
+        Add a URL unless it was already visited or is already queued.
+        
+        Args:
+            url: Normalized URL
+            parent_url: Parent URL that linked to this page
+            depth: Crawl depth of the URL
+            sitemap_data: Optional data from sitemap
+            priority: Priority within the depth (higher comes first)
+        
+        Returns:
+            True if the URL was added, False if it was already known
+        """
+        if self.is_known(url):
+            return False
+        self.append((url, parent_url, depth, sitemap_data), priority)
+        return True
+    
+    def popleft(self) -> FrontierEntry:
+        """
+        Remove and return the next entry.
+        
+        Returns:
+            Tuple of (url, parent_url, depth, sitemap_data)
+        """
+        if self.prioritize:
+            entry = heapq.heappop(self.heap)[-1]
+        else:
+            entry = self.fifo.popleft()
+        
+        url = entry[0]
+        remaining = self.queued[url] - 1
+        if remaining:
+            self.queued[url] = remaining
+        else:
+            del self.queued[url]
+        return entry
+    
+    def peek(self) -> FrontierEntry:
+        """
+        Return the next entry without removing it.
+        
+        Returns:
+            Tuple of (url, parent_url, depth, sitemap_data)
+        """
+        if self.prioritize:
+            return self.heap[0][-1]
+        return self.fifo[0]
+    
+    def discard(self, url: str) -> int:
+        """
+        Remove every queued entry for a URL. This is O(n) and meant for
+        rare bookkeeping such as replaying a crawl journal.
+        
+        Args:
+            url: Normalized URL
+        
+        Returns:
+            Number of entries removed
+        """
+        removed = self.queued.pop(url, 0)
+        if removed:
+            if self.prioritize:
+                self.heap = [item for item in self.heap if item[-1][0] != url]
+                heapq.heapify(self.heap)
+            else:
+                self.fifo = deque(entry for entry in self.fifo if entry[0] != url)
+        return removed
+    
+    def clear(self):
+        """Remove all queued entries."""
+        self.queued.clear()
+        self.fifo.clear()
+        self.heap.clear()
+
+
+def sitemap_priority(sitemap_data: Optional[Dict], default: float = 0.5) -> float:
+    """
+    Read the <priority> value of a sitemap entry.
+    
+    Args:
+        sitemap_data: Sitemap entry dictionary (may be None)
+        default: Priority used when the entry has none (sitemap spec default)
+    
+    Returns:
+        Priority as a float between 0.0 and 1.0
+    """
+    if not sitemap_data or not sitemap_data.get('priority'):
+        return default
+    try:
+        return float(sitemap_data['priority'])
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Crawl Journal
+Append-only JSONL journal of a running crawl. Every finished page is written
+as it completes and the frontier, stats and discovery state are checkpointed
+periodically, so an interrupted crawl can be resumed without refetching
+completed pages.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+JOURNAL_FILENAME = 'crawl_journal.jsonl'
+
+
+class CrawlJournal:
+    """
+    Append-only journal with three record types:
+    
+    - page: one processed URL (page data is null when processing failed)
+    - checkpoint: frontier, stats and discovery state at a point in time
+    - complete: written when the crawl finished normally
+    """
+    
+    def __init__(self, path: Path):
+        """
+        Initialize the journal.
+        
+        Args:
+            path: Path of the JSONL journal file
+        """
+        self.path = Path(path)
+        self.file = None
+    
+    def open(self, truncate: bool = False):
+        """
+        Open the journal for appending.
+        
+        Args:
+            truncate: Whether to discard any existing journal content
+        """
+        self.close()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, 'w' if truncate else 'a', encoding='utf-8')
+    
+    def close(self):
+        """Close the journal file."""
+        if self.file:
+            self.file.close()
+            self.file = None
+    
+    def append(self, record: Dict, sync: bool = False):
+        """
+        Append one record and flush it to disk.
+        
+        Args:
+            record: JSON-serializable record with a 'type' key
+            sync: Whether to fsync (used for checkpoints)
+        """
+        self.file.write(json.dumps(record, ensure_ascii=False))
+        self.file.write('\n')
+        self.file.flush()
+        if sync:
+            os.fsync(self.file.fileno())
+    
+    def append_page(self, url: str, parent_url: Optional[str], depth: int,
+                    page_data: Optional[Dict], nav_links: List[str],
+                    link_graph_entry: Optional[Dict], navigation: bool = False,
+                    manifest_entry: Optional[Dict] = None):
+        """
+        Journal a processed page.
+        
+        Args:
+            url: Processed URL
+            parent_url: Parent URL that linked to this page
+            depth: Depth of the page
+            page_data: Page data or None if processing failed
+            nav_links: Navigation links found on the page
+            link_graph_entry: The page's link graph entry
+            navigation: Whether the page came from the navigation link pass
+            manifest_entry: Incremental crawl manifest entry for the page
+        """
+        self.append({
+            'type': 'page',
+            'url': url,
+            'parent_url': parent_url,
+            'depth': depth,
+            'navigation': navigation,
+            'page': page_data,
+            'nav_links': nav_links,
+            'link_graph': link_graph_entry,
+            'manifest': manifest_entry,
+        })
+    
+    def append_checkpoint(self, phase: str, frontier: List, stats: Dict,
+                          navigation_links: List[str], processed_sitemaps: List[str],
+                          discovered_hosts: List[str]):
+        """
+        Journal a checkpoint of the crawl state.
+        
+        Args:
+            phase: Crawl phase ('main' or 'navigation')
+            frontier: Queued entries as (url, parent_url, depth, sitemap_data) lists
+            stats: Crawl statistics
+            navigation_links: Navigation links found so far
+            processed_sitemaps: Sitemaps already parsed
+            discovered_hosts: Hosts already probed for sitemaps
+        """
+        self.append({
+            'type': 'checkpoint',
+            'phase': phase,
+            'frontier': frontier,
+            'stats': stats,
+            'navigation_links': navigation_links,
+            'processed_sitemaps': processed_sitemaps,
+            'discovered_hosts': discovered_hosts,
+        }, sync=True)
+    
+    def append_complete(self):
+        """Mark the crawl as finished."""
+        self.append({'type': 'complete'}, sync=True)
+    
+    def load(self) -> Optional[Dict]:
+        """
+        Read the journal of a previous crawl.
+        
+        A torn last line (crash in the middle of a write) is ignored.
+        
+        Returns:
+            Dictionary with 'checkpoint' (last checkpoint or None),
+            'pages_before' / 'pages_after' (page records before and after
+            that checkpoint) and 'complete', or None if there is no journal
+        """
+        if not self.path.exists():
+            return None
+        
+        checkpoint = None
+        pages_before: List[Dict] = []
+        pages_after: List[Dict] = []
+        complete = False
+        
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                
+                record_type = record.get('type')
+                if record_type == 'page':
+                    pages_after.append(record)
+                elif record_type == 'checkpoint':
+                    checkpoint = record
+                    pages_before.extend(pages_after)
+                    pages_after = []
+                elif record_type == 'complete':
+                    complete = True
+        
+        return {
+            'checkpoint': checkpoint,
+            'pages_before': pages_before,
+            'pages_after': pages_after,
+            'complete': complete,
+        }
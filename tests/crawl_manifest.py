@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Crawl Manifest
+Remembers what every page looked like on the previous crawl (sitemap lastmod,
+HTTP validators and the extracted page record) so that incremental crawls
+can skip unchanged pages or revalidate them with conditional requests.
+"""
+
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+MANIFEST_FILENAME = 'crawl_manifest.json'
+MANIFEST_VERSION = 1
+
+
+class CrawlManifest:
+    """
+    Per-URL record of the last successful crawl.
+    
+    Entries loaded from disk are kept in `previous`; entries recorded during
+    the current crawl go to `entries`, which is what gets saved. Pages that
+    are no longer reachable therefore drop out of the manifest naturally.
+    """
+    
+    def __init__(self, path: Path):
+        """
+        Initialize the manifest.
+        
+        Args:
+            path: Path of the manifest JSON file
+        """
+        self.path = Path(path)
+        self.previous: Dict[str, Dict] = {}
+        self.entries: Dict[str, Dict] = {}
+        self.reused = 0
+        self._lock = threading.Lock()
+    
+    def load(self) -> int:
+        """
+        Load the manifest written by the previous crawl, if any.
+        
+        Returns:
+            Number of entries loaded
+        """
+        if not self.path.exists():
+            return 0
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"  ⚠ Ignoring unreadable crawl manifest {self.path}: {e}")
+            return 0
+        
+        if data.get('version') != MANIFEST_VERSION:
+            print(f"  ⚠ Ignoring crawl manifest with unsupported version: {data.get('version')}")
+            return 0
+        
+        self.previous = data.get('pages', {})
+        return len(self.previous)
+    
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Get the previous crawl's entry for a URL.
+        
+        Args:
+            url: Normalized URL
+        
+        Returns:
+            Manifest entry or None if the URL was not crawled before
+        """
+        return self.previous.get(url)
+    
+    def is_unchanged(self, url: str, lastmod: str) -> bool:
+        """
+        Check whether the sitemap reports the page as unchanged.
+        
+        Args:
+            url: Normalized URL
+            lastmod: Current sitemap <lastmod> value
+        
+        Returns:
+            True if the previous crawl saw the same non-empty lastmod
+        """
+        entry = self.previous.get(url)
+        return bool(lastmod) and entry is not None and entry.get('lastmod') == lastmod
+    
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Build conditional request headers from the stored validators.
+        
+        Args:
+            url: Normalized URL
+        
+        Returns:
+            Dictionary with If-None-Match / If-Modified-Since (may be empty)
+        """
+        entry = self.previous.get(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def record(self, url: str, page_data: Dict, nav_links: List[str], lastmod: str = '',
+               etag: str = '', last_modified: str = '', reused: bool = False):
+        """
+        Record the current state of a page. Thread-safe.
+        
+        Args:
+            url: Normalized URL
+            page_data: Extracted page record
+            nav_links: Navigation links found on the page
+            lastmod: Sitemap <lastmod> value
+            etag: ETag response header
+            last_modified: Last-Modified response header
+            reused: Whether the page was taken over from the previous crawl
+        """
+        with self._lock:
+            if reused:
+                self.reused += 1
+            self.entries[url] = {
+                'lastmod': lastmod,
+                'etag': etag,
+                'last_modified': last_modified,
+                'page': page_data,
+                'nav_links': nav_links,
+            }
+    
+    def save(self):
+        """
+        Write the entries recorded during this crawl to disk.
+        """
+        pages = {}
+        for url, entry in self.entries.items():
+            # Sibling lists depend on the whole crawl and are rebuilt each run
+            page = dict(entry['page'], siblings=[])
+            page.pop('sibling_count', None)
+            pages[url] = dict(entry, page=page)
+        
+        data = {
+            'version': MANIFEST_VERSION,
+            'saved_at': datetime.utcnow().isoformat(),
+            'pages': pages,
+        }
+        
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        tmp_path.replace(self.path)
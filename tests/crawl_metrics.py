@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Crawl Metrics
+Thread-safe histograms, counters and gauges for the stages of the
+documentation crawler, exported as a JSON summary at the end of a crawl and
+optionally as a Prometheus text file refreshed while it runs.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+
+METRICS_FILENAME = 'crawl_metrics.json'
+
+# Prefix of every exported Prometheus metric name
+METRIC_PREFIX = 'crawler_'
+
+# Histogram bucket upper bounds: durations in seconds, sizes in bytes
+SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Help text of the metrics the crawler records
+DESCRIPTIONS = {
+    'fetch_seconds': 'Time to fetch a page (network request or HTML cache read)',
+    'response_bytes': 'Size of fetched pages',
+    'parse_seconds': 'Time to parse a page into a BeautifulSoup tree',
+    'extract_seconds': 'Time spent in each extraction step',
+    'markdown_seconds': 'Time to convert a page to markdown',
+    'write_seconds': 'Time to write a markdown file',
+    'bytes_downloaded_total': 'Bytes of page content downloaded',
+    'fetch_errors_total': 'Page fetches that failed',
+    'pages_total': 'Processed pages by outcome',
+    'robots_disallowed_total': 'URLs rejected by robots.txt Disallow rules',
+    'queue_depth': 'URLs waiting in the crawl frontier',
+    'requests_in_flight': 'Page requests currently in flight',
+    'request_rate': 'Requests per second allowed by the adaptive rate control, summed over hosts',
+    'request_concurrency': 'Requests in flight allowed by the adaptive rate control, summed over hosts',
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum, min and max."""
+    
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+    
+    def observe(self, value: float):
+        """Add one observation."""
+        index = 0
+        while index < len(self.buckets) and value > self.buckets[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+    
+    def merge(self, other: 'Histogram'):
+        """Add the observations of a histogram with the same buckets."""
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by linear interpolation inside its bucket.
+        
+        Args:
+            q: Quantile between 0 and 1
+        
+        Returns:
+            Estimated value (clamped to the observed min/max), or None if empty
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else self.min
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(max(estimate, self.min), self.max)
+            seen += bucket_count
+        return self.max
+    
+    def summary(self) -> Dict:
+        """Count, sum and distribution of the observations."""
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+        }
+
+
+def format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    """Render labels in Prometheus syntax ('' when there are none)."""
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in pairs) + '}'
+
+
+class CrawlMetrics:
+    """
+    Registry of the crawler's metrics. Histograms and counters are keyed by
+    name and labels (e.g. extract_seconds with step="links"); names ending
+    in _bytes use byte-sized buckets, all other histograms durations.
+    """
+    
+    def __init__(self, prometheus_path: Optional[str] = None, export_interval: float = 10.0):
+        """
+        Initialize the registry.
+        
+        Args:
+            prometheus_path: Text file to export to in the Prometheus format
+                (None disables the export)
+            export_interval: Minimum seconds between two exports during the crawl
+        """
+        self.prometheus_path = Path(prometheus_path) if prometheus_path else None
+        self.export_interval = export_interval
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.gauges: Dict[str, float] = {}
+        self.started = time.monotonic()
+        self.last_export = 0.0
+        self._lock = threading.Lock()
+    
+    def observe(self, name: str, value: float, **labels):
+        """Record a histogram observation."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(
+                    BYTES_BUCKETS if name.endswith('_bytes') else SECONDS_BUCKETS)
+            histogram.observe(value)
+    
+    @contextmanager
+    def time(self, name: str, **labels) -> Iterator[None]:
+        """Record the duration of a with-block in a histogram."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+    
+    def inc(self, name: str, amount: float = 1, **labels):
+        """Increase a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+    
+    def set_gauge(self, name: str, value: float):
+        """Set a gauge to a value."""
+        with self._lock:
+            self.gauges[name] = value
+    
+    def add_gauge(self, name: str, delta: float):
+        """Move a gauge up or down."""
+        with self._lock:
+            self.gauges[name] = self.gauges.get(name, 0) + delta
+    
+    def take_histograms(self) -> Dict[Tuple[str, Labels], Histogram]:
+        """
+        Remove and return the histograms recorded so far, e.g. to ship the
+        observations of an extraction process to the main process.
+        """
+        with self._lock:
+            histograms, self.histograms = self.histograms, {}
+        return histograms
+    
+    def merge_histograms(self, histograms: Dict[Tuple[str, Labels], Histogram]):
+        """Add histograms returned by take_histograms() in another process."""
+        with self._lock:
+            for key, histogram in histograms.items():
+                if key in self.histograms:
+                    self.histograms[key].merge(histogram)
+                else:
+                    self.histograms[key] = histogram
+    
+    def summary(self) -> Dict:
+        """
+        JSON-serializable snapshot of every metric.
+        
+        Returns:
+            Dictionary with elapsed time, histograms (label sets as
+            "name{labels}" keys), counters and gauges
+        """
+        with self._lock:
+            return {
+                'elapsed_seconds': round(time.monotonic() - self.started, 3),
+                'histograms': {name + format_labels(labels): histogram.summary()
+                               for (name, labels), histogram in sorted(self.histograms.items())},
+                'counters': {name + format_labels(labels): value
+                             for (name, labels), value in sorted(self.counters.items())},
+                'gauges': dict(sorted(self.gauges.items())),
+            }
+    
+    def prometheus_text(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        described = set()
+        
+        def header(name: str, kind: str):
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {METRIC_PREFIX}{name} {DESCRIPTIONS.get(name, name)}")
+                lines.append(f"# TYPE {METRIC_PREFIX}{name} {kind}")
+        
+        with self._lock:
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                header(name, 'histogram')
+                cumulative = 0
+                for bound, bucket_count in zip(list(histogram.buckets) + ['+Inf'], histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(f"{METRIC_PREFIX}{name}_bucket{format_labels(labels, ('le', str(bound)))} "
+                                 f"{cumulative}")
+                lines.append(f"{METRIC_PREFIX}{name}_sum{format_labels(labels)} {histogram.sum}")
+                lines.append(f"{METRIC_PREFIX}{name}_count{format_labels(labels)} {histogram.count}")
+            for (name, labels), value in sorted(self.counters.items()):
+                header(name, 'counter')
+                lines.append(f"{METRIC_PREFIX}{name}{format_labels(labels)} {value}")
+            for name, value in sorted(self.gauges.items()):
+                header(name, 'gauge')
+                lines.append(f"{METRIC_PREFIX}{name} {value}")
+        return '\n'.join(lines) + '\n'
+    
+    def export(self, force: bool = False):
+        """
+        Rewrite the Prometheus text file (atomically, so a collector never
+        reads a partial file) if enabled and the export interval has passed.
+        
+        Args:
+            force: Export regardless of the interval
+        """
+        if not self.prometheus_path:
+            return
+        now = time.monotonic()
+        if not force and now - self.last_export < self.export_interval:
+            return
+        self.last_export = now
+        tmp_path = self.prometheus_path.with_suffix(self.prometheus_path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, self.prometheus_path)
+    
+    def save_summary(self, path: Path):
+        """
+        Write the JSON summary.
+        
+        Args:
+            path: Destination file
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Crawl Output
+Builds the RAG output records of the documentation crawler and streams them to
+JSONL files as pages finish, so downstream indexers can tail the output while
+the crawl is still running.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+PAGES_FILENAME = 'crawled_pages.jsonl'
+VECTOR_FILENAME = 'vector_data.jsonl'
+LINK_GRAPH_FILENAME = 'link_graph.json'
+SIBLINGS_FILENAME = 'siblings.json'
+METADATA_FILENAME = 'crawl_metadata.json'
+
+
+def build_vector_entries(page: Dict) -> List[Dict]:
+    """
+    Flatten a page into one vector indexing entry per text chunk.
+    
+    Args:
+        page: Page data dictionary
+    
+    Returns:
+        List of chunk entries
+    """
+    entries = []
+    for i, chunk in enumerate(page['text_chunks']):
+        entries.append({
+            'id': f"{page['url']}#chunk-{i}",
+            'url': page['url'],
+            'chunk_index': i,
+            'total_chunks': len(page['text_chunks']),
+            'text': chunk,
+            'title': page['title'],
+            'description': page['description'],
+            'parent_url': page['parent_url'],
+            'breadcrumbs': page['breadcrumbs'],
+            'depth': page['depth'],
+            'section_titles': [s['title'] for s in page['sections']],
+            'has_code': page['code_snippet_count'] > 0,
+            'code_languages': page['code_languages'],
+        })
+    return entries
+
+
+def build_sibling_map(pages: Iterable[Tuple[str, Optional[str]]]) -> Dict[str, List[str]]:
+    """
+    Group pages by parent URL and list the siblings of every page that has a parent.
+    
+    Args:
+        pages: (url, parent_url) pairs in crawl order
+    
+    Returns:
+        Dictionary mapping page URL to the URLs of its siblings
+    """
+    pages = list(pages)
+    children_by_parent: Dict[str, List[str]] = {}
+    for url, parent in pages:
+        if parent:
+            children_by_parent.setdefault(parent, []).append(url)
+    
+    siblings = {}
+    for url, parent in pages:
+        if parent:
+            siblings[url] = [child for child in children_by_parent[parent] if child != url]
+    return siblings
+
+
+class StreamingOutputWriter:
+    """
+    Appends one page record to crawled_pages.jsonl and its chunk records to
+    vector_data.jsonl as each page finishes. Only (url, parent_url) pairs are
+    kept in memory; finalize() writes the link graph, sibling relationships
+    and crawl metadata as separate JSON files.
+    """
+    
+    def __init__(self, output_dir: Path):
+        """
+        Initialize the writer.
+        
+        Args:
+            output_dir: Directory the output files are written to
+        """
+        self.output_dir = Path(output_dir)
+        self.pages_file = None
+        self.vector_file = None
+        self.parents: List[Tuple[str, Optional[str]]] = []
+        self.chunks_written = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def pages_written(self) -> int:
+        return len(self.parents)
+    
+    def open(self):
+        """
+        Create (or truncate) the JSONL output files.
+        """
+        self.close()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.pages_file = open(self.output_dir / PAGES_FILENAME, 'w', encoding='utf-8')
+        self.vector_file = open(self.output_dir / VECTOR_FILENAME, 'w', encoding='utf-8')
+        self.parents = []
+        self.chunks_written = 0
+    
+    def close(self):
+        """Close the JSONL output files."""
+        for f in (self.pages_file, self.vector_file):
+            if f:
+                f.close()
+        self.pages_file = None
+        self.vector_file = None
+    
+    def write_page(self, page: Dict):
+        """
+        Append a finished page and its chunk records. Thread-safe.
+        
+        Args:
+            page: Page data dictionary
+        """
+        entries = build_vector_entries(page)
+        with self._lock:
+            self.pages_file.write(json.dumps(page, ensure_ascii=False) + '\n')
+            for entry in entries:
+                self.vector_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            # Flush whole records so tailing readers never see a partial page
+            self.pages_file.flush()
+            self.vector_file.flush()
+            self.parents.append((page['url'], page.get('parent_url')))
+            self.chunks_written += len(entries)
+    
+    def finalize(self, link_graph: Dict, metadata: Dict):
+        """
+        Close the JSONL files and write the link graph, sibling relationships
+        and crawl metadata.
+        
+        Args:
+            link_graph: Link graph of the crawl
+            metadata: Crawl metadata (date, base domain, statistics)
+        """
+        self.close()
+        
+        files = {
+            LINK_GRAPH_FILENAME: link_graph,
+            SIBLINGS_FILENAME: build_sibling_map(self.parents),
+            METADATA_FILENAME: dict(metadata, total_pages=self.pages_written,
+                                    total_chunks=self.chunks_written),
+        }
+        for filename, data in files.items():
+            with open(self.output_dir / filename, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
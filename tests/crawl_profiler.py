@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Crawl Profiler
+Profiles the per-page work of the crawlers. Each page runs under cProfile and
+the stats are aggregated across pages into a sorted report; a sampling thread
+records the call stacks of profiled pages in the collapsed format read by
+flamegraph.pl, speedscope and similar tools.
+"""
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+PROFILE_BASENAME = 'profile'
+
+# Seconds between two stack samples
+SAMPLE_INTERVAL = 0.005
+
+# Functions listed in each section of the text report
+REPORT_LIMIT = 40
+
+
+def frame_name(frame) -> str:
+    """Name of a stack frame in collapsed-stack output, e.g. crawler:SafeDocsCrawler.extract_page."""
+    code = frame.f_code
+    return f"{Path(code.co_filename).stem}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class PageProfiler:
+    """
+    Aggregating profiler for page processing. Thread-safe: pages processed
+    concurrently are all sampled, but cProfile only follows one page at a
+    time (a profiler is bound to a single thread), so pages that overlap a
+    profiled page are left out of the deterministic stats.
+    """
+    
+    def __init__(self, sample_interval: float = SAMPLE_INTERVAL):
+        """
+        Initialize the profiler.
+        
+        Args:
+            sample_interval: Seconds between two stack samples
+        """
+        self.sample_interval = sample_interval
+        self.stats: Optional[pstats.Stats] = None
+        self.stacks: Counter = Counter()
+        self.page_times: List[Tuple[float, str]] = []
+        self.unprofiled = 0
+        self._active: Dict[int, object] = {}
+        self._lock = threading.Lock()
+        self._cprofile_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+    
+    def call(self, label: str, func: Callable, *args, **kwargs):
+        """
+        Run one unit of page work under the profiler.
+        
+        Args:
+            label: Page URL (listed among the slowest pages)
+            func: Function to run
+            *args, **kwargs: Arguments for func
+        
+        Returns:
+            Return value of func
+        """
+        self.start_sampler()
+        thread_id = threading.get_ident()
+        profiled = self._cprofile_lock.acquire(blocking=False)
+        profile = cProfile.Profile() if profiled else None
+        with self._lock:
+            # Sampled stacks are cut at this frame
+            self._active[thread_id] = sys._getframe()
+        start = time.perf_counter()
+        try:
+            if profile:
+                profile.enable()
+            return func(*args, **kwargs)
+        finally:
+            if profile:
+                profile.disable()
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                del self._active[thread_id]
+                self.page_times.append((elapsed, label))
+                if profile:
+                    if self.stats is None:
+                        self.stats = pstats.Stats(profile)
+                    else:
+                        self.stats.add(profile)
+                else:
+                    self.unprofiled += 1
+            if profiled:
+                self._cprofile_lock.release()
+    
+    def start_sampler(self):
+        """Start the stack sampling thread unless it is running."""
+        with self._lock:
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self.sample_loop, name='page-profiler', daemon=True)
+                self._sampler.start()
+    
+    def sample_loop(self):
+        """Record the stacks of the threads inside call() until stopped."""
+        while not self._stop.wait(self.sample_interval):
+            with self._lock:
+                if not self._active:
+                    continue
+                frames = sys._current_frames()
+                for thread_id, root in self._active.items():
+                    frame = frames.get(thread_id)
+                    names = []
+                    while frame is not None and frame is not root:
+                        names.append(frame_name(frame))
+                        frame = frame.f_back
+                    if names:
+                        self.stacks[';'.join(reversed(names))] += 1
+    
+    def stop(self):
+        """Stop the sampling thread."""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+    
+    def report_text(self) -> str:
+        """
+        Render the aggregated profile.
+        
+        Returns:
+            Slowest pages, then the functions sorted by cumulative and by own time
+        """
+        out = io.StringIO()
+        total = sum(seconds for seconds, _ in self.page_times)
+        out.write(f"Profiled calls: {len(self.page_times)} ({total:.2f}s total, "
+                  f"{self.unprofiled} only sampled)\n")
+        out.write(f"Stack samples: {sum(self.stacks.values())} every {self.sample_interval * 1000:g}ms\n\n")
+        out.write("Slowest pages:\n")
+        for seconds, label in sorted(self.page_times, reverse=True)[:10]:
+            out.write(f"  {seconds * 1000:10.1f}ms  {label}\n")
+        if self.stats is not None:
+            stats = pstats.Stats(stream=out).add(self.stats)
+            stats.strip_dirs()
+            for key in ('cumulative', 'tottime'):
+                out.write(f"\n{'=' * 30} sorted by {key} {'=' * 30}\n")
+                stats.sort_stats(key).print_stats(REPORT_LIMIT)
+        return out.getvalue()
+    
+    def top_functions(self, limit: int = 10) -> List[Tuple[str, float, float]]:
+        """
+        Functions with the most own time.
+        
+        Args:
+            limit: Number of functions
+        
+        Returns:
+            List of (function, own seconds, cumulative seconds)
+        """
+        if self.stats is None:
+            return []
+        rows = []
+        for (filename, line, name), (_, _, tottime, cumtime, _) in self.stats.stats.items():
+            rows.append((f"{Path(filename).name}:{line}({name})", tottime, cumtime))
+        return sorted(rows, key=lambda row: -row[1])[:limit]
+    
+    def write(self, output_dir: Path, basename: str = PROFILE_BASENAME) -> List[Path]:
+        """
+        Write the text report, the raw pstats dump (for snakeviz or
+        gprof2dot) and the collapsed stacks.
+        
+        Args:
+            output_dir: Destination directory
+            basename: File name without extension
+        
+        Returns:
+            Paths of the written files
+        """
+        self.stop()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        paths = []
+        
+        report_path = output_dir / f"{basename}.txt"
+        report_path.write_text(self.report_text(), encoding='utf-8')
+        paths.append(report_path)
+        
+        if self.stats is not None:
+            stats_path = output_dir / f"{basename}.pstats"
+            self.stats.dump_stats(stats_path)
+            paths.append(stats_path)
+        
+        collapsed_path = output_dir / f"{basename}.collapsed"
+        with open(collapsed_path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        paths.append(collapsed_path)
+        return paths
+    
+    def print_summary(self, paths: List[Path], limit: int = 10):
+        """
+        Print the functions with the most own time and the written files.
+        
+        Args:
+            paths: Files returned by write()
+            limit: Number of functions to list
+        """
+        top = self.top_functions(limit)
+        if top:
+            print("Hottest functions (own / cumulative):")
+            for name, tottime, cumtime in top:
+                print(f"  {name:<60} {tottime:8.3f}s {cumtime:8.3f}s")
+        for path in paths:
+            print(f"Profile saved to: {path}")
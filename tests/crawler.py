@@ -7,25 +7,60 @@ Enhanced with recursive crawling and JSON export for RAG indexing.
 
 import os
 import json
-import xml.etree.ElementTree as ET
 from pathlib import Path
 from urllib.parse import urlparse, urljoin, urldefrag, quote
 import time
 import re
-from typing import Dict, List, Tuple, Set, Optional
+import threading
 from collections import deque
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Tuple, Set, Optional
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
-from markdownify import markdownify as md
+
+from crawl_frontier import CrawlFrontier, sitemap_priority
+from crawl_journal import CrawlJournal, JOURNAL_FILENAME
+from dom_extractor import DomIndex, markdown_from_soup
+from html_parsers import DEFAULT_PARSER, PARSER_BACKENDS, parse_html, resolve_parser
+from crawl_output import StreamingOutputWriter, build_sibling_map, build_vector_entries
+from crawl_manifest import CrawlManifest, MANIFEST_FILENAME
+from crawl_metrics import CrawlMetrics, METRICS_FILENAME
+from crawl_profiler import PageProfiler
+from html_cache import HtmlCache
+from rate_limiter import HostRateLimiter, retry_after_seconds
+from robots_cache import ROBOTS_TTL, RobotsCache, rules_crawl_delay
+from sitemap_reader import SitemapEntry, iter_sitemap_entries, open_sitemap
+
+
+# Sub-sitemaps and sitemap discovery probes downloaded at once
+SITEMAP_FETCH_WORKERS = 8
+
+
+class PendingExtraction(NamedTuple):
+    """A fetched page whose extraction is running in the extraction process pool."""
+    future: Future
+    response: requests.Response
 
 
 class SafeDocsCrawler:
     def __init__(self, sitemap_path: str, output_dir: str = "output", 
                  base_domain: str = "docs.safe.global", recursive: bool = True,
                  max_depth: int = 5, auto_discover_sitemaps: bool = True,
-                 use_xml_sitemaps: bool = False, xml_sitemaps_url: Optional[str] = None):
+                 use_xml_sitemaps: bool = False, xml_sitemaps_url: Optional[str] = None,
+                 concurrency: int = 1, requests_per_second: Optional[float] = None,
+                 prioritize: bool = False, incremental: bool = False,
+                 checkpoint_every: int = 0, stream_output: bool = False,
+                 parser: str = DEFAULT_PARSER, extract_workers: int = 0,
+                 cache_dir: Optional[str] = None, cache_max_bytes: Optional[int] = None,
+                 cache_compress: bool = True, from_cache: bool = False,
+                 metrics_file: Optional[str] = None, metrics_interval: float = 10.0,
+                 profile: bool = False, respect_robots: bool = True,
+                 robots_ttl: float = ROBOTS_TTL, max_concurrency: Optional[int] = None,
+                 latency_target: Optional[float] = None):
         """
         Initialize the crawler.
         
@@ -38,6 +73,38 @@ class SafeDocsCrawler:
             auto_discover_sitemaps: Whether to discover and parse additional sitemaps
             use_xml_sitemaps: Whether to use xml-sitemaps.com to generate sitemap
             xml_sitemaps_url: Starting URL for xml-sitemaps.com crawler
+            concurrency: Number of requests kept in flight at first (1 = sequential crawl)
+            requests_per_second: Initial per-host request rate (defaults to
+                concurrency / delay)
+            prioritize: Whether to order the queue by sitemap priority and
+                navigation membership within each depth
+            incremental: Whether to skip pages unchanged since the previous
+                crawl (sitemap lastmod, then ETag/Last-Modified revalidation)
+            checkpoint_every: Write a checkpoint to the crawl journal every N
+                pages (0 disables journaling unless resuming)
+            stream_output: Whether to stream pages and chunks to JSONL files as
+                they finish instead of writing crawled_data.json at the end
+            parser: HTML parser backend ('html.parser', 'lxml', 'html5lib' or 'auto')
+            extract_workers: Number of processes parsing and extracting pages in
+                concurrent mode (0 = extract on the fetching threads)
+            cache_dir: Directory of the content-addressed HTML cache (None disables it)
+            cache_max_bytes: Size limit of the HTML cache (None = unbounded)
+            cache_compress: Whether cached documents are gzip-compressed
+            from_cache: Whether to rebuild the output from the HTML cache
+                without any network requests
+            metrics_file: Prometheus text file refreshed with the crawl
+                metrics during the crawl (None disables it)
+            metrics_interval: Minimum seconds between two metrics_file updates
+            profile: Whether to profile page processing (profile.txt,
+                profile.pstats and profile.collapsed in output_dir)
+            respect_robots: Whether to skip URLs disallowed by robots.txt and
+                apply its Crawl-delay to the host
+            robots_ttl: Seconds a host's robots.txt is cached
+            max_concurrency: Requests in flight the adaptive rate control may
+                grow to per host (defaults to concurrency); the rate may grow
+                by the same factor
+            latency_target: p95 response time in seconds above which the
+                adaptive rate control backs off (None = 3x the best median)
         """
         self.sitemap_path = sitemap_path
         self.output_dir = Path(output_dir)
@@ -47,15 +114,44 @@ class SafeDocsCrawler:
         self.auto_discover_sitemaps = auto_discover_sitemaps
         self.use_xml_sitemaps = use_xml_sitemaps
         self.xml_sitemaps_url = xml_sitemaps_url
+        self.concurrency = max(1, concurrency)
+        self.max_concurrency = max(self.concurrency, max_concurrency or 0)
+        self.requests_per_second = requests_per_second
+        self.latency_target = latency_target
+        self.rate_limiter: Optional[HostRateLimiter] = None
+        self.incremental = incremental
+        self.manifest = CrawlManifest(self.output_dir / MANIFEST_FILENAME)
+        self.checkpoint_every = checkpoint_every
+        self.journal: Optional[CrawlJournal] = None
+        self.pages_since_checkpoint = 0
+        self.crawl_phase = 'main'
+        self.output_writer = StreamingOutputWriter(self.output_dir) if stream_output else None
+        self.parser = resolve_parser(parser)
+        self.extract_workers = max(0, extract_workers)
+        self.extract_pool: Optional[ProcessPoolExecutor] = None
+        # Bounded queue between the fetch and extraction stages: fetching
+        # threads block once this many pages wait for an extraction process
+        self.extract_slots = threading.BoundedSemaphore(max(1, self.extract_workers * 2))
+        self.html_cache: Optional[HtmlCache] = None
+        if cache_dir:
+            self.html_cache = HtmlCache(Path(cache_dir), max_bytes=cache_max_bytes,
+                                        compress=cache_compress)
+        self.from_cache = from_cache
+        if from_cache and not self.html_cache:
+            raise ValueError("from_cache requires a cache_dir")
+        # Per-stage histograms, counters and gauges (crawl_metrics.json at the end)
+        self.metrics = CrawlMetrics(metrics_file, metrics_interval)
+        self.profiler = PageProfiler() if profile else None
         
         # Tracking sets and data structures
         self.visited_urls: Set[str] = set()
-        self.url_queue: deque = deque()
+        self.url_queue = CrawlFrontier(seen=self.visited_urls, prioritize=prioritize)
         self.url_metadata: Dict[str, Dict] = {}
         self.link_graph: Dict[str, Dict[str, List[str]]] = {}
         self.page_data: List[Dict] = []
         self.processed_sitemaps: Set[str] = set()
         self.navigation_links: Set[str] = set()
+        self.discovered_hosts: Set[str] = set()
         
         # Statistics
         self.stats = {
@@ -64,6 +160,7 @@ class SafeDocsCrawler:
             'total_failed': 0,
             'sitemaps_discovered': 0,
             'navigation_links_found': 0,
+            'total_unchanged': 0,
             'start_time': None,
             'end_time': None
         }
@@ -72,8 +169,20 @@ class SafeDocsCrawler:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
-        
-    def parse_sitemap(self, sitemap_source: str) -> List[Dict[str, str]]:
+        if self.max_concurrency > 1:
+            # Size the connection pool so every worker can keep a connection alive
+            adapter = HTTPAdapter(pool_connections=self.max_concurrency,
+                                  pool_maxsize=self.max_concurrency)
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
+        
+        # robots.txt per host: Disallow rules, Crawl-delay and sitemap references
+        self.respect_robots = respect_robots
+        self.crawl_delays: Dict[str, float] = {}
+        self.robots = RobotsCache(self.fetch_robots, self.session.headers['User-Agent'],
+                                  ttl=robots_ttl, on_load=self.apply_robots_rules)
+    
+    def parse_sitemap(self, sitemap_source: str) -> List[SitemapEntry]:
         """
         Parse a sitemap XML file or URL and extract URLs with metadata.
         
@@ -81,76 +190,256 @@ class SafeDocsCrawler:
             sitemap_source: Path to local sitemap file or URL to remote sitemap
             
         Returns:
-            List of dictionaries containing URL information
+            List of sitemap entries (url, lastmod, priority)
+        """
+        return list(self.iter_sitemap(sitemap_source))
+    
+    def iter_sitemap(self, sitemap_source: str, content: Optional[bytes] = None,
+                     sub_sitemaps: Optional[List[str]] = None) -> Iterator[SitemapEntry]:
+        """
+        Stream the URLs of a sitemap (plain or gzip-compressed) as they are
+        read. The sub-sitemaps of a sitemap index are fetched concurrently
+        and read in index order.
+        
+        Args:
+            sitemap_source: Path to local sitemap file or URL to remote sitemap
+            content: Already downloaded document of a remote sitemap
+            sub_sitemaps: When given, the sub-sitemaps of a sitemap index are
+                collected in this list instead of being fetched
+        
+        Yields:
+            Sitemap entries of the pages, in sitemap order
         """
+        follow = sub_sitemaps is None
+        if follow:
+            sub_sitemaps = []
         try:
             # Check if it's a URL or local file
-            if sitemap_source.startswith(('http://', 'https://')):
+            if content is None and sitemap_source.startswith(('http://', 'https://')):
                 # Fetch remote sitemap
-                response = self.session.get(sitemap_source, timeout=30)
-                response.raise_for_status()
-                root = ET.fromstring(response.content)
-            else:
-                # Parse local file
-                tree = ET.parse(sitemap_source)
-                root = tree.getroot()
-            
-            # Handle XML namespace
-            namespace = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-            
-            urls = []
-            
-            # Check if this is a sitemap index (contains other sitemaps)
-            sitemap_elems = root.findall('ns:sitemap', namespace)
-            if sitemap_elems:
-                print(f"  Found sitemap index with {len(sitemap_elems)} sub-sitemaps")
-                for sitemap_elem in sitemap_elems:
-                    loc = sitemap_elem.find('ns:loc', namespace)
-                    if loc is not None and loc.text not in self.processed_sitemaps:
-                        print(f"  → Parsing sub-sitemap: {loc.text}")
-                        self.processed_sitemaps.add(loc.text)
-                        sub_urls = self.parse_sitemap(loc.text)
-                        urls.extend(sub_urls)
-                return urls
-            
-            # Parse regular sitemap
-            for url_elem in root.findall('ns:url', namespace):
-                url_data = {}
-                loc = url_elem.find('ns:loc', namespace)
-                lastmod = url_elem.find('ns:lastmod', namespace)
-                priority = url_elem.find('ns:priority', namespace)
-                
-                if loc is not None:
-                    url_data['url'] = loc.text
-                    url_data['lastmod'] = lastmod.text if lastmod is not None else ''
-                    url_data['priority'] = priority.text if priority is not None else ''
-                    urls.append(url_data)
-            
-            return urls
+                content = self.fetch_document(sitemap_source, timeout=30).content
+            with open_sitemap(content if content is not None else sitemap_source) as stream:
+                for entry in iter_sitemap_entries(stream):
+                    if entry.is_index:
+                        sub_sitemaps.append(entry.url)
+                    else:
+                        yield entry
         except Exception as e:
             print(f"  ✗ Failed to parse sitemap {sitemap_source}: {e}")
-            return []
+            return
+        
+        # Check if this is a sitemap index (contains other sitemaps)
+        if sub_sitemaps:
+            print(f"  Found sitemap index with {len(sub_sitemaps)} sub-sitemaps")
+        if follow and sub_sitemaps:
+            for sub_sitemap, sub_content in self.fetch_sitemaps(self.claim_sub_sitemaps(sub_sitemaps)):
+                if isinstance(sub_content, Exception):
+                    print(f"  ✗ Failed to parse sitemap {sub_sitemap}: {sub_content}")
+                else:
+                    yield from self.iter_sitemap(sub_sitemap, sub_content)
+    
+    def fetch_sitemaps(self, sitemap_sources: List[str]) -> Iterator[Tuple[str, object]]:
+        """
+        Download remote sitemaps concurrently, a bounded number ahead of the reader.
+        
+        Args:
+            sitemap_sources: Sitemap URLs (local paths are passed through)
+        
+        Yields:
+            Tuples of (source, document bytes, None for a local path, or the
+            exception the download failed with), in the order of sitemap_sources
+        """
+        def download(source: str):
+            if not source.startswith(('http://', 'https://')):
+                return None
+            try:
+                return self.fetch_document(source, timeout=30).content
+            except Exception as e:
+                return e
+        
+        with ThreadPoolExecutor(max_workers=SITEMAP_FETCH_WORKERS) as pool:
+            window = deque()
+            for source in sitemap_sources:
+                window.append((source, pool.submit(download, source)))
+                if len(window) >= SITEMAP_FETCH_WORKERS * 2:
+                    source, future = window.popleft()
+                    yield source, future.result()
+            while window:
+                source, future = window.popleft()
+                yield source, future.result()
+    
+    def claim_sub_sitemaps(self, sub_sitemaps: List[str]) -> List[str]:
+        """
+        Mark the sub-sitemaps of a sitemap index as processed.
+        
+        Args:
+            sub_sitemaps: Sub-sitemap URLs
+        
+        Returns:
+            The sub-sitemaps not processed before, to be parsed by the caller
+        """
+        claimed = []
+        for sub_sitemap in sub_sitemaps:
+            if sub_sitemap not in self.processed_sitemaps:
+                print(f"  → Parsing sub-sitemap: {sub_sitemap}")
+                self.processed_sitemaps.add(sub_sitemap)
+                claimed.append(sub_sitemap)
+        return claimed
     
-    def fetch_page(self, url: str) -> Tuple[BeautifulSoup, requests.Response]:
+    def fetch_page(self, url: str, headers: Optional[Dict[str, str]] = None) -> Tuple[BeautifulSoup, requests.Response]:
         """
         Fetch a page and return BeautifulSoup object.
         
         Args:
             url: URL to fetch
+            headers: Optional extra request headers (e.g. conditional headers)
             
         Returns:
-            Tuple of (BeautifulSoup object, Response object)
+            Tuple of (BeautifulSoup object, Response object). The soup is None
+            when the server answers 304 Not Modified.
+        """
+        response = self.fetch_response(url, headers)
+        if response is None or response.status_code == 304:
+            return None, response
+        soup = self.parse_response(url, response.content)
+        return soup, (response if soup is not None else None)
+    
+    def fetch_response(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[requests.Response]:
+        """
+        Fetch a page without parsing it.
+        
+        Args:
+            url: URL to fetch
+            headers: Optional extra request headers (e.g. conditional headers)
+        
+        Returns:
+            Response object, or None if the request failed
         """
+        if self.from_cache:
+            with self.metrics.time('fetch_seconds', source='cache'):
+                response = self.html_cache.get(url)
+            if response is None:
+                print(f"Error fetching {url}: not in the HTML cache")
+                self.metrics.inc('fetch_errors_total')
+            return response
+        
         try:
-            response = self.session.get(url, timeout=30)
+            if self.rate_limiter:
+                self.rate_limiter.acquire(url)
+            self.metrics.add_gauge('requests_in_flight', 1)
+            started = time.monotonic()
+            response = None
+            try:
+                with self.metrics.time('fetch_seconds', source='network'):
+                    response = self.session.get(url, headers=headers, timeout=30)
+            finally:
+                self.metrics.add_gauge('requests_in_flight', -1)
+                # Always report, the request holds one of the host's request slots
+                self.report_response(url, response, time.monotonic() - started)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            return soup, response
         except Exception as e:
             print(f"Error fetching {url}: {e}")
-            return None, None
+            self.metrics.inc('fetch_errors_total')
+            return None
+        
+        self.record_download(url, response)
+        return response
+    
+    def report_response(self, url: str, response, seconds: float):
+        """
+        Feed a finished page request to the host's adaptive rate control and
+        release its request slot.
+        
+        Args:
+            url: Requested URL
+            response: Response object, or None if no response arrived
+            seconds: Response time in seconds
+        """
+        if not self.rate_limiter:
+            return
+        status_code = response.status_code if response is not None else None
+        retry_after = retry_after_seconds(response.headers.get('Retry-After')) if response is not None else None
+        reason = self.rate_limiter.record_response(url, status_code, seconds, retry_after)
+        if reason:
+            host = urlparse(url).netloc
+            controller = self.rate_limiter.controller_for(host)
+            print(f"  🐢 Backing off {host}: {controller.rate:.2f} req/s, "
+                  f"{controller.concurrency} in flight ({reason})")
+    
+    def fetch_document(self, url: str, timeout: float = 30) -> requests.Response:
+        """
+        Fetch a sitemap or robots.txt, through the HTML cache when it is enabled.
+        
+        Args:
+            url: URL to fetch
+            timeout: Request timeout in seconds
+        
+        Returns:
+            Response object (a CachedResponse when rebuilding from the cache)
+        
+        Raises:
+            LookupError: If rebuilding from the cache and the URL is not cached
+            requests.RequestException: If the request fails
+        """
+        if self.from_cache:
+            response = self.html_cache.get(url)
+            if response is None:
+                raise LookupError(f"{url} is not in the HTML cache")
+            return response
+        
+        response = self.session.get(url, timeout=timeout)
+        response.raise_for_status()
+        if self.html_cache:
+            self.store_in_cache(url, response)
+        return response
+    
+    def record_download(self, url: str, response: requests.Response):
+        """
+        Count a downloaded page in the metrics and store it in the HTML cache.
+        
+        Args:
+            url: URL of the page
+            response: Successful response
+        """
+        self.metrics.observe('response_bytes', len(response.content))
+        self.metrics.inc('bytes_downloaded_total', len(response.content))
+        if self.html_cache and response.status_code == 200:
+            self.store_in_cache(url, response)
+    
+    def store_in_cache(self, url: str, response: requests.Response):
+        """
+        Add a fetched document to the HTML cache. Cache write errors are
+        reported but never fail the crawl.
+        
+        Args:
+            url: URL of the document
+            response: Successful response
+        """
+        try:
+            self.html_cache.put(url, response.content, response.headers)
+        except OSError as e:
+            print(f"  ⚠ Could not cache {url}: {e}")
+    
+    def parse_response(self, url: str, content: bytes) -> Optional[BeautifulSoup]:
+        """
+        Parse fetched HTML with the configured parser backend.
+        
+        Args:
+            url: URL of the page
+            content: Raw HTML
+        
+        Returns:
+            BeautifulSoup object, or None if parsing failed
+        """
+        try:
+            with self.metrics.time('parse_seconds'):
+                return parse_html(content, self.parser)
+        except Exception as e:
+            print(f"Error fetching {url}: {e}")
+            return None
     
-    def extract_metadata(self, soup: BeautifulSoup, url: str, sitemap_data: Dict) -> Dict[str, str]:
+    def extract_metadata(self, soup: BeautifulSoup, url: str, sitemap_data: Dict,
+                         dom: Optional[DomIndex] = None) -> Dict[str, str]:
         """
         Extract metadata from the page.
         
@@ -158,6 +447,7 @@ class SafeDocsCrawler:
             soup: BeautifulSoup object
             url: Page URL
             sitemap_data: Data from sitemap
+            dom: Index of the page (built from soup if not given)
             
         Returns:
             Dictionary containing metadata
@@ -170,34 +460,37 @@ class SafeDocsCrawler:
             'priority': sitemap_data.get('priority', ''),
         }
         
+        dom = dom or DomIndex(soup)
+        
         # Extract title
-        title_tag = soup.find('title')
+        title_tag = dom.find('title', soup)
         if title_tag:
-            metadata['title'] = title_tag.get_text(strip=True)
+            metadata['title'] = dom.text(title_tag, strip=True)
         
         # Try to find h1 if title is not descriptive
-        h1_tag = soup.find('h1')
+        h1_tag = dom.find('h1', soup)
         if h1_tag and not metadata['title']:
-            metadata['title'] = h1_tag.get_text(strip=True)
+            metadata['title'] = dom.text(h1_tag, strip=True)
         
         # Extract description from meta tags
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
+        meta_desc = dom.find('meta', soup, attrs={'name': 'description'})
         if meta_desc and meta_desc.get('content'):
             metadata['description'] = meta_desc.get('content')
         
         # Extract Open Graph metadata
-        og_desc = soup.find('meta', property='og:description')
+        og_desc = dom.find('meta', soup, attrs={'property': 'og:description'})
         if og_desc and og_desc.get('content') and not metadata['description']:
             metadata['description'] = og_desc.get('content')
         
         return metadata
     
-    def extract_main_content(self, soup: BeautifulSoup) -> BeautifulSoup:
+    def extract_main_content(self, soup: BeautifulSoup, dom: Optional[DomIndex] = None) -> BeautifulSoup:
         """
         Extract the main content area from the page.
         
         Args:
             soup: BeautifulSoup object
+            dom: Index of the page (built from soup if not given)
             
         Returns:
             BeautifulSoup object containing main content
@@ -217,43 +510,46 @@ class SafeDocsCrawler:
             '.doc-content',
         ]
         
+        dom = dom or DomIndex(soup)
         for selector in selectors:
-            main_content = soup.select_one(selector)
+            main_content = dom.select_one(selector, soup)
             if main_content:
                 break
         
         # If no main content found, try to find the largest content div
         if not main_content:
             # Look for divs with substantial content
-            divs = soup.find_all('div')
+            divs = dom.find_all('div', soup)
             max_length = 0
             for div in divs:
-                text_length = len(div.get_text(strip=True))
+                text_length = dom.text_length(div)
                 if text_length > max_length:
                     max_length = text_length
                     main_content = div
         
         return main_content if main_content else soup
     
-    def extract_sections(self, content: BeautifulSoup) -> List[Dict[str, str]]:
+    def extract_sections(self, content: BeautifulSoup, dom: Optional[DomIndex] = None) -> List[Dict[str, str]]:
         """
         Extract sections with headers from content.
         
         Args:
             content: BeautifulSoup object
+            dom: Index of the page (built from content if not given)
             
         Returns:
             List of sections with headers and content
         """
         sections = []
+        dom = dom or DomIndex(content)
         
         # Find all headers
-        headers = content.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+        headers = dom.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'], content)
         
         for i, header in enumerate(headers):
             section = {
                 'level': int(header.name[1]),
-                'title': header.get_text(strip=True),
+                'title': dom.text(header, strip=True),
                 'id': header.get('id', ''),
                 'content': ''
             }
@@ -266,7 +562,7 @@ class SafeDocsCrawler:
                 if hasattr(current, 'name') and current.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
                     break
                 if hasattr(current, 'get_text'):
-                    text = current.get_text(strip=True)
+                    text = dom.text(current, strip=True)
                     if text:
                         content_parts.append(text)
                 current = current.next_sibling
@@ -317,15 +613,70 @@ class SafeDocsCrawler:
         if self.base_domain not in url:
             return False
         
-        return True
+        return self.robots_allowed(url)
+    
+    def robots_allowed(self, url: str) -> bool:
+        """
+        Check a URL against the Disallow rules of its host's robots.txt.
+        
+        Args:
+            url: URL to check
+        
+        Returns:
+            True if the URL may be crawled (always, with respect_robots off)
+        """
+        if not self.respect_robots or self.robots.allowed(url):
+            return True
+        self.metrics.inc('robots_disallowed_total')
+        return False
     
-    def extract_navigation_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
+    def fetch_robots(self, robots_url: str) -> Tuple[Optional[int], str]:
+        """
+        Download a robots.txt for the robots cache.
+        
+        Args:
+            robots_url: URL of robots.txt
+        
+        Returns:
+            Tuple of (status code, text); the status is None if the server
+            could not be reached (or, when rebuilding from the HTML cache,
+            the file is not cached)
+        """
+        try:
+            response = self.fetch_document(robots_url, timeout=10)
+        except requests.HTTPError as e:
+            return e.response.status_code, ''
+        except Exception:
+            return None, ''
+        return response.status_code, response.text
+    
+    def apply_robots_rules(self, origin: str, rules):
+        """
+        Apply the Crawl-delay of a freshly loaded robots.txt to its host.
+        
+        Args:
+            origin: Scheme and host of the robots.txt
+            rules: Parsed robots.txt
+        """
+        crawl_delay = rules_crawl_delay(rules, self.robots.user_agent)
+        if not self.respect_robots or crawl_delay is None:
+            return
+        host = urlparse(origin).netloc
+        if self.crawl_delays.get(host) != crawl_delay:
+            print(f"  🤖 robots.txt Crawl-delay for {host}: {crawl_delay:g}s")
+        self.crawl_delays[host] = crawl_delay
+        if self.rate_limiter:
+            self.rate_limiter.set_host_rate(host, 1.0 / crawl_delay, burst=1, fixed=True)
+    
+    def extract_navigation_links(self, soup: BeautifulSoup, base_url: str,
+                                 dom: Optional[DomIndex] = None) -> List[str]:
         """
         Extract links specifically from navigation elements.
         
         Args:
             soup: BeautifulSoup object
             base_url: Base URL for resolving relative links
+            dom: Index of the page (built from soup if not given)
             
         Returns:
             List of navigation URLs
@@ -346,10 +697,11 @@ class SafeDocsCrawler:
             '[id*="nav"]',
         ]
         
+        dom = dom or DomIndex(soup)
         for selector in nav_selectors:
-            nav_elements = soup.select(selector)
+            nav_elements = dom.select(selector, soup)
             for nav in nav_elements:
-                for link in nav.find_all('a', href=True):
+                for link in dom.find_all('a', nav, attrs={'href': True}):
                     href = link.get('href')
                     absolute_url = urljoin(base_url, href)
                     absolute_url = self.normalize_url(absolute_url)
@@ -359,22 +711,25 @@ class SafeDocsCrawler:
         
         return nav_links
     
-    def extract_links(self, content: BeautifulSoup, base_url: str) -> List[Dict[str, str]]:
+    def extract_links(self, content: BeautifulSoup, base_url: str,
+                      dom: Optional[DomIndex] = None) -> List[Dict[str, str]]:
         """
         Extract all links from content.
         
         Args:
             content: BeautifulSoup object
             base_url: Base URL for resolving relative links
+            dom: Index of the page (built from content if not given)
             
         Returns:
             List of links with text and URLs
         """
         links = []
+        dom = dom or DomIndex(content)
         
-        for link in content.find_all('a', href=True):
+        for link in dom.find_all('a', content, attrs={'href': True}):
             href = link.get('href')
-            text = link.get_text(strip=True)
+            text = dom.text(link, strip=True)
             
             # Resolve relative URLs
             absolute_url = urljoin(base_url, href)
@@ -390,27 +745,30 @@ class SafeDocsCrawler:
         
         return links
     
-    def extract_code_snippets(self, content: BeautifulSoup) -> List[Dict[str, str]]:
+    def extract_code_snippets(self, content: BeautifulSoup,
+                              dom: Optional[DomIndex] = None) -> List[Dict[str, str]]:
         """
         Extract code snippets from content.
         
         Args:
             content: BeautifulSoup object
+            dom: Index of the page (built from content if not given)
             
         Returns:
             List of code snippets with language and content
         """
         snippets = []
+        dom = dom or DomIndex(content)
         
         # Find code blocks
-        code_blocks = content.find_all(['pre', 'code'])
+        code_blocks = dom.find_all(['pre', 'code'], content)
         
         for block in code_blocks:
             # Skip inline code
             if block.name == 'code' and block.parent.name != 'pre':
                 continue
             
-            code_text = block.get_text()
+            code_text = dom.text(block)
             
             # Try to detect language
             language = ''
@@ -475,7 +833,7 @@ class SafeDocsCrawler:
         
         # Convert main content to markdown
         if soup:
-            content_md = md(str(soup), heading_style="ATX", bullets="-")
+            content_md = markdown_from_soup(soup, heading_style="ATX", bullets="-")
             markdown_parts.append(content_md)
             markdown_parts.append("")
         
@@ -540,12 +898,13 @@ class SafeDocsCrawler:
         
         return "\n".join(markdown_parts)
     
-    def extract_breadcrumbs(self, soup: BeautifulSoup) -> List[Dict[str, str]]:
+    def extract_breadcrumbs(self, soup: BeautifulSoup, dom: Optional[DomIndex] = None) -> List[Dict[str, str]]:
         """
         Extract breadcrumb navigation from page.
         
         Args:
             soup: BeautifulSoup object
+            dom: Index of the page (built from soup if not given)
             
         Returns:
             List of breadcrumb items
@@ -560,31 +919,35 @@ class SafeDocsCrawler:
             'nav ol',
         ]
         
+        dom = dom or DomIndex(soup)
         for selector in selectors:
-            breadcrumb_nav = soup.select_one(selector)
+            breadcrumb_nav = dom.select_one(selector, soup)
             if breadcrumb_nav:
-                for link in breadcrumb_nav.find_all('a'):
+                for link in dom.find_all('a', breadcrumb_nav):
                     breadcrumbs.append({
-                        'text': link.get_text(strip=True),
+                        'text': dom.text(link, strip=True),
                         'url': link.get('href', '')
                     })
                 break
         
         return breadcrumbs
     
-    def extract_text_chunks(self, content: BeautifulSoup, chunk_size: int = 500) -> List[str]:
+    def extract_text_chunks(self, content: BeautifulSoup, chunk_size: int = 500,
+                            dom: Optional[DomIndex] = None) -> List[str]:
         """
         Extract text content and split into chunks for better RAG indexing.
         
         Args:
             content: BeautifulSoup object
             chunk_size: Approximate size of each chunk in words
+            dom: Index of the page (built from content if not given)
             
         Returns:
             List of text chunks
         """
         # Get all text
-        text = content.get_text(separator=' ', strip=True)
+        dom = dom or DomIndex(content)
+        text = dom.text(content, separator=' ', strip=True)
         
         # Split into words
         words = text.split()
@@ -608,49 +971,98 @@ class SafeDocsCrawler:
         Returns:
             List of discovered sitemap URLs
         """
+        # Probe all candidate locations at once
+        candidates = self.sitemap_candidates(base_url)
+        with ThreadPoolExecutor(max_workers=SITEMAP_FETCH_WORKERS) as pool:
+            responses = list(pool.map(self.probe_sitemap, candidates))
+        
+        discovered = []
+        for sitemap_url, response in zip(candidates, responses):
+            # Failed attempts are skipped silently
+            if response is None or response.status_code != 200:
+                continue
+            if self.is_sitemap_response(sitemap_url, response):
+                discovered.append(sitemap_url)
+                print(f"  ✓ Discovered sitemap: {sitemap_url}")
+        
+        # Sitemap references in robots.txt (read through the robots cache)
+        discovered.extend(self.sitemaps_in_robots(base_url))
+        return discovered
+    
+    def probe_sitemap(self, sitemap_url: str):
+        """
+        Check whether a candidate sitemap location exists (HEAD request).
+        
+        Args:
+            sitemap_url: Candidate URL
+        
+        Returns:
+            Response, or None if the request failed or, when rebuilding from
+            the cache, the URL is not cached
+        """
+        try:
+            if self.from_cache:
+                # Offline: only locations the cached crawl fetched can be found
+                return self.html_cache.get(sitemap_url)
+            return self.session.head(sitemap_url, timeout=10, allow_redirects=True)
+        except Exception:
+            return None
+    
+    def is_sitemap_response(self, sitemap_url: str, response) -> bool:
+        """
+        Decide from the URL and content type whether a probed location is a sitemap.
+        
+        Args:
+            sitemap_url: Probed URL
+            response: Successful response of the probe
+        
+        Returns:
+            True for XML documents and .xml / .xml.gz locations
+        """
+        content_type = response.headers.get('content-type', '').lower()
+        return 'xml' in content_type or sitemap_url.endswith(('.xml', '.xml.gz'))
+    
+    def sitemap_candidates(self, base_url: str) -> List[str]:
+        """
+        Common sitemap locations on the host of a URL that were not processed yet.
+        
+        Args:
+            base_url: URL on the host to probe
+        
+        Returns:
+            Candidate URLs (robots.txt references are read by sitemaps_in_robots)
+        """
         parsed = urlparse(base_url)
         base_domain_url = f"{parsed.scheme}://{parsed.netloc}"
         
         # Common sitemap locations
         sitemap_paths = [
             '/sitemap.xml',
+            '/sitemap.xml.gz',
             '/sitemap_index.xml',
             '/sitemap-index.xml',
             '/sitemaps/sitemap.xml',
             '/sitemap/sitemap.xml',
-            '/robots.txt',  # May contain sitemap reference
         ]
+        return [base_domain_url + path for path in sitemap_paths
+                if base_domain_url + path not in self.processed_sitemaps]
+    
+    def sitemaps_in_robots(self, base_url: str) -> List[str]:
+        """
+        Read the sitemap references of a host's robots.txt.
         
-        discovered = []
-        
-        for path in sitemap_paths:
-            sitemap_url = base_domain_url + path
-            
-            if sitemap_url in self.processed_sitemaps:
-                continue
-                
-            try:
-                response = self.session.head(sitemap_url, timeout=10, allow_redirects=True)
-                if response.status_code == 200:
-                    # Check content type
-                    content_type = response.headers.get('content-type', '').lower()
-                    if 'xml' in content_type or path.endswith('.xml'):
-                        discovered.append(sitemap_url)
-                        print(f"  ✓ Discovered sitemap: {sitemap_url}")
-                    elif path.endswith('robots.txt'):
-                        # Parse robots.txt for sitemap references
-                        response = self.session.get(sitemap_url, timeout=10)
-                        for line in response.text.split('\n'):
-                            if line.lower().startswith('sitemap:'):
-                                sitemap_ref = line.split(':', 1)[1].strip()
-                                if sitemap_ref not in self.processed_sitemaps:
-                                    discovered.append(sitemap_ref)
-                                    print(f"  ✓ Found sitemap in robots.txt: {sitemap_ref}")
-            except Exception as e:
-                # Silently skip failed attempts
-                pass
+        Args:
+            base_url: URL on the host
         
-        return discovered
+        Returns:
+            Referenced sitemap URLs that were not processed yet
+        """
+        found = []
+        for sitemap_ref in self.robots.sitemaps(base_url):
+            if sitemap_ref not in self.processed_sitemaps:
+                found.append(sitemap_ref)
+                print(f"  ✓ Found sitemap in robots.txt: {sitemap_ref}")
+        return found
     
     def generate_sitemap_with_xml_sitemaps(self, start_url: str) -> Optional[str]:
         """
@@ -799,138 +1211,389 @@ class SafeDocsCrawler:
         Returns:
             Dictionary with all extracted data or None if failed
         """
-        # Fetch page
-        soup, response = self.fetch_page(url)
-        if not soup:
+        result = self.resolve_extraction(url, self.run_page(url, parent_url, depth, sitemap_data))
+        if not result:
             return None
         
-        # Extract navigation links (priority links)
-        nav_links = self.extract_navigation_links(soup, url)
-        for nav_url in nav_links:
-            if nav_url not in self.navigation_links:
-                self.navigation_links.add(nav_url)
+        page_data, nav_links = result
+        self.merge_page(url, parent_url, depth, page_data, nav_links)
+        return page_data
+    
+    def run_page(self, url: str, parent_url: Optional[str] = None,
+                 depth: int = 0, sitemap_data: Optional[Dict] = None):
+        """
+        Run fetch_and_extract, under the page profiler when profiling.
         
-        # Discover sitemaps from this page if enabled
-        if self.auto_discover_sitemaps and depth == 0:  # Only check from root pages
-            discovered_sitemaps = self.discover_sitemaps(url)
-            for sitemap_url in discovered_sitemaps:
-                if sitemap_url not in self.processed_sitemaps:
-                    self.processed_sitemaps.add(sitemap_url)
-                    self.stats['sitemaps_discovered'] += 1
-                    # Parse the discovered sitemap
-                    new_urls = self.parse_sitemap(sitemap_url)
-                    print(f"  → Found {len(new_urls)} URLs in discovered sitemap")
-                    # Add new URLs to queue if not already visited
-                    for url_data in new_urls:
-                        new_url = self.normalize_url(url_data['url'])
-                        if new_url not in self.visited_urls and self.is_valid_url(new_url):
-                            if not any(new_url == q[0] for q in self.url_queue):
-                                self.url_queue.append((new_url, url, 0, url_data))
+        Args:
+            url: URL to process
+            parent_url: Parent URL that linked to this page
+            depth: Current crawling depth
+            sitemap_data: Optional data from sitemap
         
-        # Extract all content
-        metadata = self.extract_metadata(soup, url, sitemap_data or {})
-        main_content = self.extract_main_content(soup)
-        sections = self.extract_sections(main_content)
-        links = self.extract_links(main_content, url)
-        code_snippets = self.extract_code_snippets(main_content)
-        breadcrumbs = self.extract_breadcrumbs(soup)
-        text_chunks = self.extract_text_chunks(main_content)
+        Returns:
+            Return value of fetch_and_extract
+        """
+        if self.profiler:
+            return self.profiler.call(url, self.fetch_and_extract, url, parent_url, depth, sitemap_data)
+        return self.fetch_and_extract(url, parent_url, depth, sitemap_data)
+    
+    def fetch_and_extract(self, url: str, parent_url: Optional[str] = None,
+                          depth: int = 0, sitemap_data: Optional[Dict] = None) -> Optional[Tuple[Dict, List[str]]]:
+        """
+        Fetch a page and extract its data without touching shared crawl state.
+        Safe to call from worker threads.
         
-        # Get internal links for recursive crawling
-        internal_links = [l['url'] for l in links if l['is_internal']]
+        With an extraction pool the raw HTML is handed to a worker process and
+        a PendingExtraction is returned; resolve_extraction() waits for it.
         
-        # Store link relationships
-        self.link_graph[url] = {
-            'internal_links': internal_links,
-            'external_links': [l['url'] for l in links if not l['is_internal']],
-            'parent': parent_url,
-            'depth': depth,
-            'from_navigation': url in self.navigation_links
-        }
+        Args:
+            url: URL to process
+            parent_url: Parent URL that linked to this page
+            depth: Current crawling depth
+            sitemap_data: Optional data from sitemap
         
-        # Build comprehensive data structure for RAG
-        page_data = {
-            # Identification
-            'url': url,
-            'normalized_url': self.normalize_url(url),
-            'filename': self.url_to_filename(url),
-            
-            # Hierarchy and relationships
-            'parent_url': parent_url,
-            'depth': depth,
-            'breadcrumbs': breadcrumbs,
-            
-            # Metadata
-            'title': metadata['title'],
-            'description': metadata['description'],
-            'lastmod': metadata.get('lastmod', ''),
-            'priority': metadata.get('priority', ''),
-            'crawled_at': datetime.utcnow().isoformat(),
-            
-            # Content for RAG indexing
-            'text_chunks': text_chunks,  # Pre-chunked text for vector embedding
-            'full_text': ' '.join(text_chunks),  # Complete text content
-            
-            # Structured content
-            'sections': sections,
-            'section_count': len(sections),
-            
-            # Code snippets
-            'code_snippets': code_snippets,
-            'code_snippet_count': len(code_snippets),
-            'code_languages': list(set(s['language'] for s in code_snippets if s['language'])),
-            
-            # Links and relationships
-            'links': {
-                'internal': [l for l in links if l['is_internal']],
-                'external': [l for l in links if not l['is_internal']],
-                'internal_count': len([l for l in links if l['is_internal']]),
-                'external_count': len([l for l in links if not l['is_internal']]),
-            },
-            
-            # Sibling pages (pages with same parent)
-            'siblings': [],  # Will be populated later
-        }
+        Returns:
+            Tuple of (page data, navigation links), PendingExtraction, or None if failed
+        """
+        headers = None
+        if self.incremental and self.can_reuse_page(url):
+            lastmod = (sitemap_data or {}).get('lastmod', '')
+            if self.manifest.is_unchanged(url, lastmod):
+                return self.reuse_page(url, parent_url, depth, sitemap_data)
+            headers = self.manifest.conditional_headers(url)
+        
+        response = self.fetch_response(url, headers)
+        if response is None:
+            return None
+        if response.status_code == 304:
+            return self.reuse_page(url, parent_url, depth, sitemap_data, response)
+        
+        if self.extract_pool:
+            # Blocks while the extraction queue is full (backpressure on fetching)
+            self.extract_slots.acquire()
+            future = self.extract_pool.submit(extract_page_in_worker, response.content,
+                                              url, parent_url, depth, sitemap_data)
+            future.add_done_callback(lambda _: self.extract_slots.release())
+            return PendingExtraction(future, response)
+        
+        extracted = self.extract_content(url, response.content, parent_url, depth, sitemap_data)
+        if not extracted:
+            return None
         
-        # Convert to markdown
-        markdown = self.convert_to_markdown(
-            main_content, metadata, sections, links, code_snippets
-        )
+        page_data, nav_links = extracted
+        return self.record_extraction(url, page_data, nav_links, response)
+    
+    def extract_content(self, url: str, content: bytes, parent_url: Optional[str] = None,
+                        depth: int = 0, sitemap_data: Optional[Dict] = None) -> Optional[Tuple[Dict, List[str]]]:
+        """
+        Parse raw HTML and extract the page (saving its markdown file).
         
-        # Save markdown file
-        filename = self.url_to_filename(url)
-        output_path = self.output_dir / filename
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(markdown)
+        Args:
+            url: Page URL
+            content: Raw HTML
+            parent_url: Parent URL that linked to this page
+            depth: Current crawling depth
+            sitemap_data: Optional data from sitemap
         
-        return page_data
-    
-    def add_sibling_relationships(self):
+        Returns:
+            Tuple of (page data, navigation links), or None if parsing failed
         """
-        Add sibling relationships to page data based on parent URLs.
+        soup = self.parse_response(url, content)
+        if not soup:
+            return None
+        return self.extract_page(soup, url, parent_url, depth, sitemap_data)
+    
+    def resolve_extraction(self, url: str, result):
         """
-        # Group pages by parent
-        children_by_parent = {}
-        for page in self.page_data:
-            parent = page.get('parent_url')
-            if parent:
-                if parent not in children_by_parent:
-                    children_by_parent[parent] = []
-                children_by_parent[parent].append(page['url'])
+        Wait for a page handed to the extraction pool. Called on the main thread.
         
-        # Add siblings to each page
-        for page in self.page_data:
-            parent = page.get('parent_url')
-            if parent and parent in children_by_parent:
-                siblings = [url for url in children_by_parent[parent] if url != page['url']]
-                page['siblings'] = siblings
-                page['sibling_count'] = len(siblings)
-    
-    def save_json_output(self):
+        Args:
+            url: URL of the page
+            result: Return value of fetch_and_extract
+        
+        Returns:
+            Tuple of (page data, navigation links) or None if failed
         """
-        Save comprehensive JSON output for RAG indexing.
+        if not isinstance(result, PendingExtraction):
+            return result
+        extracted, histograms = result.future.result()
+        # Stage timings recorded in the extraction process
+        self.metrics.merge_histograms(histograms)
+        if extracted is None:
+            return None
+        page_data, nav_links = extracted
+        return self.record_extraction(url, page_data, nav_links, result.response)
+    
+    def record_extraction(self, url: str, page_data: Dict, nav_links: List[str],
+                          response: requests.Response) -> Tuple[Dict, List[str]]:
         """
-        # Add sibling relationships
+        Record a freshly extracted page in the incremental crawl manifest.
+        
+        Args:
+            url: URL of the page
+            page_data: Extracted page data
+            nav_links: Navigation links found on the page
+            response: Response the page was extracted from
+        
+        Returns:
+            Tuple of (page data, navigation links)
+        """
+        if self.incremental:
+            self.manifest.record(url, page_data, nav_links,
+                                 lastmod=page_data['lastmod'],
+                                 etag=response.headers.get('ETag', ''),
+                                 last_modified=response.headers.get('Last-Modified', ''))
+        return page_data, nav_links
+    
+    def can_reuse_page(self, url: str) -> bool:
+        """
+        Check whether the previous crawl left a usable record for a URL.
+        
+        Args:
+            url: Normalized URL
+        
+        Returns:
+            True if the manifest has the page and its markdown file still exists
+        """
+        entry = self.manifest.get(url)
+        return bool(entry) and (self.output_dir / entry['page']['filename']).exists()
+    
+    def reuse_page(self, url: str, parent_url: Optional[str], depth: int,
+                   sitemap_data: Optional[Dict],
+                   response: Optional[requests.Response] = None) -> Tuple[Dict, List[str]]:
+        """
+        Rebuild a page result from the previous crawl instead of re-extracting it.
+        
+        Args:
+            url: Normalized URL
+            parent_url: Parent URL that linked to this page in this crawl
+            depth: Crawling depth of the page in this crawl
+            sitemap_data: Optional data from sitemap
+            response: 304 response when the page was revalidated, None when
+                it was skipped based on sitemap lastmod
+        
+        Returns:
+            Tuple of (page data, navigation links)
+        """
+        entry = self.manifest.get(url)
+        sitemap_data = sitemap_data or {}
+        
+        # Hierarchy and sitemap fields belong to this crawl, content to the last one
+        page_data = dict(entry['page'])
+        page_data.update({
+            'parent_url': parent_url,
+            'depth': depth,
+            'lastmod': sitemap_data.get('lastmod', ''),
+            'priority': sitemap_data.get('priority', ''),
+            'siblings': [],
+        })
+        page_data.pop('sibling_count', None)
+        
+        etag = entry.get('etag', '')
+        last_modified = entry.get('last_modified', '')
+        if response is not None:
+            etag = response.headers.get('ETag', etag)
+            last_modified = response.headers.get('Last-Modified', last_modified)
+        
+        self.manifest.record(url, page_data, entry['nav_links'],
+                             lastmod=page_data['lastmod'], etag=etag,
+                             last_modified=last_modified, reused=True)
+        return page_data, list(entry['nav_links'])
+    
+    def merge_page(self, url: str, parent_url: Optional[str], depth: int,
+                   page_data: Dict, nav_links: List[str]):
+        """
+        Merge an extracted page into the shared crawl state (navigation links,
+        discovered sitemaps and link graph). Must run on the crawl thread.
+        
+        Args:
+            url: URL of the processed page
+            parent_url: Parent URL that linked to this page
+            depth: Crawling depth of the page
+            page_data: Page data returned by extract_page
+            nav_links: Navigation links returned by extract_page
+        """
+        # Register navigation links (priority links)
+        self.navigation_links.update(nav_links)
+        
+        # Discover sitemaps from this page if enabled
+        if self.auto_discover_sitemaps and depth == 0:  # Only check from root pages
+            self.enqueue_discovered_sitemaps(url)
+        
+        # Store link relationships
+        self.link_graph[url] = {
+            'internal_links': [l['url'] for l in page_data['links']['internal']],
+            'external_links': [l['url'] for l in page_data['links']['external']],
+            'parent': parent_url,
+            'depth': depth,
+            'from_navigation': url in self.navigation_links
+        }
+    
+    def enqueue_discovered_sitemaps(self, url: str):
+        """
+        Discover sitemaps on the host of the given page and queue their URLs.
+        Each host is only probed once per crawl.
+        
+        Args:
+            url: Page URL whose host should be probed
+        """
+        host = urlparse(url).netloc
+        if host in self.discovered_hosts:
+            return
+        self.discovered_hosts.add(host)
+        
+        discovered_sitemaps = self.discover_sitemaps(url)
+        for sitemap_url in discovered_sitemaps:
+            if sitemap_url not in self.processed_sitemaps:
+                self.processed_sitemaps.add(sitemap_url)
+                self.stats['sitemaps_discovered'] += 1
+                # Parse the discovered sitemap
+                self.enqueue_sitemap_urls(self.iter_sitemap(sitemap_url), url)
+    
+    def enqueue_sitemap_urls(self, new_urls: Iterable[SitemapEntry], source_url: str):
+        """
+        Queue the URLs of a discovered sitemap at depth 0 as they are read.
+        
+        Args:
+            new_urls: Sitemap entries from iter_sitemap or parse_sitemap
+            source_url: Page whose host the sitemap was discovered on
+        """
+        # Add new URLs to queue if not already visited
+        found = 0
+        for entry in new_urls:
+            found += 1
+            new_url = self.normalize_url(entry.url)
+            if self.is_valid_url(new_url):
+                self.url_queue.push(new_url, source_url, 0, entry,
+                                    priority=self.url_priority(new_url, entry))
+        print(f"  → Found {found} URLs in discovered sitemap")
+    
+    def extract_page(self, soup: BeautifulSoup, url: str, parent_url: Optional[str] = None,
+                     depth: int = 0, sitemap_data: Optional[Dict] = None) -> Tuple[Dict, List[str]]:
+        """
+        Extract all data from a fetched page and save its markdown file.
+        
+        Args:
+            soup: BeautifulSoup object of the page
+            url: Page URL
+            parent_url: Parent URL that linked to this page
+            depth: Current crawling depth
+            sitemap_data: Optional data from sitemap
+        
+        Returns:
+            Tuple of (page data, navigation links)
+        """
+        timed = self.metrics.time
+        
+        # Index the page in a single walk; every extraction step below is a lookup
+        with timed('extract_seconds', step='dom_index'):
+            dom = DomIndex(soup)
+        
+        # Extract navigation links (priority links)
+        with timed('extract_seconds', step='navigation_links'):
+            nav_links = self.extract_navigation_links(soup, url, dom)
+        
+        # Extract all content
+        with timed('extract_seconds', step='metadata'):
+            metadata = self.extract_metadata(soup, url, sitemap_data or {}, dom)
+        with timed('extract_seconds', step='main_content'):
+            main_content = self.extract_main_content(soup, dom)
+        with timed('extract_seconds', step='sections'):
+            sections = self.extract_sections(main_content, dom)
+        with timed('extract_seconds', step='links'):
+            links = self.extract_links(main_content, url, dom)
+        with timed('extract_seconds', step='code_snippets'):
+            code_snippets = self.extract_code_snippets(main_content, dom)
+        with timed('extract_seconds', step='breadcrumbs'):
+            breadcrumbs = self.extract_breadcrumbs(soup, dom)
+        with timed('extract_seconds', step='text_chunks'):
+            text_chunks = self.extract_text_chunks(main_content, dom=dom)
+        
+        # Build comprehensive data structure for RAG
+        page_data = {
+            # Identification
+            'url': url,
+            'normalized_url': self.normalize_url(url),
+            'filename': self.url_to_filename(url),
+            
+            # Hierarchy and relationships
+            'parent_url': parent_url,
+            'depth': depth,
+            'breadcrumbs': breadcrumbs,
+            
+            # Metadata
+            'title': metadata['title'],
+            'description': metadata['description'],
+            'lastmod': metadata.get('lastmod', ''),
+            'priority': metadata.get('priority', ''),
+            'crawled_at': datetime.utcnow().isoformat(),
+            
+            # Content for RAG indexing
+            'text_chunks': text_chunks,  # Pre-chunked text for vector embedding
+            'full_text': ' '.join(text_chunks),  # Complete text content
+            
+            # Structured content
+            'sections': sections,
+            'section_count': len(sections),
+            
+            # Code snippets
+            'code_snippets': code_snippets,
+            'code_snippet_count': len(code_snippets),
+            'code_languages': list(set(s['language'] for s in code_snippets if s['language'])),
+            
+            # Links and relationships
+            'links': {
+                'internal': [l for l in links if l['is_internal']],
+                'external': [l for l in links if not l['is_internal']],
+                'internal_count': len([l for l in links if l['is_internal']]),
+                'external_count': len([l for l in links if not l['is_internal']]),
+            },
+            
+            # Sibling pages (pages with same parent)
+            'siblings': [],  # Will be populated later
+        }
+        
+        # Convert to markdown
+        with timed('markdown_seconds'):
+            markdown = self.convert_to_markdown(
+                main_content, metadata, sections, links, code_snippets
+            )
+        
+        # Save markdown file
+        self.write_markdown(self.url_to_filename(url), markdown)
+        
+        return page_data, nav_links
+    
+    def write_markdown(self, filename: str, markdown: str):
+        """
+        Write a page's markdown file to the output directory.
+        
+        Args:
+            filename: File name from url_to_filename
+            markdown: Markdown document
+        """
+        with self.metrics.time('write_seconds'):
+            with open(self.output_dir / filename, 'w', encoding='utf-8') as f:
+                f.write(markdown)
+    
+    def add_sibling_relationships(self):
+        """
+        Add sibling relationships to page data based on parent URLs.
+        """
+        sibling_map = build_sibling_map((page['url'], page.get('parent_url')) for page in self.page_data)
+        
+        # Add siblings to each page
+        for page in self.page_data:
+            siblings = sibling_map.get(page['url'])
+            if siblings is not None:
+                page['siblings'] = siblings
+                page['sibling_count'] = len(siblings)
+    
+    def save_json_output(self):
+        """
+        Save comprehensive JSON output for RAG indexing.
+        """
+        # Add sibling relationships
         self.add_sibling_relationships()
         
         # Prepare output data
@@ -956,23 +1619,7 @@ class SafeDocsCrawler:
         vector_data = []
         for page in self.page_data:
             # Create one entry per text chunk for better granularity
-            for i, chunk in enumerate(page['text_chunks']):
-                vector_entry = {
-                    'id': f"{page['url']}#chunk-{i}",
-                    'url': page['url'],
-                    'chunk_index': i,
-                    'total_chunks': len(page['text_chunks']),
-                    'text': chunk,
-                    'title': page['title'],
-                    'description': page['description'],
-                    'parent_url': page['parent_url'],
-                    'breadcrumbs': page['breadcrumbs'],
-                    'depth': page['depth'],
-                    'section_titles': [s['title'] for s in page['sections']],
-                    'has_code': page['code_snippet_count'] > 0,
-                    'code_languages': page['code_languages'],
-                }
-                vector_data.append(vector_entry)
+            vector_data.extend(build_vector_entries(page))
         
         vector_path = self.output_dir / 'vector_data.json'
         with open(vector_path, 'w', encoding='utf-8') as f:
@@ -981,76 +1628,168 @@ class SafeDocsCrawler:
         print(f"✓ Vector-optimized data saved to: {vector_path}")
         print(f"  → {len(vector_data)} text chunks ready for embedding")
     
-    def crawl(self, delay: float = 1.0):
+    def finalize_stream_output(self):
         """
-        Main crawl method - crawls all URLs from sitemap and recursively follows links.
+        Finish streaming output: close the JSONL files and write the link
+        graph, sibling relationships and crawl metadata.
+        """
+        self.output_writer.finalize(self.link_graph, {
+            'crawl_date': datetime.utcnow().isoformat(),
+            'base_domain': self.base_domain,
+            'statistics': self.stats,
+        })
+        
+        print(f"\n✓ Streamed {self.output_writer.pages_written} pages and "
+              f"{self.output_writer.chunks_written} text chunks to: {self.output_dir}")
+    
+    def store_page(self, page_data: Dict):
+        """
+        Keep a finished page for the JSON output, or stream it to disk.
         
         Args:
-            delay: Delay between requests in seconds
+            page_data: Page data dictionary
         """
-        self.stats['start_time'] = datetime.utcnow().isoformat()
+        if self.output_writer:
+            self.output_writer.write_page(page_data)
+        else:
+            self.page_data.append(page_data)
+    
+    def extract_worker_options(self) -> Dict:
+        """
+        Constructor arguments for the extractor built in each extraction process.
         
-        # Create output directory
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-        print(f"Created output directory: {self.output_dir}")
-        print(f"Recursive crawling: {'enabled' if self.recursive else 'disabled'}")
-        print(f"Max depth: {self.max_depth}")
+        Returns:
+            Keyword arguments for SafeDocsCrawler
+        """
+        return {
+            'sitemap_path': self.sitemap_path,
+            'output_dir': str(self.output_dir),
+            'base_domain': self.base_domain,
+            'parser': self.parser,
+            # Links are checked against robots.txt when queued by the main process
+            'respect_robots': False,
+        }
+    
+    def setup_rate_limiter(self, delay: float):
+        """
+        Create the per-host adaptive rate control. Each host starts at
+        concurrency requests in flight and the initial rate, and may grow to
+        max_concurrency and the rate scaled by the same factor (without limit
+        when delay is 0) while its latency and error rate stay under target.
         
-        # Generate sitemap using xml-sitemaps.com if requested
-        if self.use_xml_sitemaps:
-            if not self.xml_sitemaps_url:
-                print("⚠ Warning: --use-xml-sitemaps enabled but no --xml-sitemaps-url provided")
-                print("  Using default sitemap instead")
-            else:
-                generated_sitemap = self.generate_sitemap_with_xml_sitemaps(self.xml_sitemaps_url)
-                if generated_sitemap:
-                    # Use the generated sitemap instead of the original
-                    self.sitemap_path = generated_sitemap
-                    print(f"✓ Using generated sitemap from xml-sitemaps.com")
-                else:
-                    print(f"⚠ Failed to generate sitemap, falling back to: {self.sitemap_path}")
+        Args:
+            delay: Delay between requests, used to derive the initial rate
+                when requests_per_second is not set
+        """
+        rate = self.requests_per_second
+        if not rate:
+            rate = self.concurrency / delay if delay > 0 else float(self.concurrency * 10)
+        max_rate = rate * self.max_concurrency / self.concurrency
+        if not self.requests_per_second and delay <= 0:
+            # No delay asked for: keep probing upwards while the host copes
+            max_rate = float('inf')
+        self.rate_limiter = HostRateLimiter(
+            rate, burst=self.concurrency, concurrency=self.concurrency, max_rate=max_rate,
+            max_concurrency=self.max_concurrency, latency_target=self.latency_target)
+        for host, crawl_delay in self.crawl_delays.items():
+            self.rate_limiter.set_host_rate(host, 1.0 / crawl_delay, burst=1, fixed=True)
+    
+    def claim_url(self, url: str, depth: int, count_skipped: bool = True) -> bool:
+        """
+        Mark a dequeued URL as visited if it still needs processing.
         
-        # Parse sitemap and add to queue
-        sitemap_urls = self.parse_sitemap(self.sitemap_path)
-        print(f"Found {len(sitemap_urls)} URLs in sitemap")
+        Args:
+            url: Dequeued URL
+            depth: Depth the URL was queued at
+            count_skipped: Whether to count rejected URLs as skipped
         
-        # Store sitemap data for reference
-        sitemap_map = {data['url']: data for data in sitemap_urls}
+        Returns:
+            True if the URL should be processed, False otherwise
+        """
+        # Skip if already visited or depth exceeds maximum
+        if url in self.visited_urls or depth > self.max_depth:
+            if count_skipped:
+                self.stats['total_skipped'] += 1
+            return False
         
-        # Initialize queue with sitemap URLs at depth 0
-        for url_data in sitemap_urls:
-            url = self.normalize_url(url_data['url'])
-            if url not in self.visited_urls:
-                self.url_queue.append((url, None, 0, url_data))
+        self.visited_urls.add(url)
+        self.stats['total_visited'] += 1
+        return True
+    
+    def enqueue_internal_links(self, page_data: Dict, url: str, depth: int) -> int:
+        """
+        Queue the internal links of a processed page one level deeper.
         
-        # Process queue
-        while self.url_queue:
-            url, parent_url, depth, sitemap_data = self.url_queue.popleft()
-            
-            # Skip if already visited
-            if url in self.visited_urls:
-                self.stats['total_skipped'] += 1
-                continue
-            
-            # Skip if depth exceeds maximum
-            if depth > self.max_depth:
-                self.stats['total_skipped'] += 1
-                continue
-            
-            # Mark as visited
-            self.visited_urls.add(url)
-            self.stats['total_visited'] += 1
-            
-            print(f"\n[{self.stats['total_visited']}] Processing (depth {depth}): {url}")
+        Args:
+            page_data: Page data of the processed page
+            url: URL of the processed page (parent of the queued links)
+            depth: Depth of the processed page
+        
+        Returns:
+            Number of URLs added to the queue
+        """
+        new_urls = 0
+        for link_data in page_data['links']['internal']:
+            link_url = self.normalize_url(link_data['url'])
+            # push() skips URLs that are already visited or queued
+            if self.is_valid_url(link_url) and self.url_queue.push(
+                    link_url, url, depth + 1, None, priority=self.url_priority(link_url)):
+                new_urls += 1
+        return new_urls
+    
+    def url_priority(self, url: str, sitemap_data: Optional[Dict] = None) -> float:
+        """
+        Compute the queue priority of a URL (only used with prioritize=True).
+        Navigation links rank above everything else, then sitemap priority.
+        
+        Args:
+            url: Normalized URL
+            sitemap_data: Optional data from sitemap
+        
+        Returns:
+            Priority value (higher is crawled first within a depth)
+        """
+        priority = sitemap_priority(sitemap_data)
+        if url in self.navigation_links:
+            priority += 1.0
+        return priority
+    
+    def print_page_header(self, number: int, url: str, parent_url: Optional[str],
+                          depth: int, navigation: bool = False):
+        """
+        Print the progress line for a page about to be (or just) processed.
+        
+        Args:
+            number: Sequence number of the page in this crawl
+            url: Processed URL
+            parent_url: Parent URL that linked to this page
+            depth: Depth of the page
+            navigation: Whether the page came from the navigation link pass
+        """
+        if navigation:
+            print(f"\n[NAV-{number}] Processing navigation link: {url}")
+        else:
+            print(f"\n[{number}] Processing (depth {depth}): {url}")
             if parent_url:
                 print(f"  ← Parent: {parent_url}")
+    
+    def record_page(self, url: str, depth: int, page_data: Optional[Dict],
+                    navigation: bool = False):
+        """
+        Record the outcome of a processed page: store it, print progress and
+        queue its internal links.
+        
+        Args:
+            url: Processed URL
+            depth: Depth of the page
+            page_data: Page data or None if processing failed
+            navigation: Whether the page came from the navigation link pass
+        """
+        self.metrics.inc('pages_total', outcome='ok' if page_data else 'failed')
+        if page_data:
+            self.store_page(page_data)
             
-            # Process page
-            page_data = self.process_page(url, parent_url, depth, sitemap_data)
-            
-            if page_data:
-                self.page_data.append(page_data)
-                
+            if not navigation:
                 # Extract statistics
                 sections = page_data['section_count']
                 links = page_data['links']['internal_count'] + page_data['links']['external_count']
@@ -1058,75 +1797,379 @@ class SafeDocsCrawler:
                 chunks = len(page_data['text_chunks'])
                 
                 print(f"  → {sections} sections, {links} links, {snippets} code snippets, {chunks} text chunks")
-                print(f"  ✓ Saved to: {page_data['filename']}")
-                
-                # Add internal links to queue if recursive mode enabled
-                if self.recursive and depth < self.max_depth:
-                    internal_links = page_data['links']['internal']
-                    new_urls = 0
-                    for link_data in internal_links:
-                        link_url = self.normalize_url(link_data['url'])
-                        if link_url not in self.visited_urls and self.is_valid_url(link_url):
-                            # Check if already in queue
-                            if not any(link_url == q[0] for q in self.url_queue):
-                                self.url_queue.append((link_url, url, depth + 1, None))
-                                new_urls += 1
-                    
-                    if new_urls > 0:
-                        print(f"  → Added {new_urls} new URLs to queue (queue size: {len(self.url_queue)})")
-            else:
-                print(f"  ✗ Failed to process page")
+            print(f"  ✓ Saved to: {page_data['filename']}")
+            
+            # Add internal links to queue if recursive mode enabled
+            if self.recursive and depth < self.max_depth:
+                new_urls = self.enqueue_internal_links(page_data, url, depth)
+                if new_urls > 0 and not navigation:
+                    print(f"  → Added {new_urls} new URLs to queue (queue size: {len(self.url_queue)})")
+        elif not navigation:
+            print(f"  ✗ Failed to process page")
+            self.stats['total_failed'] += 1
+    
+    def complete_page(self, url: str, parent_url: Optional[str], depth: int,
+                      result: Optional[Tuple[Dict, List[str]]], navigation: bool = False,
+                      pending: Optional[List] = None):
+        """
+        Merge, record and journal the result of fetch_and_extract.
+        
+        Args:
+            url: Processed URL
+            parent_url: Parent URL that linked to this page
+            depth: Depth of the page
+            result: Tuple of (page data, navigation links) or None if failed
+            navigation: Whether the page came from the navigation link pass
+            pending: Claimed entries whose results are not merged yet
+        """
+        page_data, nav_links = result if result else (None, [])
+        if page_data:
+            self.merge_page(url, parent_url, depth, page_data, nav_links)
+        self.record_page(url, depth, page_data, navigation)
+        self.metrics.set_gauge('queue_depth', len(self.url_queue))
+        self.update_rate_stats()
+        self.metrics.export()
+        
+        if self.journal:
+            self.journal.append_page(url, parent_url, depth, page_data, nav_links,
+                                     self.link_graph.get(url), navigation,
+                                     self.manifest.entries.get(url))
+            self.pages_since_checkpoint += 1
+            if self.checkpoint_every and self.pages_since_checkpoint >= self.checkpoint_every:
+                self.write_checkpoint(pending)
+    
+    def update_rate_stats(self):
+        """Copy the current per-host rate control state to the stats and gauges."""
+        if not self.rate_limiter:
+            return
+        hosts = self.rate_limiter.snapshot()
+        self.stats['rate_control'] = hosts
+        self.metrics.set_gauge('request_rate', sum(host['rate'] for host in hosts.values()))
+        self.metrics.set_gauge('request_concurrency', sum(host['concurrency'] for host in hosts.values()))
+    
+    def write_checkpoint(self, pending: Optional[List] = None):
+        """
+        Checkpoint the frontier, stats and discovery state to the journal.
+        
+        Args:
+            pending: Claimed entries whose results are not merged yet; they are
+                stored at the front of the frontier and not counted as visited
+        """
+        pending = pending or []
+        frontier = [[url, parent_url, depth,
+                     sitemap_data.to_dict() if isinstance(sitemap_data, SitemapEntry) else sitemap_data]
+                    for url, parent_url, depth, sitemap_data in chain(pending, self.url_queue)]
+        stats = dict(self.stats, total_visited=self.stats['total_visited'] - len(pending))
+        self.journal.append_checkpoint(self.crawl_phase, frontier, stats,
+                                       sorted(self.navigation_links),
+                                       sorted(self.processed_sitemaps),
+                                       sorted(self.discovered_hosts))
+        if self.html_cache:
+            # Keep the cache index in step with the journal for --resume
+            self.html_cache.save()
+        self.pages_since_checkpoint = 0
+    
+    def restore_from_journal(self, state: Dict) -> bool:
+        """
+        Restore crawl state from a previous crawl's journal.
+        
+        The last checkpoint provides the frontier, stats and discovery state;
+        pages journaled after it are replayed (marked visited and their links
+        queued) so nothing that completed is fetched again.
+        
+        Args:
+            state: Journal contents returned by CrawlJournal.load
+        
+        Returns:
+            True if a checkpoint was found (the queue is restored), False if
+            only page records were replayed and the queue still needs seeding
+        """
+        checkpoint = state['checkpoint']
+        if checkpoint:
+            self.crawl_phase = checkpoint['phase']
+            self.stats.update(checkpoint['stats'])
+            self.navigation_links.update(checkpoint['navigation_links'])
+            self.processed_sitemaps.update(checkpoint['processed_sitemaps'])
+            self.discovered_hosts.update(checkpoint['discovered_hosts'])
+            for url, parent_url, depth, sitemap_data in checkpoint['frontier']:
+                self.url_queue.append((url, parent_url, depth, sitemap_data),
+                                      priority=self.url_priority(url, sitemap_data))
+        
+        for record in state['pages_before']:
+            self.restore_page_record(record)
+        
+        for record in state['pages_after']:
+            url = record['url']
+            self.restore_page_record(record)
+            self.url_queue.discard(url)
+            self.navigation_links.update(record['nav_links'])
+            self.stats['total_visited'] += 1
+            page_data = record['page']
+            if page_data:
+                if self.recursive and record['depth'] < self.max_depth:
+                    self.enqueue_internal_links(page_data, url, record['depth'])
+            elif not record['navigation']:
                 self.stats['total_failed'] += 1
+        
+        print(f"✓ Resumed from journal: {len(self.visited_urls)} pages done, "
+              f"{len(self.url_queue)} queued ({self.crawl_phase} phase)")
+        return checkpoint is not None
+    
+    def restore_page_record(self, record: Dict):
+        """
+        Restore one journaled page into visited URLs, page data and link graph.
+        
+        Args:
+            record: Page record from the journal
+        """
+        url = record['url']
+        self.visited_urls.add(url)
+        if record['page']:
+            self.store_page(record['page'])
+        if record['link_graph']:
+            self.link_graph[url] = record['link_graph']
+        if record.get('manifest'):
+            self.manifest.entries[url] = record['manifest']
+    
+    def open_journal(self, resume: bool) -> bool:
+        """
+        Open the crawl journal, restoring state from it when resuming.
+        
+        Args:
+            resume: Whether to continue from the previous crawl's journal
+        
+        Returns:
+            True if the queue was restored from a checkpoint
+        """
+        self.journal = CrawlJournal(self.output_dir / JOURNAL_FILENAME)
+        state = self.journal.load() if resume else None
+        
+        if resume and not state:
+            print("⚠ Nothing to resume (no crawl journal found), starting a fresh crawl")
+        elif state and state['complete']:
+            print("⚠ The previous crawl completed, starting a fresh crawl")
+            state = None
+        
+        restored = False
+        if state:
+            restored = self.restore_from_journal(state)
+            # Compact the journal: replayed pages followed by a fresh checkpoint
+            self.journal.open(truncate=True)
+            for record in state['pages_before'] + state['pages_after']:
+                self.journal.append(record)
+        else:
+            self.journal.open(truncate=True)
+        return restored
+    
+    def process_queue(self, executor: Optional[ThreadPoolExecutor] = None,
+                      navigation: bool = False):
+        """
+        Process the URL queue until it is empty. Requests are paced by the
+        per-host adaptive rate control in both modes.
+        
+        Args:
+            executor: Thread pool for concurrent mode, None for sequential mode
+            navigation: Whether this is the navigation link pass
+        """
+        if executor:
+            self.process_queue_concurrent(executor, navigation)
+            return
+        
+        while self.url_queue:
+            url, parent_url, depth, sitemap_data = self.url_queue.popleft()
             
-            # Be polite - add delay between requests
-            if self.url_queue:
-                time.sleep(delay)
+            if not self.claim_url(url, depth, count_skipped=not navigation):
+                continue
+            
+            self.print_page_header(self.stats['total_visited'], url, parent_url, depth, navigation)
+            result = self.resolve_extraction(url, self.run_page(url, parent_url, depth, sitemap_data))
+            self.complete_page(url, parent_url, depth, result, navigation)
+    
+    def process_queue_concurrent(self, executor: ThreadPoolExecutor, navigation: bool = False):
+        """
+        Process the URL queue with several requests in flight.
+        
+        The queue is drained one depth level at a time: URLs of the level are
+        fetched (and extracted, on the threads or in the extraction pool) in
+        a bounded window, and the results are merged on this thread in queue
+        order. This keeps BFS depths, visited-URL dedup and the link graph
+        identical to a sequential crawl. Politeness comes from the per-host
+        adaptive rate control, which also decides how many of the threads
+        may have a request in flight.
         
+        Args:
+            executor: Thread pool running fetch_and_extract
+            navigation: Whether this is the navigation link pass
+        """
+        # Claimed but unmerged pages are bounded so fetched HTML cannot pile up
+        window_size = self.max_concurrency * 2 + self.extract_workers * 2
+        
+        while self.url_queue:
+            level_depth = self.url_queue.peek()[2]
+            window = deque()
+            while True:
+                while (len(window) < window_size and self.url_queue
+                       and self.url_queue.peek()[2] == level_depth):
+                    url, parent_url, depth, sitemap_data = self.url_queue.popleft()
+                    if self.claim_url(url, depth, count_skipped=not navigation):
+                        future = executor.submit(self.run_page, url, parent_url, depth, sitemap_data)
+                        window.append((self.stats['total_visited'], (url, parent_url, depth, sitemap_data), future))
+                if not window:
+                    break
+                
+                number, (url, parent_url, depth, _), future = window.popleft()
+                result = self.resolve_extraction(url, future.result())
+                self.print_page_header(number, url, parent_url, depth, navigation)
+                # Entries still in flight go back to the frontier if a checkpoint is written
+                self.complete_page(url, parent_url, depth, result, navigation,
+                                   pending=[pending_entry for _, pending_entry, _ in window])
+    
+    def crawl(self, delay: float = 1.0, resume: bool = False):
+        """
+        Main crawl method - crawls all URLs from sitemap and recursively follows links.
+        
+        Args:
+            delay: Delay between requests in seconds
+            resume: Whether to continue an interrupted crawl from its journal
+        """
+        delay = self.open_crawl(delay)
+        
+        restored = False
+        if self.checkpoint_every or resume:
+            restored = self.open_journal(resume)
+        if not restored:
+            self.initialize_queue()
+        if self.journal:
+            self.write_checkpoint()
+        
+        # Process queue
+        self.setup_rate_limiter(delay)
+        if self.max_concurrency > 1:
+            if self.extract_workers and self.profiler:
+                # Extraction processes are out of the profiler's reach
+                print("⚠ --profile extracts on the fetching threads, ignoring --extract-workers")
+                self.extract_workers = 0
+            if self.extract_workers:
+                # Start the processes before the fetching threads exist
+                self.start_extract_pool()
+            executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+            print(f"Concurrent crawling: {self.concurrency} requests in flight "
+                  f"(up to {self.max_concurrency}), {self.rate_limiter.rate:.2f} req/s per host")
+        else:
+            if self.extract_workers:
+                print("⚠ --extract-workers only applies with --concurrency or --max-concurrency above 1, extracting in-process")
+            executor = None
+            print(f"Sequential crawling: {self.rate_limiter.rate:.2f} req/s per host")
+        
+        try:
+            if self.crawl_phase == 'main':
+                self.process_queue(executor)
+                self.end_main_phase()
+            
+            # Process the navigation links
+            self.process_queue(executor, navigation=True)
+        finally:
+            if executor:
+                executor.shutdown()
+            self.close_crawl()
+        
+        self.finish_crawl()
+    
+    def open_crawl(self, delay: float) -> float:
+        """
+        Prepare the output directory, manifest, HTML cache and streamed output
+        before the queue is filled.
+        
+        Args:
+            delay: Requested delay between requests in seconds
+        
+        Returns:
+            Delay to use (0 when rebuilding from the HTML cache)
+        """
+        self.stats['start_time'] = datetime.utcnow().isoformat()
+        
+        # Create output directory
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        print(f"Created output directory: {self.output_dir}")
+        print(f"Recursive crawling: {'enabled' if self.recursive else 'disabled'}")
+        print(f"Max depth: {self.max_depth}")
+        if self.incremental:
+            previous_pages = self.manifest.load()
+            print(f"Incremental crawling: {previous_pages} pages known from the previous crawl")
+        if self.html_cache:
+            cached_pages = self.html_cache.load()
+            print(f"HTML cache: {cached_pages} documents in {self.html_cache.cache_dir}")
+        if self.from_cache:
+            # Nothing is requested from the servers, so there is nothing to wait for
+            delay = 0
+            print("Rebuilding from the HTML cache (no network requests)")
+        
+        if self.output_writer:
+            # Pages restored from the journal are streamed again
+            self.output_writer.open()
+        return delay
+    
+    def start_extract_pool(self):
+        """Start the extraction processes."""
+        self.extract_pool = ProcessPoolExecutor(
+            max_workers=self.extract_workers,
+            initializer=init_extract_worker,
+            initargs=(self.extract_worker_options(),))
+        print(f"Extraction pool: {self.extract_workers} processes")
+    
+    def end_main_phase(self):
+        """
+        Save the output of the main phase and queue the navigation links that
+        were not visited yet for the navigation pass.
+        """
         self.stats['end_time'] = datetime.utcnow().isoformat()
+        self.stats['total_unchanged'] = self.manifest.reused
         
-        # Save JSON output
-        self.save_json_output()
+        # Save JSON output (streamed output is finalized after the navigation pass)
+        if not self.output_writer:
+            self.save_json_output()
         
         # Process navigation links that weren't visited yet
+        self.crawl_phase = 'navigation'
         if self.navigation_links:
             nav_links_to_process = [url for url in self.navigation_links if url not in self.visited_urls]
             if nav_links_to_process:
                 print(f"\n🔍 Processing {len(nav_links_to_process)} navigation links not yet visited...")
                 for nav_url in nav_links_to_process:
                     if nav_url not in self.visited_urls and self.is_valid_url(nav_url):
-                        self.url_queue.append((nav_url, None, 0, None))
-                
-                # Process the navigation links
-                while self.url_queue:
-                    url, parent_url, depth, sitemap_data = self.url_queue.popleft()
-                    
-                    if url in self.visited_urls or depth > self.max_depth:
-                        continue
-                    
-                    self.visited_urls.add(url)
-                    self.stats['total_visited'] += 1
-                    
-                    print(f"\n[NAV-{self.stats['total_visited']}] Processing navigation link: {url}")
-                    
-                    page_data = self.process_page(url, parent_url, depth, sitemap_data)
-                    
-                    if page_data:
-                        self.page_data.append(page_data)
-                        print(f"  ✓ Saved to: {page_data['filename']}")
-                        
-                        # Add internal links if recursive
-                        if self.recursive and depth < self.max_depth:
-                            for link_data in page_data['links']['internal']:
-                                link_url = self.normalize_url(link_data['url'])
-                                if link_url not in self.visited_urls and self.is_valid_url(link_url):
-                                    if not any(link_url == q[0] for q in self.url_queue):
-                                        self.url_queue.append((link_url, url, depth + 1, None))
-                    
-                    if self.url_queue:
-                        time.sleep(delay)
-        
+                        self.url_queue.append((nav_url, None, 0, None),
+                                              priority=self.url_priority(nav_url))
+        if self.journal:
+            self.write_checkpoint()
+    
+    def close_crawl(self):
+        """Stop the extraction pool and close the journal, streamed output and HTML cache."""
+        if self.extract_pool:
+            self.extract_pool.shutdown()
+            self.extract_pool = None
+        if self.journal:
+            self.journal.close()
+        if self.output_writer:
+            self.output_writer.close()
+        if self.html_cache:
+            self.html_cache.save()
+    
+    def finish_crawl(self):
+        """Write the final outputs, mark the journal complete and print the summary."""
         self.stats['navigation_links_found'] = len(self.navigation_links)
         
+        if self.incremental:
+            self.stats['total_unchanged'] = self.manifest.reused
+            self.manifest.save()
+        
+        if self.output_writer:
+            self.finalize_stream_output()
+        
+        if self.journal:
+            self.journal.open()
+            self.journal.append_complete()
+            self.journal.close()
+        
         # Print summary
         print("\n" + "="*60)
         print("CRAWLING COMPLETE!")
@@ -1136,9 +2179,159 @@ class SafeDocsCrawler:
         print(f"Total pages failed: {self.stats['total_failed']}")
         print(f"Navigation links found: {self.stats['navigation_links_found']}")
         print(f"Sitemaps discovered: {self.stats['sitemaps_discovered']}")
+        if self.incremental:
+            print(f"Unchanged pages reused: {self.stats['total_unchanged']}")
+        for host, control in self.stats.get('rate_control', {}).items():
+            print(f"Rate control for {host}: {control['rate']:.2f} req/s, "
+                  f"{control['concurrency']} in flight, {control['backoffs']} backoffs")
+        if self.html_cache:
+            print(f"HTML cache: {len(self.html_cache.entries)} documents, "
+                  f"{self.html_cache.stored_bytes / 1e6:.1f} MB stored "
+                  f"({self.html_cache.hits} hits, {self.html_cache.evicted} evicted)")
         print(f"Markdown files saved to: {self.output_dir.absolute()}")
         print(f"JSON data files saved to: {self.output_dir.absolute()}")
+        self.report_metrics()
+        if self.profiler:
+            self.profiler.print_summary(self.profiler.write(self.output_dir))
         print("="*60)
+    
+    def report_metrics(self):
+        """
+        Save the crawl metrics summary, do a final Prometheus export and print
+        the stages that took the most time.
+        """
+        self.metrics.export(force=True)
+        metrics_path = self.output_dir / METRICS_FILENAME
+        self.metrics.save_summary(metrics_path)
+        
+        histograms = self.metrics.summary()['histograms']
+        timings = sorted(((name, data) for name, data in histograms.items()
+                          if '_seconds' in name and data['count']), key=lambda item: -item[1]['sum'])
+        if timings:
+            print("Slowest stages (total / mean / p95):")
+            for name, data in timings[:8]:
+                print(f"  {name:<45} {data['sum']:8.2f}s {data['mean'] * 1000:8.1f}ms {data['p95'] * 1000:8.1f}ms")
+        print(f"Metrics saved to: {metrics_path}")
+    
+    def profile_page(self, source: str, repeat: int = 20) -> bool:
+        """
+        Profile the parsing and extraction of one page, repeated to get stable
+        numbers, without crawling. The page comes from the HTML cache (source
+        is a URL) or a local HTML file.
+        
+        Args:
+            source: Page URL or path of an HTML file
+            repeat: Number of times the page is processed
+        
+        Returns:
+            True if the page was profiled, False if it could not be loaded
+        """
+        if not self.profiler:
+            self.profiler = PageProfiler()
+        
+        if Path(source).is_file():
+            content = Path(source).read_bytes()
+            # Links on the page are resolved against the site root
+            url = f"https://{self.base_domain}/"
+        else:
+            url = self.normalize_url(source)
+            response = None
+            if self.html_cache:
+                self.html_cache.load()
+                response = self.html_cache.get(url)
+            if response is None:
+                print(f"✗ {source} is neither an HTML file nor a page in the HTML cache")
+                return False
+            content = response.content
+        
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        print(f"Profiling {url} ({len(content) / 1024:.1f} KB) x {repeat}")
+        
+        for _ in range(max(1, repeat)):
+            self.profiler.call(url, self.extract_content, url, content)
+        
+        self.profiler.print_summary(self.profiler.write(self.output_dir))
+        return True
+    
+    def initialize_queue(self):
+        """
+        Seed the queue with the sitemap URLs at depth 0.
+        """
+        self.resolve_sitemap_source()
+        # URLs enter the queue while the sitemap is still being read
+        self.seed_queue(self.iter_sitemap(self.sitemap_path))
+    
+    def resolve_sitemap_source(self):
+        """
+        Replace the sitemap with one generated by xml-sitemaps.com when requested.
+        """
+        # Generate sitemap using xml-sitemaps.com if requested
+        if self.use_xml_sitemaps:
+            if not self.xml_sitemaps_url:
+                print("⚠ Warning: --use-xml-sitemaps enabled but no --xml-sitemaps-url provided")
+                print("  Using default sitemap instead")
+            else:
+                generated_sitemap = self.generate_sitemap_with_xml_sitemaps(self.xml_sitemaps_url)
+                if generated_sitemap:
+                    # Use the generated sitemap instead of the original
+                    self.sitemap_path = generated_sitemap
+                    print(f"✓ Using generated sitemap from xml-sitemaps.com")
+                else:
+                    print(f"⚠ Failed to generate sitemap, falling back to: {self.sitemap_path}")
+    
+    def seed_queue(self, sitemap_urls: Iterable[SitemapEntry]):
+        """
+        Add the URLs of the crawl's sitemap to the queue at depth 0.
+        
+        Args:
+            sitemap_urls: Sitemap entries from iter_sitemap or parse_sitemap
+        """
+        # Initialize queue with sitemap URLs at depth 0
+        found = 0
+        for entry in sitemap_urls:
+            found += 1
+            url = self.normalize_url(entry.url)
+            if url not in self.visited_urls and self.robots_allowed(url):
+                self.url_queue.append((url, None, 0, entry),
+                                      priority=self.url_priority(url, entry))
+        print(f"Found {found} URLs in sitemap")
+
+
+# Extractor used by each extraction process, built once by the pool initializer
+_worker_crawler: Optional[SafeDocsCrawler] = None
+
+
+def init_extract_worker(options: Dict):
+    """
+    Build the extraction process's crawler (runs once per worker process).
+    
+    Args:
+        options: Keyword arguments for SafeDocsCrawler
+    """
+    global _worker_crawler
+    _worker_crawler = SafeDocsCrawler(**options)
+
+
+def extract_page_in_worker(content: bytes, url: str, parent_url: Optional[str],
+                           depth: int, sitemap_data: Optional[Dict]) -> Tuple[Optional[Tuple[Dict, List[str]]], Dict]:
+    """
+    Parse raw HTML and extract the page in an extraction process. The markdown
+    file is written here; the page data is returned to be merged by the main process.
+    
+    Args:
+        content: Raw HTML
+        url: Page URL
+        parent_url: Parent URL that linked to this page
+        depth: Crawling depth of the page
+        sitemap_data: Optional data from sitemap
+    
+    Returns:
+        Tuple of (extraction result, histograms): the result is (page data,
+        navigation links) or None if parsing failed; the histograms hold the
+        stage timings of this page for the main process's metrics
+    """
+    extracted = _worker_crawler.extract_content(url, content, parent_url, depth, sitemap_data)
+    return extracted, _worker_crawler.metrics.take_histograms()
 
 
 def main():
@@ -1162,7 +2355,7 @@ def main():
         '--delay',
         type=float,
         default=1.0,
-        help='Delay between requests in seconds (default: 1.0)'
+        help='Delay between requests in seconds, sets the initial per-host rate (default: 1.0)'
     )
     parser.add_argument(
         '--base-domain',
@@ -1194,11 +2387,152 @@ def main():
         '--xml-sitemaps-url',
         help='Starting URL for xml-sitemaps.com crawler (e.g., https://docs.safe.global/home/what-is-safe)'
     )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=1,
+        help='Number of requests kept in flight at first (default: 1, sequential crawl unless --max-concurrency is higher)'
+    )
+    parser.add_argument(
+        '--prioritize',
+        action='store_true',
+        help='Crawl navigation links and high sitemap priority pages first within each depth'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Skip pages unchanged since the previous crawl (sitemap lastmod + ETag/Last-Modified)'
+    )
+    parser.add_argument(
+        '--checkpoint-every',
+        type=int,
+        default=100,
+        help='Checkpoint crawl state to crawl_journal.jsonl every N pages (default: 100, 0 disables)'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Resume an interrupted crawl from the last checkpoint in the output directory'
+    )
+    parser.add_argument(
+        '--stream-output',
+        action='store_true',
+        help='Stream pages and text chunks to JSONL files as they finish instead of writing crawled_data.json at the end'
+    )
+    parser.add_argument(
+        '--parser',
+        default=DEFAULT_PARSER,
+        choices=['auto'] + PARSER_BACKENDS,
+        help=f'HTML parser backend (default: {DEFAULT_PARSER}; lxml is several times faster)'
+    )
+    parser.add_argument(
+        '--extract-workers',
+        type=int,
+        default=0,
+        help='Processes parsing and extracting pages in concurrent mode (default: 0, extract on the fetching threads)'
+    )
+    parser.add_argument(
+        '--rate',
+        type=float,
+        help='Initial requests per second per host (default: concurrency / delay)'
+    )
+    parser.add_argument(
+        '--max-concurrency',
+        type=int,
+        help='Requests in flight per host the adaptive rate control may grow to (default: --concurrency)'
+    )
+    parser.add_argument(
+        '--latency-target',
+        type=float,
+        help='p95 response time in seconds above which a host is backed off (default: 3x its best median)'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        help='Store fetched HTML in a content-addressed cache in this directory'
+    )
+    parser.add_argument(
+        '--cache-max-mb',
+        type=float,
+        default=1024,
+        help='Size limit of the HTML cache in MB, least recently used pages are evicted (default: 1024, 0 = unbounded)'
+    )
+    parser.add_argument(
+        '--no-cache-compress',
+        action='store_true',
+        help='Store cached HTML uncompressed'
+    )
+    parser.add_argument(
+        '--from-cache',
+        action='store_true',
+        help='Rebuild the markdown and JSON output from --cache-dir without any network requests'
+    )
+    
+    parser.add_argument(
+        '--metrics-file',
+        help='Prometheus text file refreshed with the crawl metrics during the crawl '
+             '(e.g. for the node_exporter textfile collector)'
+    )
+    parser.add_argument(
+        '--metrics-interval',
+        type=float,
+        default=10.0,
+        help='Seconds between --metrics-file updates (default: 10)'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Profile page processing and write profile.txt, profile.pstats and '
+             'profile.collapsed (flamegraph input) to the output directory'
+    )
+    parser.add_argument(
+        '--profile-page',
+        metavar='URL_OR_FILE',
+        help='Only profile the extraction of one page, read from --cache-dir or a local HTML file'
+    )
+    parser.add_argument(
+        '--profile-repeat',
+        type=int,
+        default=20,
+        help='Times --profile-page processes the page (default: 20)'
+    )
+    parser.add_argument(
+        '--ignore-robots',
+        action='store_true',
+        help='Ignore robots.txt Disallow rules and Crawl-delay (its sitemaps are still discovered)'
+    )
+    parser.add_argument(
+        '--robots-ttl',
+        type=float,
+        default=ROBOTS_TTL,
+        help=f'Seconds a host\'s robots.txt is cached before it is fetched again (default: {ROBOTS_TTL:g})'
+    )
+    parser.add_argument(
+        '--engine',
+        default='threads',
+        choices=['threads', 'async'],
+        help='Crawl engine: requests with worker threads, or asyncio on httpx '
+             'with HTTP/2 (needs httpx[http2], see async_crawler.py) (default: threads)'
+    )
+    parser.add_argument(
+        '--no-http2',
+        action='store_true',
+        help='Use HTTP/1.1 only with --engine async'
+    )
     
     args = parser.parse_args()
+    if args.from_cache and not args.cache_dir:
+        parser.error('--from-cache requires --cache-dir')
+    
+    crawler_class = SafeDocsCrawler
+    engine_options = {}
+    if args.engine == 'async':
+        # Optional dependency, only imported when selected
+        from async_crawler import AsyncSafeDocsCrawler
+        crawler_class = AsyncSafeDocsCrawler
+        engine_options['http2'] = not args.no_http2
     
     # Create crawler and run
-    crawler = SafeDocsCrawler(
+    crawler = crawler_class(
         args.sitemap, 
         args.output,
         base_domain=args.base_domain,
@@ -1206,9 +2540,33 @@ def main():
         max_depth=args.max_depth,
         auto_discover_sitemaps=not args.no_discover_sitemaps,
         use_xml_sitemaps=args.use_xml_sitemaps,
-        xml_sitemaps_url=args.xml_sitemaps_url
+        xml_sitemaps_url=args.xml_sitemaps_url,
+        concurrency=args.concurrency,
+        requests_per_second=args.rate,
+        prioritize=args.prioritize,
+        incremental=args.incremental,
+        checkpoint_every=args.checkpoint_every,
+        stream_output=args.stream_output,
+        parser=args.parser,
+        extract_workers=args.extract_workers,
+        cache_dir=args.cache_dir,
+        cache_max_bytes=int(args.cache_max_mb * 1024 * 1024) or None,
+        cache_compress=not args.no_cache_compress,
+        from_cache=args.from_cache,
+        metrics_file=args.metrics_file,
+        metrics_interval=args.metrics_interval,
+        profile=args.profile or bool(args.profile_page),
+        respect_robots=not args.ignore_robots,
+        robots_ttl=args.robots_ttl,
+        max_concurrency=args.max_concurrency,
+        latency_target=args.latency_target,
+        **engine_options
     )
-    crawler.crawl(delay=args.delay)
+    if args.profile_page:
+        if not crawler.profile_page(args.profile_page, args.profile_repeat):
+            raise SystemExit(1)
+        return
+    crawler.crawl(delay=args.delay, resume=args.resume)
 
 
 if __name__ == '__main__':
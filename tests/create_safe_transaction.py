@@ -11,28 +11,27 @@ from dotenv import load_dotenv
 from typing import Dict, List, Optional
 import json
 
+from safe_api_client import SafeApiClient
+
 # Load environment variables
 load_dotenv()
 
 class SafeTransactionCreator:
     """Class to handle Safe wallet transaction creation"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, client: Optional[SafeApiClient] = None):
         """
         Initialize the Safe Transaction Creator
         
         Args:
             api_key: Safe API key (defaults to SAFE_API_KEY from .env)
+            client: Shared API client (created from the API key if not given)
         """
         self.api_key = api_key or os.getenv('SAFE_API_KEY')
         if not self.api_key:
             raise ValueError("SAFE_API_KEY not found in environment variables")
         
-        self.base_url = "https://api.safe.global/tx-service"
-        self.headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
+        self.client = client or SafeApiClient(self.api_key)
     
     def create_transaction(
         self,
@@ -91,19 +90,19 @@ class SafeTransactionCreator:
         }
         
         # Submit transaction to Safe Transaction Service
-        url = f"{self.base_url}/{chain}/api/v1/safes/{safe_address}/multisig-transactions/"
-        
         print(f"Creating transaction on {chain} for Safe: {safe_address}")
         print(f"Transaction details: {json.dumps(tx_data, indent=2)}")
         
-        response = requests.post(
-            url,
-            headers=self.headers,
+        response = self.client.post(
+            chain,
+            f"safes/{safe_address}/multisig-transactions/",
             json=tx_data
         )
         
         if response.status_code == 201:
             print("✅ Transaction created successfully!")
+            # The queue changed; don't serve the old Safe state from cache
+            self.client.invalidate(chain, safe_address)
             return response.json()
         else:
             print(f"❌ Error creating transaction: {response.status_code}")
@@ -121,9 +120,8 @@ class SafeTransactionCreator:
         Returns:
             Next available nonce
         """
-        url = f"{self.base_url}/{chain}/api/v1/safes/{safe_address}/"
-        
-        response = requests.get(url, headers=self.headers)
+        # Not through the cache: a stale nonce would propose an already used one
+        response = self.client.get(chain, f"safes/{safe_address}/")
         
         if response.status_code == 200:
             data = response.json()
@@ -145,16 +143,14 @@ class SafeTransactionCreator:
         Returns:
             Dict containing Safe information (owners, threshold, etc.)
         """
-        url = f"{self.base_url}/{chain}/api/v1/safes/{safe_address}/"
-        
-        response = requests.get(url, headers=self.headers)
+        response = self.client.get_cached(chain, safe_address)
         response.raise_for_status()
         
         return response.json()
     
     def get_pending_transactions(self, chain: str, safe_address: str) -> List[Dict]:
         """
-        Get pending transactions for a Safe wallet
+        Get pending transactions for a Safe wallet (all pages)
         
         Args:
             chain: Chain identifier
@@ -163,13 +159,10 @@ class SafeTransactionCreator:
         Returns:
             List of pending transactions
         """
-        url = f"{self.base_url}/{chain}/api/v1/safes/{safe_address}/multisig-transactions/"
         params = {"executed": "false"}
         
-        response = requests.get(url, headers=self.headers, params=params)
-        response.raise_for_status()
-        
-        return response.json().get('results', [])
+        return list(self.client.iter_results(chain, f"safes/{safe_address}/multisig-transactions/",
+                                             params=params))
 
 
 def main():
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Single-Pass DOM Extractor
+Indexes a parsed page in one traversal so the crawler's extraction steps
+(headings, links, code blocks, breadcrumbs, navigation links, text) become
+lookups instead of repeated find_all/select walks over the whole tree.
+"""
+
+import heapq
+from bisect import bisect_right
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from markdownify import MarkdownConverter
+
+
+# Tags whose occurrences are indexed for find/find_all
+INDEXED_TAGS = {'title', 'meta', 'a', 'div', 'pre', 'code', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+
+# Same default string types as bs4's get_text (no comments, scripts, styles...)
+MAIN_CONTENT_STRING_TYPES = Tag.MAIN_CONTENT_STRING_TYPES
+
+
+def _has_class(name: str) -> Callable:
+    return lambda tag, classes, class_attr, ancestors: name in classes
+
+
+def _attr_equals(attr: str, value: str) -> Callable:
+    return lambda tag, classes, class_attr, ancestors: tag.get(attr) == value
+
+
+# CSS selectors used by the crawler, matched while walking the tree.
+# Each predicate receives the tag, its class list, its class attribute as a
+# string and a count of open ancestors by name ('header', 'nav').
+SELECTOR_MATCHERS: Dict[str, Callable] = {
+    # Main content
+    'main': lambda tag, classes, class_attr, ancestors: tag.name == 'main',
+    'article': lambda tag, classes, class_attr, ancestors: tag.name == 'article',
+    '[role="main"]': _attr_equals('role', 'main'),
+    '.main-content': _has_class('main-content'),
+    '.content': _has_class('content'),
+    '#content': _attr_equals('id', 'content'),
+    '.documentation-content': _has_class('documentation-content'),
+    '.doc-content': _has_class('doc-content'),
+    # Navigation
+    'nav': lambda tag, classes, class_attr, ancestors: tag.name == 'nav',
+    'header nav': lambda tag, classes, class_attr, ancestors: (
+        tag.name == 'nav' and ancestors['header'] > 0),
+    '[role="navigation"]': _attr_equals('role', 'navigation'),
+    '.navigation': _has_class('navigation'),
+    '.nav': _has_class('nav'),
+    '.menu': _has_class('menu'),
+    '.sidebar': _has_class('sidebar'),
+    '.side-nav': _has_class('side-nav'),
+    '[class*="nav"]': lambda tag, classes, class_attr, ancestors: (
+        class_attr is not None and 'nav' in class_attr),
+    '[id*="nav"]': lambda tag, classes, class_attr, ancestors: (
+        isinstance(tag.get('id'), str) and 'nav' in tag.get('id')),
+    # Breadcrumbs
+    'nav[aria-label="breadcrumb"]': lambda tag, classes, class_attr, ancestors: (
+        tag.name == 'nav' and tag.get('aria-label') == 'breadcrumb'),
+    '.breadcrumb': _has_class('breadcrumb'),
+    '[class*="breadcrumb"]': lambda tag, classes, class_attr, ancestors: (
+        class_attr is not None and 'breadcrumb' in class_attr),
+    'nav ol': lambda tag, classes, class_attr, ancestors: (
+        tag.name == 'ol' and ancestors['nav'] > 0),
+}
+
+
+class DomIndex:
+    """
+    One-traversal index of a BeautifulSoup tree.
+    
+    The walk records, for every tag, its position in document order, the
+    position of its last descendant and the range of strings it contains.
+    Descendant queries then become bisections over per-tag-name lists, and
+    get_text() becomes a slice over the document's string list. Results match
+    the equivalent BeautifulSoup/soupsieve calls exactly.
+    """
+    
+    def __init__(self, root: Union[BeautifulSoup, Tag]):
+        """
+        Walk the tree once and build the index.
+        
+        Args:
+            root: BeautifulSoup document or tag to index (queries cover its descendants)
+        """
+        self.root = root
+        self.strings: List[NavigableString] = []
+        self.spans: Dict[int, List[int]] = {}
+        self.tags: Dict[str, List[Tag]] = {name: [] for name in INDEXED_TAGS}
+        self.positions: Dict[str, List[int]] = {name: [] for name in INDEXED_TAGS}
+        self.matches: Dict[str, List[Tag]] = {selector: [] for selector in SELECTOR_MATCHERS}
+        self.main_text_lengths: List[int] = [0]
+        self.walk()
+    
+    def walk(self):
+        """
+        Traverse the tree in document order, recording spans, indexed tags,
+        selector matches and strings.
+        """
+        strings = self.strings
+        spans = self.spans
+        matchers = list(SELECTOR_MATCHERS.items())
+        
+        # Descendant combinators look at ancestors above the indexed root too
+        ancestors = {'header': 0, 'nav': 0}
+        for parent in [self.root] + list(self.root.parents):
+            if parent.name in ancestors:
+                ancestors[parent.name] += 1
+        
+        position = 0
+        spans[id(self.root)] = [0, 0, 0, 0]
+        open_tags = [self.root]
+        stack = [iter(self.root.contents)]
+        while stack:
+            for child in stack[-1]:
+                if isinstance(child, Tag):
+                    position += 1
+                    spans[id(child)] = [position, position, len(strings), len(strings)]
+                    self.visit(child, position, matchers, ancestors)
+                    if child.name in ancestors:
+                        ancestors[child.name] += 1
+                    open_tags.append(child)
+                    stack.append(iter(child.contents))
+                    break
+                if isinstance(child, NavigableString):
+                    strings.append(child)
+                    length = self.main_text_lengths[-1]
+                    if type(child) in MAIN_CONTENT_STRING_TYPES:
+                        length += len(child.strip())
+                    self.main_text_lengths.append(length)
+            else:
+                tag = open_tags.pop()
+                stack.pop()
+                span = spans[id(tag)]
+                span[1] = position
+                span[3] = len(strings)
+                if tag is not self.root and tag.name in ancestors:
+                    ancestors[tag.name] -= 1
+    
+    def visit(self, tag: Tag, position: int, matchers: List, ancestors: Dict[str, int]):
+        """
+        Index a tag when it is first entered.
+        
+        Args:
+            tag: Tag being entered
+            position: Document-order position of the tag
+            matchers: (selector, predicate) pairs
+            ancestors: Count of open ancestors by name
+        """
+        if tag.name in self.tags:
+            self.tags[tag.name].append(tag)
+            self.positions[tag.name].append(position)
+        
+        classes = tag.get('class')
+        if classes is None:
+            classes, class_attr = [], None
+        elif isinstance(classes, str):
+            classes, class_attr = classes.split(), classes
+        else:
+            class_attr = ' '.join(classes)
+        
+        for selector, matches in matchers:
+            if matches(tag, classes, class_attr, ancestors):
+                self.matches[selector].append(tag)
+    
+    def scope_of(self, scope: Optional[Tag]) -> Optional[List[int]]:
+        """
+        Get the span of a scope tag (None means the indexed root).
+        """
+        return self.spans.get(id(scope if scope is not None else self.root))
+    
+    def select(self, selector: str, scope: Optional[Tag] = None) -> List[Tag]:
+        """
+        Equivalent of scope.select(selector) for the crawler's selectors.
+        
+        Args:
+            selector: CSS selector
+            scope: Tag whose descendants are searched (default: indexed root)
+        
+        Returns:
+            Matching tags in document order
+        """
+        span = self.scope_of(scope)
+        if selector not in self.matches or span is None:
+            return (scope if scope is not None else self.root).select(selector)
+        return [tag for tag in self.matches[selector]
+                if span[0] < self.spans[id(tag)][0] <= span[1]]
+    
+    def select_one(self, selector: str, scope: Optional[Tag] = None) -> Optional[Tag]:
+        """
+        Equivalent of scope.select_one(selector) for the crawler's selectors.
+        
+        Args:
+            selector: CSS selector
+            scope: Tag whose descendants are searched (default: indexed root)
+        
+        Returns:
+            First matching tag or None
+        """
+        matches = self.select(selector, scope)
+        return matches[0] if matches else None
+    
+    def find_all(self, names: Union[str, Iterable[str]], scope: Optional[Tag] = None,
+                 attrs: Optional[Dict] = None) -> List[Tag]:
+        """
+        Equivalent of scope.find_all(names, attrs=attrs) for indexed tag names.
+        
+        Args:
+            names: Tag name or list of tag names
+            scope: Tag whose descendants are searched (default: indexed root)
+            attrs: Attribute filters; True matches any present value
+        
+        Returns:
+            Matching tags in document order
+        """
+        names = [names] if isinstance(names, str) else list(names)
+        span = self.scope_of(scope)
+        if span is None or any(name not in self.tags for name in names):
+            return (scope if scope is not None else self.root).find_all(names, attrs=attrs or {})
+        
+        runs = []
+        for name in names:
+            positions = self.positions[name]
+            start = bisect_right(positions, span[0])
+            end = bisect_right(positions, span[1])
+            runs.append(zip(positions[start:end], self.tags[name][start:end]))
+        if len(runs) == 1:
+            found = [tag for _, tag in runs[0]]
+        else:
+            found = [tag for _, tag in heapq.merge(*runs, key=lambda item: item[0])]
+        
+        if attrs:
+            found = [tag for tag in found if all(
+                tag.get(key) is not None if value is True else tag.get(key) == value
+                for key, value in attrs.items())]
+        return found
+    
+    def find(self, name: str, scope: Optional[Tag] = None,
+             attrs: Optional[Dict] = None) -> Optional[Tag]:
+        """
+        Equivalent of scope.find(name, attrs=attrs) for indexed tag names.
+        
+        Returns:
+            First matching tag or None
+        """
+        found = self.find_all(name, scope, attrs)
+        return found[0] if found else None
+    
+    def text(self, element, separator: str = '', strip: bool = False) -> str:
+        """
+        Equivalent of element.get_text(separator, strip).
+        
+        Args:
+            element: Tag or string (non-indexed elements fall back to get_text)
+            separator: Separator between strings
+            strip: Whether to strip strings and skip empty ones
+        
+        Returns:
+            Text content
+        """
+        span = self.spans.get(id(element)) if isinstance(element, Tag) else None
+        if span is None:
+            return element.get_text(separator, strip)
+        
+        types = element.interesting_string_types
+        if types is None:
+            types = MAIN_CONTENT_STRING_TYPES
+        single_type = isinstance(types, type)
+        
+        parts = []
+        for string in self.strings[span[2]:span[3]]:
+            string_type = type(string)
+            if single_type:
+                if string_type is not types:
+                    continue
+            elif string_type not in types:
+                continue
+            if strip:
+                string = string.strip()
+                if not string:
+                    continue
+            parts.append(string)
+        return separator.join(parts)
+    
+    def text_length(self, element: Tag) -> int:
+        """
+        Equivalent of len(element.get_text(strip=True)), in O(1) for ordinary tags.
+        
+        Args:
+            element: Indexed tag
+        
+        Returns:
+            Length of the stripped text
+        """
+        span = self.spans.get(id(element))
+        types = element.interesting_string_types
+        if span is None or (types is not None and types != MAIN_CONTENT_STRING_TYPES):
+            return len(self.text(element, strip=True))
+        return self.main_text_lengths[span[3]] - self.main_text_lengths[span[2]]
+
+
+# Ancestors whose presence changes markdownify's output for a subtree
+MARKDOWN_CONTEXT_TAGS = ['pre', 'ul']
+
+# Tags whose own conversion looks at their parent or siblings
+MARKDOWN_SIBLING_AWARE_TAGS = {'li', 'ul', 'ol', 'table', 'thead', 'tbody', 'tr', 'td', 'th', 'img'}
+
+# Converting a tag in place relies on converter internals of markdownify 1.x
+# (process_tag with parent_tags, convert__document_); older releases
+# serialize the tag and convert the copy
+MARKDOWN_IN_PLACE = hasattr(MarkdownConverter, 'convert__document_')
+
+
+def markdown_from_soup(element: Union[BeautifulSoup, Tag], **options) -> str:
+    """
+    Convert a parsed tree to markdown without serializing and re-parsing it.
+    
+    Produces the same output as markdownify(str(element), **options) when
+    the element is converted as a standalone document.
+    
+    Args:
+        element: BeautifulSoup document or tag
+        **options: markdownify options
+    
+    Returns:
+        Markdown text
+    """
+    if isinstance(element, BeautifulSoup):
+        return MarkdownConverter(**options).convert_soup(element)
+    
+    # Bullet depth and <pre> handling look at ancestors outside the subtree,
+    # which a re-parsed copy would not have
+    if (not MARKDOWN_IN_PLACE or element.find_parent(MARKDOWN_CONTEXT_TAGS)
+            or element.name in MARKDOWN_SIBLING_AWARE_TAGS):
+        return MarkdownConverter(**options).convert(str(element))
+    
+    converter = MarkdownConverter(**options)
+    text = converter.process_tag(element, parent_tags={'[document]'})
+    return converter.convert__document_(element, text, parent_tags=set())
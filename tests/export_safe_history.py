@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Export Safe Transaction History
+
+Streams every multisig transaction of a Safe to a JSON Lines file, one
+transaction per line. Pages are written as they arrive (with the next page
+prefetched), so memory stays bounded however long the history is.
+
+Usage:
+    python export_safe_history.py --chain eth --safe 0x... [--output history.jsonl]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import requests
+from dotenv import load_dotenv
+
+from safe_api_client import get_client
+
+
+def export_transactions(chain: str, safe_address: str, output_path: str,
+                        params: dict = None) -> int:
+    """
+    Write all multisig transactions of a Safe to a JSONL file.
+    
+    Args:
+        chain: Chain identifier (e.g., 'eth', 'sep', 'matic')
+        safe_address: The Safe wallet address
+        output_path: Destination .jsonl file
+        params: Extra query parameters (filters, ordering)
+    
+    Returns:
+        Number of transactions written
+    """
+    client = get_client()
+    written = 0
+    with open(output_path, 'w', encoding='utf-8') as f:
+        pages = client.iter_pages(chain, f"safes/{safe_address}/multisig-transactions/",
+                                  params=params, prefetch=True)
+        for page in pages:
+            for tx in page.get('results', []):
+                f.write(json.dumps(tx, ensure_ascii=False) + '\n')
+                written += 1
+            print(f"   {written}/{page.get('count', '?')} transactions written", end='\r')
+    print()
+    return written
+
+
+def main():
+    """Main entry point."""
+    load_dotenv()
+    
+    parser = argparse.ArgumentParser(
+        description="Export a Safe's complete multisig transaction history to JSON Lines"
+    )
+    parser.add_argument(
+        '--chain',
+        default='eth',
+        help='Chain identifier (default: eth)'
+    )
+    parser.add_argument(
+        '--safe',
+        default=os.getenv('AMATSU_SAFE_WALLET_ADDRESS'),
+        help='Safe address (default: AMATSU_SAFE_WALLET_ADDRESS from .env)'
+    )
+    parser.add_argument(
+        '--output',
+        help='Output file (default: safe_history_<safe>_<chain>.jsonl)'
+    )
+    parser.add_argument(
+        '--executed',
+        choices=['true', 'false'],
+        help='Only export executed (true) or pending (false) transactions'
+    )
+    parser.add_argument(
+        '--ordering',
+        default='nonce',
+        help='API ordering field (default: nonce, oldest first)'
+    )
+    
+    args = parser.parse_args()
+    if not args.safe:
+        parser.error('--safe is required (or set AMATSU_SAFE_WALLET_ADDRESS)')
+    
+    output = args.output or f"safe_history_{args.safe[:8]}_{args.chain}.jsonl"
+    params = {'ordering': args.ordering}
+    if args.executed:
+        params['executed'] = args.executed
+    
+    print(f"📥 Exporting transactions of {args.safe} on {args.chain} to {output}")
+    start = time.time()
+    try:
+        count = export_transactions(args.chain, args.safe, output, params)
+    except requests.exceptions.RequestException as e:
+        print(f"\n❌ Export failed: {e}")
+        sys.exit(1)
+    
+    print(f"✅ Exported {count} transactions in {time.time() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
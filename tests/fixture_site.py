@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Fixture Documentation Site
+
+Serves a synthetic copy of the Safe documentation locally so the crawlers
+can be benchmarked without touching docs.safe.global. Page paths start from
+data/safe-sitemap.xml and are extended with generated pages up to the
+requested size; every page has the shapes the extractors look for (sidebar
+and header navigation, breadcrumbs, a main article with sections, code
+blocks, tables and internal/external links). The site also serves
+/sitemap.xml and /robots.txt, answers conditional requests (ETag) and can
+add latency to every response.
+
+Usage:
+    python fixture_site.py --pages 10000 --latency 0.02 --port 8765 --write-sitemap bench-sitemap.xml
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter
+from functools import lru_cache
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+
+DEFAULT_SITEMAP = Path(__file__).resolve().parent.parent / 'data' / 'safe-sitemap.xml'
+SITEMAP_NAMESPACE = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+CODE_SAMPLES = {
+    'typescript': "import Safe from '@safe-global/protocol-kit'\n\n"
+                  "const protocolKit = await Safe.init({{ provider, signer, safeAddress }})\n"
+                  "const safeTransaction = await protocolKit.createTransaction({{ transactions: [tx{n}] }})",
+    'bash': "pnpm add @safe-global/api-kit@{n} @safe-global/protocol-kit",
+    'solidity': "function execTransaction{n}(address to, uint256 value, bytes calldata data)\n"
+                "    external payable returns (bool success);",
+    'json': '{{\n  "safe": "0x{n:040x}",\n  "nonce": {n},\n  "threshold": 2\n}}',
+}
+
+WORDS = ('safe account owner threshold module guard transaction signature relay '
+         'protocol kit api service delegate nonce execution confirmation wallet '
+         'smart contract deployment network chain token balance gas policy').split()
+
+
+def load_sitemap_paths(sitemap_path: Path) -> List[Dict[str, str]]:
+    """
+    Read page paths, lastmod and priority from a sitemap file.
+    
+    Args:
+        sitemap_path: Local sitemap XML
+    
+    Returns:
+        List of {'path', 'lastmod', 'priority'} dictionaries
+    """
+    namespace = {'ns': SITEMAP_NAMESPACE}
+    entries = []
+    for url_elem in ET.parse(sitemap_path).getroot().findall('ns:url', namespace):
+        loc = url_elem.find('ns:loc', namespace)
+        if loc is None or not loc.text:
+            continue
+        lastmod = url_elem.find('ns:lastmod', namespace)
+        priority = url_elem.find('ns:priority', namespace)
+        entries.append({
+            'path': urlparse(loc.text).path or '/',
+            'lastmod': lastmod.text if lastmod is not None else '',
+            'priority': priority.text if priority is not None else '',
+        })
+    return entries
+
+
+class FixtureSite:
+    """
+    Deterministic synthetic documentation site of a given size.
+    
+    Pages are rendered on demand from their index (and memoized), so a
+    10k-page site costs no memory until it is crawled.
+    """
+    
+    def __init__(self, pages: int = 1000, latency: float = 0.0, jitter: float = 0.0,
+                 sitemap_path: Path = DEFAULT_SITEMAP, padding_kb: int = 0, seed: int = 0):
+        """
+        Initialize the site.
+        
+        Args:
+            pages: Number of pages (at least the pages of the source sitemap
+                are kept, up to this number)
+            latency: Seconds added to every response
+            jitter: Extra random latency, uniform in [0, jitter] seconds
+            sitemap_path: Sitemap the page paths start from
+            padding_kb: Size of an inline script payload added to every page,
+                like the framework data real documentation pages carry
+            seed: Seed of the generated content
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.padding = 'x' * (padding_kb * 1024)
+        self.seed = seed
+        self.entries = load_sitemap_paths(sitemap_path)[:pages] if sitemap_path.exists() else []
+        sections = sorted({entry['path'].strip('/').split('/')[0] for entry in self.entries}) or ['docs']
+        for index in range(len(self.entries), pages):
+            section = sections[index % len(sections)]
+            self.entries.append({
+                'path': f"/{section}/generated/page-{index}",
+                'lastmod': '2025-10-03T15:39:09+00:00',
+                'priority': '0.64',
+            })
+        self.index = {entry['path']: number for number, entry in enumerate(self.entries)}
+        # First page of each top-level section, linked from the header navigation
+        self.sections: Dict[str, str] = {}
+        for entry in self.entries:
+            self.sections.setdefault(entry['path'].strip('/').split('/')[0], entry['path'])
+        self.requests: Counter = Counter()
+        self._lock = threading.Lock()
+        self.render = lru_cache(maxsize=4096)(self.render)
+    
+    def sitemap_xml(self, origin: str) -> bytes:
+        """Sitemap of every page, with absolute URLs on the given origin."""
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+                 f'<urlset xmlns="{SITEMAP_NAMESPACE}">']
+        for entry in self.entries:
+            lines.append(f"<url><loc>{origin}{entry['path']}</loc><lastmod>{entry['lastmod']}</lastmod>"
+                         f"<priority>{entry['priority']}</priority></url>")
+        lines.append('</urlset>')
+        return '\n'.join(lines).encode()
+    
+    def write_sitemap(self, path: str, origin: str):
+        """Write the sitemap to a local file, for a crawler's --sitemap."""
+        Path(path).write_bytes(self.sitemap_xml(origin))
+    
+    def render(self, number: int) -> bytes:
+        """
+        Render a page.
+        
+        Args:
+            number: Page index
+        
+        Returns:
+            HTML document
+        """
+        rng = random.Random(f"{self.seed}:{number}")
+        path = self.entries[number]['path']
+        parts = path.strip('/').split('/')
+        title = ' '.join(parts[-1].replace('-', ' ').split()).title() or 'Home'
+        
+        def sentence() -> str:
+            words = rng.choices(WORDS, k=rng.randint(8, 18))
+            return ' '.join(words).capitalize() + '.'
+        
+        def page_link(target: int) -> str:
+            target_path = self.entries[target % len(self.entries)]['path']
+            return f'<a href="{target_path}">{escape(target_path.rsplit("/", 1)[-1])}</a>'
+        
+        top_nav = ''.join(f'<li><a href="{path}">{escape(section)}</a></li>'
+                          for section, path in self.sections.items())
+        sidebar = ''.join(f'<li>{page_link(number + offset)}</li>' for offset in range(-10, 11) if offset)
+        # Intermediate path segments are not pages, so only the ends are links
+        breadcrumbs = '<a href="/">Home</a>' + ''.join(
+            f'<span>{escape(part)}</span>' for part in parts[:-1]) + f'<a href="{path}">{escape(title)}</a>'
+        
+        body = [f'<h1 id="{escape(parts[-1])}">{escape(title)}</h1>', f'<p>{sentence()} {sentence()}</p>']
+        for section in range(rng.randint(3, 6)):
+            body.append(f'<h2 id="section-{section}">{escape(" ".join(rng.choices(WORDS, k=3)).title())}</h2>')
+            for _ in range(rng.randint(1, 3)):
+                body.append(f'<p>{sentence()} {sentence()} Read more in {page_link(rng.randrange(len(self.entries)))} '
+                            f'or on <a href="https://github.com/safe-global/safe-{rng.choice(WORDS)}">GitHub</a>.</p>')
+            if rng.random() < 0.7:
+                language, code = rng.choice(sorted(CODE_SAMPLES.items()))
+                body.append(f'<pre class="language-{language}"><code class="language-{language}">'
+                            f'{escape(code.format(n=number))}</code></pre>')
+            if rng.random() < 0.3:
+                rows = ''.join(f'<tr><td><code>{rng.choice(WORDS)}</code></td><td>{sentence()}</td></tr>'
+                               for _ in range(rng.randint(2, 6)))
+                body.append(f'<table><thead><tr><th>Name</th><th>Description</th></tr></thead>'
+                            f'<tbody>{rows}</tbody></table>')
+            if rng.random() < 0.3:
+                body.append(f'<h3 id="section-{section}-notes">Notes</h3><ul>'
+                            + ''.join(f'<li>{sentence()}</li>' for _ in range(3)) + '</ul>')
+        
+        description = sentence()
+        html = f'''<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{escape(title)} – Safe Docs</title>
+<meta name="description" content="{escape(description)}">
+<meta property="og:title" content="{escape(title)}"><meta property="og:description" content="{escape(description)}">
+<link rel="stylesheet" href="/_next/static/css/app.css"><script src="/_next/static/chunks/main.js" defer></script>
+</head><body>
+<header class="nextra-nav-container"><nav class="nextra-nav"><a href="/">Safe Docs</a><ul>{top_nav}</ul></nav></header>
+<div class="layout"><aside class="nextra-sidebar-container"><nav class="sidebar"><ul>{sidebar}</ul></nav></aside>
+<main class="nextra-content"><nav aria-label="breadcrumb" class="breadcrumb">{breadcrumbs}</nav>
+<article class="nextra-body">{''.join(body)}</article>
+<div class="nextra-pagination">{page_link(number - 1)} {page_link(number + 1)}</div></main></div>
+<footer><p>© Safe Ecosystem Foundation</p><a href="https://safe.global/terms">Terms</a></footer>
+<script>self.__next_f=self.__next_f||[];self.__next_f.push([1,"{number}{self.padding}"])</script>
+</body></html>'''
+        return html.encode()
+    
+    def respond(self, path: str, origin: str, etag_match: Optional[str]) -> tuple:
+        """
+        Serve one path.
+        
+        Returns:
+            (status, body, headers)
+        """
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+        
+        if path == '/robots.txt':
+            kind, body = 'robots', f"User-agent: *\nAllow: /\n\nSitemap: {origin}/sitemap.xml\n".encode()
+            headers = {'Content-Type': 'text/plain'}
+        elif path == '/sitemap.xml':
+            kind, body, headers = 'sitemap', self.sitemap_xml(origin), {'Content-Type': 'application/xml'}
+        elif path == '/__stats__':
+            with self._lock:
+                body = json.dumps(dict(self.requests)).encode()
+            return 200, body, {'Content-Type': 'application/json'}
+        elif path.rstrip('/') in self.index or (path == '/' and self.entries):
+            number = self.index.get(path.rstrip('/'), 0)
+            etag = f'"page-{self.seed}-{number}"'
+            if etag_match == etag:
+                with self._lock:
+                    self.requests['not_modified'] += 1
+                return 304, b'', {'ETag': etag}
+            kind, body = 'page', self.render(number)
+            headers = {'Content-Type': 'text/html; charset=utf-8', 'ETag': etag,
+                       'Last-Modified': 'Fri, 03 Oct 2025 15:39:09 GMT'}
+        else:
+            kind, body, headers = 'not_found', b'<html><body><h1>404</h1></body></html>', {'Content-Type': 'text/html'}
+            with self._lock:
+                self.requests[kind] += 1
+            return 404, body, headers
+        
+        with self._lock:
+            self.requests[kind] += 1
+        return 200, body, headers
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    """Serves a FixtureSite over HTTP/1.1 keep-alive."""
+    
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    site: FixtureSite = None
+    
+    def respond(self, include_body: bool):
+        origin = f"http://{self.headers.get('Host', '127.0.0.1')}"
+        status, body, headers = self.site.respond(urlparse(self.path).path, origin,
+                                                  self.headers.get('If-None-Match'))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+    
+    def do_GET(self):
+        self.respond(include_body=True)
+    
+    def do_HEAD(self):
+        self.respond(include_body=False)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def start_site(site: FixtureSite, host: str = '127.0.0.1', port: int = 0) -> ThreadingHTTPServer:
+    """
+    Serve a FixtureSite on a background thread.
+    
+    Args:
+        site: Site to serve
+        host: Interface to bind
+        port: Port to bind (0 picks a free one)
+    
+    Returns:
+        Running server (server.server_address has the bound port)
+    """
+    handler = type('BoundFixtureRequestHandler', (FixtureRequestHandler,), {'site': site})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Serve a synthetic documentation site for crawler benchmarks'
+    )
+    parser.add_argument(
+        '--host',
+        default='127.0.0.1',
+        help='Interface to bind (default: 127.0.0.1)'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8765,
+        help='Port to listen on (default: 8765)'
+    )
+    parser.add_argument(
+        '--pages',
+        type=int,
+        default=1000,
+        help='Number of pages (default: 1000)'
+    )
+    parser.add_argument(
+        '--latency',
+        type=float,
+        default=0.0,
+        help='Seconds added to every response (default: 0)'
+    )
+    parser.add_argument(
+        '--jitter',
+        type=float,
+        default=0.0,
+        help='Extra random latency of up to this many seconds (default: 0)'
+    )
+    parser.add_argument(
+        '--sitemap',
+        default=str(DEFAULT_SITEMAP),
+        help='Sitemap the page paths start from (default: data/safe-sitemap.xml)'
+    )
+    parser.add_argument(
+        '--padding-kb',
+        type=int,
+        default=0,
+        help='Inline script payload added to every page, in KB (default: 0)'
+    )
+    parser.add_argument(
+        '--write-sitemap',
+        help='Also write the fixture sitemap to this file (for a crawler --sitemap)'
+    )
+    
+    args = parser.parse_args()
+    
+    site = FixtureSite(pages=args.pages, latency=args.latency, jitter=args.jitter,
+                       sitemap_path=Path(args.sitemap), padding_kb=args.padding_kb)
+    server = start_site(site, args.host, args.port)
+    origin = f"http://{args.host}:{server.server_address[1]}"
+    if args.write_sitemap:
+        site.write_sitemap(args.write_sitemap, origin)
+        print(f"✅ Sitemap written to: {args.write_sitemap}")
+    print(f"🧪 Fixture site with {len(site.entries)} pages on {origin}")
+    
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"\n📊 {dict(site.requests)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -13,11 +13,15 @@ Or import and use programmatically:
 
 import os
 import sys
+import asyncio
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from typing import Optional, Dict, List
+from typing import Optional, Dict, Iterable, List, Tuple
 import json
 
+from safe_api_client import get_client
+
 # Fix encoding issues on Windows
 if sys.platform == 'win32':
     try:
@@ -30,14 +34,8 @@ if sys.platform == 'win32':
 load_dotenv()
 SAFE_API_KEY = os.getenv('SAFE_API_KEY')
 
-# Safe Transaction Service Base URL
-BASE_URL = "https://api.safe.global/tx-service"
-
-# Request headers with API authentication
-HEADERS = {
-    "Authorization": f"Bearer {SAFE_API_KEY}",
-    "Content-Type": "application/json"
-}
+# Pooled, rate-limited Safe Transaction Service client
+CLIENT = get_client()
 
 # Chain name mappings for Safe UI URLs
 CHAIN_MAPPINGS = {
@@ -126,10 +124,8 @@ def get_transaction_details(
     Returns:
         Transaction details dictionary or None if not found
     """
-    url = f"{BASE_URL}/{chain}/api/v1/multisig-transactions/{safe_tx_hash}/"
-    
     try:
-        response = requests.get(url, headers=HEADERS)
+        response = CLIENT.get(chain, f"multisig-transactions/{safe_tx_hash}/")
         
         if response.status_code == 200:
             return response.json()
@@ -144,6 +140,85 @@ def get_transaction_details(
         return None
 
 
+def fetch_transaction(chain: str, safe_tx_hash: str) -> Dict:
+    """
+    Fetch one transaction, raising instead of printing on failure.
+    
+    Args:
+        chain: Chain identifier
+        safe_tx_hash: The Safe transaction hash
+    
+    Returns:
+        Transaction details dictionary
+    
+    Raises:
+        LookupError: If the transaction does not exist
+        requests.exceptions.RequestException: If the request fails
+    """
+    response = CLIENT.get(chain, f"multisig-transactions/{safe_tx_hash}/")
+    if response.status_code == 404:
+        raise LookupError(f"Transaction not found: {safe_tx_hash}")
+    response.raise_for_status()
+    return response.json()
+
+
+async def fetch_transactions_batch(
+    items: Iterable[Tuple[str, str]],
+    concurrency: int = 8
+) -> List[Dict]:
+    """
+    Fetch many transactions concurrently.
+    
+    Requests run on a thread pool through the shared client, so they reuse
+    its pooled connections and respect its rate limiter; at most
+    `concurrency` are in flight at once.
+    
+    Args:
+        items: (chain, safe_tx_hash) pairs
+        concurrency: Maximum number of requests in flight
+    
+    Returns:
+        One dictionary per input pair, in input order, with 'chain',
+        'safe_tx_hash', 'transaction' (None on failure) and 'error'
+        (None on success)
+    """
+    items = list(items)
+    concurrency = max(1, concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        async def fetch_one(chain: str, safe_tx_hash: str) -> Dict:
+            result = {"chain": chain, "safe_tx_hash": safe_tx_hash,
+                      "transaction": None, "error": None}
+            async with semaphore:
+                try:
+                    result["transaction"] = await loop.run_in_executor(
+                        executor, fetch_transaction, chain, safe_tx_hash)
+                except (LookupError, ValueError, requests.exceptions.RequestException) as e:
+                    result["error"] = str(e)
+            return result
+        
+        return await asyncio.gather(*(fetch_one(chain, h) for chain, h in items))
+
+
+def get_transaction_details_batch(
+    items: Iterable[Tuple[str, str]],
+    concurrency: int = 8
+) -> List[Dict]:
+    """
+    Blocking wrapper around fetch_transactions_batch for non-async callers.
+    
+    Args:
+        items: (chain, safe_tx_hash) pairs
+        concurrency: Maximum number of requests in flight
+    
+    Returns:
+        Results in input order (see fetch_transactions_batch)
+    """
+    return asyncio.run(fetch_transactions_batch(items, concurrency))
+
+
 def generate_link_from_transaction_data(tx_data: Dict, chain: str) -> Dict[str, str]:
     """
     Generate all relevant links from transaction data.
@@ -185,15 +260,11 @@ def get_all_pending_transaction_links(
     Returns:
         List of dictionaries with transaction info and links
     """
-    url = f"{BASE_URL}/{chain}/api/v1/safes/{safe_address}/multisig-transactions/"
     params = {"executed": "false", "ordering": "-nonce"}
     
     try:
-        response = requests.get(url, headers=HEADERS, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        results = data.get('results', [])
+        results = CLIENT.iter_results(chain, f"safes/{safe_address}/multisig-transactions/",
+                                      params=params, prefetch=True)
         
         transaction_links = []
         for tx in results:
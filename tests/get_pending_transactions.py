@@ -14,9 +14,12 @@ import sys
 import requests
 from dotenv import load_dotenv
 import json
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
+from safe_api_client import get_client
+
 # Fix encoding issues on Windows
 if sys.platform == 'win32':
     try:
@@ -33,17 +36,8 @@ AMATSU_SAFE_ADDRESS = os.getenv('AMATSU_SAFE_WALLET_ADDRESS')
 if not SAFE_API_KEY:
     raise ValueError("❌ SAFE_API_KEY not found in .env file")
 
-if not AMATSU_SAFE_ADDRESS:
-    raise ValueError("❌ AMATSU_SAFE_WALLET_ADDRESS not found in .env file")
-
-# Safe Transaction Service Base URL
-BASE_URL = "https://api.safe.global/tx-service"
-
-# Request headers with API authentication
-HEADERS = {
-    "Authorization": f"Bearer {SAFE_API_KEY}",
-    "Content-Type": "application/json"
-}
+# Pooled, rate-limited Safe Transaction Service client
+CLIENT = get_client()
 
 # Supported chains - modify this based on where your Safe is deployed
 SUPPORTED_CHAINS = {
@@ -70,10 +64,8 @@ def check_safe_exists(chain: str, safe_address: str) -> Optional[Dict]:
     Returns:
         Dict with Safe info if found, None otherwise
     """
-    url = f"{BASE_URL}/{chain}/api/v1/safes/{safe_address}/"
-    
     try:
-        response = requests.get(url, headers=HEADERS)
+        response = CLIENT.get_cached(chain, safe_address)
         
         if response.status_code == 200:
             return response.json()
@@ -89,7 +81,8 @@ def check_safe_exists(chain: str, safe_address: str) -> Optional[Dict]:
 
 def get_pending_transactions(chain: str, safe_address: str, limit: Optional[int] = None) -> List[Dict]:
     """
-    Get all pending (unexecuted) transactions for a Safe wallet.
+    Get all pending (unexecuted) transactions for a Safe wallet, following
+    pagination across the whole queue.
     
     Args:
         chain: Chain identifier (e.g., 'eth', 'sep', 'matic')
@@ -99,29 +92,59 @@ def get_pending_transactions(chain: str, safe_address: str, limit: Optional[int]
     Returns:
         List of pending transaction dictionaries
     """
-    url = f"{BASE_URL}/{chain}/api/v1/safes/{safe_address}/multisig-transactions/"
-    
     # Filter for only unexecuted (pending) transactions
     params = {
         "executed": "false",
         "ordering": "-nonce"  # Most recent first
     }
     
-    if limit:
-        params["limit"] = limit
-    
     try:
-        response = requests.get(url, headers=HEADERS, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        return data.get('results', [])
+        return list(CLIENT.iter_results(chain, f"safes/{safe_address}/multisig-transactions/",
+                                        params=params, max_items=limit or None))
         
     except requests.exceptions.RequestException as e:
         print(f"❌ Error fetching pending transactions: {e}")
         return []
 
 
+def transaction_fields(tx: Dict) -> Dict:
+    """
+    Extract the displayed fields of a transaction as plain values, shared by
+    format_transaction_details and the JSON/CSV reports.
+    
+    Args:
+        tx: Transaction dictionary
+    
+    Returns:
+        Dictionary of transaction fields
+    """
+    value_wei = int(tx.get('value') or 0)
+    confirmations = tx.get('confirmations') or []
+    confirmations_required = tx.get('confirmationsRequired') or 0
+    data = tx.get('data')
+    operation = tx.get('operation', 0)
+    
+    return {
+        'safe_tx_hash': tx.get('safeTxHash'),
+        'to': tx.get('to'),
+        'value_wei': str(value_wei),
+        'value_eth': value_wei / 1e18,
+        'nonce': tx.get('nonce'),
+        'gas_price': tx.get('gasPrice'),
+        'confirmations': len(confirmations),
+        'confirmations_required': confirmations_required,
+        'missing_signatures': confirmations_required - len(confirmations),
+        'confirmed_by': [conf.get('owner', 'Unknown') for conf in confirmations],
+        'is_executed': bool(tx.get('isExecuted')),
+        'is_successful': tx.get('isSuccessful'),
+        'has_data': bool(data and data != '0x'),
+        'operation': {0: 'Call', 1: 'DelegateCall', 2: 'Create'}.get(operation, 'Unknown'),
+        'submission_date': tx.get('submissionDate'),
+        'modified': tx.get('modified'),
+        'transaction_hash': tx.get('transactionHash'),
+    }
+
+
 def format_transaction_details(tx: Dict) -> str:
     """
     Format transaction details for display.
@@ -132,72 +155,65 @@ def format_transaction_details(tx: Dict) -> str:
     Returns:
         Formatted string with transaction details
     """
+    fields = transaction_fields(tx)
     lines = []
     
     # Basic transaction info
-    lines.append(f"  📄 Safe Tx Hash: {tx.get('safeTxHash', 'N/A')}")
-    lines.append(f"  📍 To: {tx.get('to', 'N/A')}")
+    lines.append(f"  📄 Safe Tx Hash: {value_or_na(fields['safe_tx_hash'])}")
+    lines.append(f"  📍 To: {value_or_na(fields['to'])}")
     
-    # Value (convert from wei to ETH)
-    value_wei = int(tx.get('value', 0))
-    value_eth = value_wei / 1e18
-    lines.append(f"  💰 Value: {value_eth} ETH ({value_wei} wei)")
+    # Value (converted from wei to ETH)
+    lines.append(f"  💰 Value: {fields['value_eth']} ETH ({fields['value_wei']} wei)")
     
     # Transaction metadata
-    lines.append(f"  🔢 Nonce: {tx.get('nonce', 'N/A')}")
-    lines.append(f"  ⛽ Gas Price: {tx.get('gasPrice', 'N/A')}")
+    lines.append(f"  🔢 Nonce: {value_or_na(fields['nonce'])}")
+    lines.append(f"  ⛽ Gas Price: {value_or_na(fields['gas_price'])}")
     
     # Confirmation status
-    confirmations = tx.get('confirmations', [])
-    confirmations_required = tx.get('confirmationsRequired', 0)
-    confirmations_count = len(confirmations)
-    missing = confirmations_required - confirmations_count
-    
-    lines.append(f"  ✅ Confirmations: {confirmations_count}/{confirmations_required}")
-    lines.append(f"  ⏳ Missing: {missing} signature(s)")
+    lines.append(f"  ✅ Confirmations: {fields['confirmations']}/{fields['confirmations_required']}")
+    lines.append(f"  ⏳ Missing: {fields['missing_signatures']} signature(s)")
     
     # Owners who have confirmed
-    if confirmations:
+    if fields['confirmations']:
         lines.append(f"  👥 Confirmed by:")
-        for conf in confirmations:
+        for conf in tx.get('confirmations') or []:
             owner = conf.get('owner', 'Unknown')
             signature_type = conf.get('signatureType', 'Unknown')
             lines.append(f"     • {owner} ({signature_type})")
     
     # Execution info
-    lines.append(f"  🚀 Is Executed: {'✅ Yes' if tx.get('isExecuted') else '❌ No'}")
-    lines.append(f"  ✔️ Is Successful: {tx.get('isSuccessful', 'N/A')}")
+    lines.append(f"  🚀 Is Executed: {'✅ Yes' if fields['is_executed'] else '❌ No'}")
+    lines.append(f"  ✔️ Is Successful: {fields['is_successful']}")
     
     # Data
-    data = tx.get('data', None)
-    if data and data != '0x':
+    if fields['has_data']:
+        data = tx['data']
         lines.append(f"  📦 Has Data: Yes ({len(data)} chars)")
         lines.append(f"     Preview: {data[:66]}...")
     else:
         lines.append(f"  📦 Has Data: No (simple transfer)")
     
     # Operation type
-    operation = tx.get('operation', 0)
-    operation_type = {0: 'Call', 1: 'DelegateCall', 2: 'Create'}.get(operation, 'Unknown')
-    lines.append(f"  🔧 Operation: {operation_type}")
+    lines.append(f"  🔧 Operation: {fields['operation']}")
     
     # Timestamps
-    submission_date = tx.get('submissionDate')
-    if submission_date:
-        lines.append(f"  📅 Submitted: {submission_date}")
-    
-    modified_date = tx.get('modified')
-    if modified_date:
-        lines.append(f"  🔄 Modified: {modified_date}")
+    if fields['submission_date']:
+        lines.append(f"  📅 Submitted: {fields['submission_date']}")
+    if fields['modified']:
+        lines.append(f"  🔄 Modified: {fields['modified']}")
     
     # Transaction hash (if executed)
-    tx_hash = tx.get('transactionHash')
-    if tx_hash:
-        lines.append(f"  🔗 Tx Hash: {tx_hash}")
+    if fields['transaction_hash']:
+        lines.append(f"  🔗 Tx Hash: {fields['transaction_hash']}")
     
     return "\n".join(lines)
 
 
+def value_or_na(value) -> str:
+    """Display value of an optional field."""
+    return 'N/A' if value is None else str(value)
+
+
 def display_pending_transactions(chain: str, transactions: List[Dict], safe_info: Optional[Dict] = None):
     """
     Display pending transactions in a formatted way.
@@ -237,29 +253,47 @@ def display_pending_transactions(chain: str, transactions: List[Dict], safe_info
     print("\n" + "="*70)
 
 
-def find_safe_on_chains(safe_address: str, chains_to_check: List[str]) -> Optional[str]:
+def find_safe_on_chains(safe_address: str, chains_to_check: List[str]) -> Optional[Tuple[str, Dict]]:
     """
     Try to find which chain the Safe is deployed on.
     
+    All chains are queried in parallel. If the Safe exists on several chains,
+    the first one in chains_to_check wins; the search stops as soon as that
+    is known and checks that have not started yet are cancelled.
+    
     Args:
         safe_address: The Safe wallet address
-        chains_to_check: List of chain identifiers to check
+        chains_to_check: List of chain identifiers to check, in order of preference
         
     Returns:
-        Chain identifier if found, None otherwise
+        Tuple of (chain identifier, Safe info) if found, None otherwise
     """
     print(f"\n🔍 Searching for Safe on {len(chains_to_check)} chains...")
+    if not chains_to_check:
+        return None
     
-    for chain in chains_to_check:
-        chain_name = SUPPORTED_CHAINS.get(chain, chain.upper())
-        print(f"   Checking {chain_name}...", end=" ")
-        
-        safe_info = check_safe_exists(chain, safe_address)
-        if safe_info:
-            print("✅ Found!")
-            return chain
-        else:
-            print("❌ Not found")
+    results: Dict[str, Optional[Dict]] = {}
+    executor = ThreadPoolExecutor(max_workers=len(chains_to_check))
+    try:
+        futures = {
+            executor.submit(check_safe_exists, chain, safe_address): chain
+            for chain in chains_to_check
+        }
+        for future in as_completed(futures):
+            chain = futures[future]
+            results[chain] = future.result()
+            chain_name = SUPPORTED_CHAINS.get(chain, chain.upper())
+            print(f"   {chain_name}: {'✅ Found!' if results[chain] else '❌ Not found'}")
+            
+            # Done once every chain ahead of the first hit has answered
+            for candidate in chains_to_check:
+                if candidate not in results:
+                    break
+                if results[candidate]:
+                    return candidate, results[candidate]
+    finally:
+        # Don't wait for slower chains once the answer is known
+        executor.shutdown(wait=False, cancel_futures=True)
     
     return None
 
@@ -267,6 +301,9 @@ def find_safe_on_chains(safe_address: str, chains_to_check: List[str]) -> Option
 def main():
     """Main function to get and display pending transactions"""
     
+    if not AMATSU_SAFE_ADDRESS:
+        raise ValueError("❌ AMATSU_SAFE_WALLET_ADDRESS not found in .env file")
+    
     print("\n" + "🔐 AMATSU SAFE - PENDING TRANSACTIONS CHECKER".center(70, "="))
     print()
     
@@ -287,18 +324,20 @@ def main():
         # Auto-detect which chain the Safe is on
         print("🔍 Auto-detecting Safe deployment...")
         
-        # Check common chains first
+        # Probe every supported chain at once, preferring the common ones
         priority_chains = ['eth', 'sep', 'base', 'matic', 'arb1', 'oeth']
+        chains_to_check = priority_chains + [chain for chain in SUPPORTED_CHAINS
+                                             if chain not in priority_chains]
         
-        chain = find_safe_on_chains(AMATSU_SAFE_ADDRESS, priority_chains)
+        found = find_safe_on_chains(AMATSU_SAFE_ADDRESS, chains_to_check)
         
-        if not chain:
+        if not found:
             print("\n❌ Safe not found on any of the checked chains!")
             print("\n💡 To manually specify a chain, edit the TARGET_CHAIN variable in the script.")
             print(f"   Available chains: {', '.join(SUPPORTED_CHAINS.keys())}")
             return
         
-        safe_info = check_safe_exists(chain, AMATSU_SAFE_ADDRESS)
+        chain, safe_info = found
     
     # Get pending transactions
     print(f"\n📥 Fetching pending transactions from {SUPPORTED_CHAINS.get(chain, chain.upper())}...")
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+HTML Cache
+Content-addressed on-disk cache of fetched documents. Bodies are stored once
+per SHA-256 hash (optionally gzip-compressed) and an index maps normalized
+URLs to hashes and response headers, so extraction can be re-run offline
+from the cache instead of re-crawling.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urldefrag, urlparse, urlunparse
+
+from requests.structures import CaseInsensitiveDict
+
+
+INDEX_FILENAME = 'index.json'
+OBJECTS_DIRNAME = 'objects'
+CACHE_VERSION = 1
+
+# Response headers kept with each cached document
+CACHED_HEADERS = ['Content-Type', 'ETag', 'Last-Modified']
+
+
+def cache_key(url: str) -> str:
+    """
+    Normalize a URL into a cache key.
+    
+    Args:
+        url: Document URL
+    
+    Returns:
+        URL without fragment or trailing slash, with lowercase scheme and host
+    """
+    url, _ = urldefrag(url)
+    parsed = urlparse(url)
+    return urlunparse(parsed._replace(scheme=parsed.scheme.lower(),
+                                      netloc=parsed.netloc.lower())).rstrip('/')
+
+
+class CachedResponse:
+    """
+    Minimal stand-in for requests.Response built from a cache entry.
+    """
+    
+    def __init__(self, url: str, content: bytes, headers: Dict[str, str]):
+        self.url = url
+        self.status_code = 200
+        self.content = content
+        self.headers = CaseInsensitiveDict(headers)
+        self.encoding = None
+    
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+    
+    def raise_for_status(self):
+        pass
+
+
+class HtmlCache:
+    """
+    Size-bounded, content-addressed document cache.
+    
+    Layout of the cache directory:
+    
+    - objects/ab/abcdef....html[.gz]: document bodies named by SHA-256
+    - index.json: normalized URL -> hash, stored size, headers and fetch time,
+      in least-recently-used order
+    
+    Identical bodies served under several URLs are stored once. When the
+    stored size exceeds max_bytes, the least recently used URLs are dropped
+    along with any object no other URL refers to.
+    """
+    
+    def __init__(self, cache_dir: Path, max_bytes: Optional[int] = None,
+                 compress: bool = True):
+        """
+        Initialize the cache.
+        
+        Args:
+            cache_dir: Directory holding the index and objects
+            max_bytes: Maximum stored size of all objects (None = unbounded)
+            compress: Whether new objects are gzip-compressed
+        """
+        self.cache_dir = Path(cache_dir)
+        self.index_path = self.cache_dir / INDEX_FILENAME
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.entries: 'OrderedDict[str, Dict]' = OrderedDict()
+        self.object_refs: Dict[str, int] = {}
+        self.stored_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+    
+    def __contains__(self, url: str) -> bool:
+        return cache_key(url) in self.entries
+    
+    def load(self) -> int:
+        """
+        Load the index. Entries whose object file is missing are dropped.
+        
+        Returns:
+            Number of cached URLs
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if not self.index_path.exists():
+            return 0
+        
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"  ⚠ Ignoring unreadable HTML cache index {self.index_path}: {e}")
+            return 0
+        
+        if data.get('version') != CACHE_VERSION:
+            print(f"  ⚠ Ignoring HTML cache index with unsupported version: {data.get('version')}")
+            return 0
+        
+        with self._lock:
+            self.entries = OrderedDict()
+            self.object_refs = {}
+            self.stored_bytes = 0
+            for key, entry in data.get('urls', {}).items():
+                if self.object_path(entry['hash'], entry['compressed']).exists():
+                    self.add_entry(key, entry)
+        return len(self.entries)
+    
+    def save(self):
+        """
+        Write the index to disk if it changed.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                'version': CACHE_VERSION,
+                'saved_at': time.time(),
+                'urls': dict(self.entries),
+            }
+            self._dirty = False
+        
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        tmp_path.replace(self.index_path)
+    
+    def object_path(self, digest: str, compressed: bool) -> Path:
+        """
+        Path of the object file holding a document body.
+        """
+        suffix = '.html.gz' if compressed else '.html'
+        return self.cache_dir / OBJECTS_DIRNAME / digest[:2] / f"{digest}{suffix}"
+    
+    def add_entry(self, key: str, entry: Dict):
+        """
+        Index an entry and count its object (caller holds the lock).
+        """
+        refs = self.object_refs.get(entry['hash'], 0)
+        if refs == 0:
+            self.stored_bytes += entry['size']
+        self.object_refs[entry['hash']] = refs + 1
+        self.entries[key] = entry
+    
+    def remove_entry(self, key: str):
+        """
+        Drop an entry and delete its object if nothing else refers to it
+        (caller holds the lock).
+        """
+        entry = self.entries.pop(key)
+        refs = self.object_refs[entry['hash']] - 1
+        if refs:
+            self.object_refs[entry['hash']] = refs
+            return
+        del self.object_refs[entry['hash']]
+        self.stored_bytes -= entry['size']
+        self.object_path(entry['hash'], entry['compressed']).unlink(missing_ok=True)
+    
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """
+        Look up a cached document and mark it as recently used. Thread-safe.
+        
+        Args:
+            url: Document URL
+        
+        Returns:
+            Response-like object, or None if the URL is not cached
+        """
+        key = cache_key(url)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self._dirty = True
+        
+        try:
+            data = self.object_path(entry['hash'], entry['compressed']).read_bytes()
+            content = gzip.decompress(data) if entry['compressed'] else data
+        except (OSError, EOFError, gzip.BadGzipFile) as e:
+            print(f"  ⚠ Dropping unreadable HTML cache entry for {url}: {e}")
+            with self._lock:
+                if self.entries.get(key) is entry:
+                    self.remove_entry(key)
+                self.misses += 1
+            return None
+        
+        with self._lock:
+            self.hits += 1
+        return CachedResponse(url, content, entry['headers'])
+    
+    def put(self, url: str, content: bytes, headers: Optional[Dict[str, str]] = None) -> str:
+        """
+        Store a fetched document and evict old entries if over budget. Thread-safe.
+        
+        Args:
+            url: Document URL
+            content: Raw response body
+            headers: Response headers (only CACHED_HEADERS are kept)
+        
+        Returns:
+            SHA-256 hex digest of the body
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        headers = headers or {}
+        kept_headers = {name: headers[name] for name in CACHED_HEADERS if headers.get(name)}
+        key = cache_key(url)
+        
+        with self._lock:
+            existing = self.entries.get(key)
+            if existing and existing['hash'] == digest:
+                # Same body: only refresh headers and recency
+                existing.update(headers=kept_headers, fetched_at=time.time())
+                self.entries.move_to_end(key)
+                self._dirty = True
+                return digest
+            compressed = self.compress
+            known = next((e for e in self.entries.values() if e['hash'] == digest), None) \
+                if digest in self.object_refs else None
+        
+        if known is not None:
+            compressed, size = known['compressed'], known['size']
+        else:
+            path = self.object_path(digest, compressed)
+            data = gzip.compress(content, compresslevel=6, mtime=0) if compressed else content
+            size = len(data)
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+                tmp_path.write_bytes(data)
+                tmp_path.replace(path)
+        
+        with self._lock:
+            if key in self.entries:
+                self.remove_entry(key)
+            self.add_entry(key, {
+                'hash': digest,
+                'size': size,
+                'compressed': compressed,
+                'headers': kept_headers,
+                'fetched_at': time.time(),
+            })
+            self._dirty = True
+            self.evict()
+        return digest
+    
+    def evict(self):
+        """
+        Drop least recently used entries until the cache fits max_bytes
+        (caller holds the lock). The newest entry is always kept.
+        """
+        if not self.max_bytes:
+            return
+        while self.stored_bytes > self.max_bytes and len(self.entries) > 1:
+            self.remove_entry(next(iter(self.entries)))
+            self.evicted += 1
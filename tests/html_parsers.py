@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+HTML Parser Backends
+Selects the BeautifulSoup tree builder used by the crawlers. html.parser is
+the pure-Python default; lxml parses several times faster.
+"""
+
+from typing import List, Union
+
+from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+
+
+# Backends the extraction code supports (all produce BeautifulSoup trees)
+PARSER_BACKENDS = ['html.parser', 'lxml', 'html5lib']
+DEFAULT_PARSER = 'html.parser'
+
+
+def available_parsers() -> List[str]:
+    """
+    List the parser backends that are installed.
+    
+    Returns:
+        Backend names in order of preference
+    """
+    return [name for name in PARSER_BACKENDS if builder_registry.lookup(name) is not None]
+
+
+def resolve_parser(name: str = DEFAULT_PARSER) -> str:
+    """
+    Validate a parser backend name.
+    
+    Args:
+        name: Backend name, or 'auto' for the fastest installed backend
+    
+    Returns:
+        Backend name to pass to BeautifulSoup
+    
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    if name == 'auto':
+        return 'lxml' if 'lxml' in available_parsers() else DEFAULT_PARSER
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend '{name}' (choose from: auto, {', '.join(PARSER_BACKENDS)})")
+    if builder_registry.lookup(name) is None:
+        raise ValueError(f"Parser backend '{name}' is not installed (pip install {name})")
+    return name
+
+
+def parse_html(markup: Union[str, bytes], parser: str = DEFAULT_PARSER) -> BeautifulSoup:
+    """
+    Parse HTML with the selected backend.
+    
+    Args:
+        markup: HTML document (bytes are decoded by BeautifulSoup)
+        parser: Backend name returned by resolve_parser
+    
+    Returns:
+        BeautifulSoup object
+    """
+    return BeautifulSoup(markup, parser)
@@ -0,0 +1,614 @@
+#!/usr/bin/env python3
+"""
+Mock Safe Transaction Service
+
+Local stand-in for the Safe Transaction Service serving synthetic Safes, so
+the API scripts can run and be benchmarked without an API key or network.
+Implements the endpoints the scripts use:
+    
+    GET  /{chain}/api/v1/safes/{address}/
+    GET  /{chain}/api/v1/safes/{address}/balances/
+    GET  /{chain}/api/v1/safes/{address}/multisig-transactions/
+    POST /{chain}/api/v1/safes/{address}/multisig-transactions/
+    GET  /{chain}/api/v1/multisig-transactions/{safe_tx_hash}/
+
+Any well-formed address is a Safe, generated deterministically from the seed.
+Latency, random 5xx errors and per-client 429 rate limiting can be injected;
+GET /__stats__ returns request counters for benchmarks.
+
+Usage:
+    python mock_safe_service.py --port 8799 --queue-depth 50 --latency 0.05
+    SAFE_API_BASE_URL=http://127.0.0.1:8799 python get_pending_transactions.py
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from rate_limiter import TokenBucket
+
+
+ADDRESS_PATTERN = re.compile(r'^0x[0-9a-fA-F]{40}$')
+ZERO_ADDRESS = '0x0000000000000000000000000000000000000000'
+
+# Page size used when a listing request has no 'limit' (as the real service)
+DEFAULT_PAGE_SIZE = 20
+
+# Timestamp of the first synthetic transaction of every Safe
+GENESIS = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# Statuses picked from when an error is injected
+INJECTED_ERRORS = (500, 502, 503)
+
+
+def isoformat(moment: datetime) -> str:
+    """Format a timestamp the way the service does."""
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+class MockSafeService:
+    """
+    In-memory state and fault injection of the mock service.
+    
+    Safes are created on first access; each gets `history_depth` executed
+    transactions and `queue_depth` pending ones. Proposed transactions are
+    added to the queue. All state is guarded by one lock, so handlers can
+    run on many threads.
+    """
+    
+    def __init__(self, queue_depth: int = 5, history_depth: int = 20,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 rate_limit: float = 0.0, burst: Optional[float] = None,
+                 retry_after: float = 1.0, missing: Tuple[str, ...] = (), seed: int = 0):
+        """
+        Initialize the service.
+        
+        Args:
+            queue_depth: Pending transactions of each synthetic Safe
+            history_depth: Executed transactions of each synthetic Safe
+            latency: Seconds added to every response
+            jitter: Extra random latency, uniform in [0, jitter] seconds
+            error_rate: Probability (0-1) of answering with a random 5xx
+            rate_limit: Requests per second allowed per client address
+                before answering 429 (0 disables limiting)
+            burst: Requests a client may send at once before the rate applies
+            retry_after: Retry-After seconds sent with 429 responses
+            missing: Addresses answered with 404 as unknown Safes
+            seed: Seed of the synthetic data and injected faults
+        """
+        self.queue_depth = queue_depth
+        self.history_depth = history_depth
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.retry_after = retry_after
+        self.missing = {address.lower() for address in missing}
+        self.seed = seed
+        
+        self.safes: Dict[Tuple[str, str], Dict] = {}
+        self.queues: Dict[Tuple[str, str], List[Dict]] = {}
+        self.transactions: Dict[Tuple[str, str], Dict] = {}
+        self.clients: Dict[str, TokenBucket] = {}
+        self.requests = 0
+        self.statuses: Counter = Counter()
+        self.endpoints: Counter = Counter()
+        self.clock = GENESIS
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+    
+    def tick(self) -> str:
+        """Advance the service clock; every change gets a distinct timestamp."""
+        self.clock += timedelta(seconds=1)
+        return isoformat(self.clock)
+    
+    def make_transaction(self, chain: str, safe: Dict, nonce: int, rng: random.Random,
+                         executed: bool, **fields) -> Dict:
+        """
+        Build a transaction of a Safe and register it.
+        
+        Args:
+            chain: Chain identifier
+            safe: Safe info dictionary
+            nonce: Transaction nonce
+            rng: Random source for synthetic values
+            executed: Whether the transaction is already executed
+            **fields: Values overriding the synthetic ones (e.g. a proposal)
+        
+        Returns:
+            Transaction dictionary
+        """
+        owners = safe['owners']
+        confirming = owners[:safe['threshold'] if executed else rng.randint(0, safe['threshold'] - 1)]
+        submitted = self.tick()
+        payload = f"{chain}:{safe['address']}:{nonce}:{submitted}:{rng.random()}"
+        tx = {
+            'safe': safe['address'],
+            'to': '0x' + hashlib.sha1(payload.encode()).hexdigest(),
+            'value': str(rng.randint(0, 10) * 10 ** 17),
+            'data': None,
+            'operation': 0,
+            'gasToken': ZERO_ADDRESS,
+            'safeTxGas': '0',
+            'baseGas': '0',
+            'gasPrice': '0',
+            'refundReceiver': ZERO_ADDRESS,
+            'nonce': nonce,
+            'executionDate': submitted if executed else None,
+            'submissionDate': submitted,
+            'modified': submitted,
+            'blockNumber': None,
+            'transactionHash': '0x' + hashlib.sha256(payload.encode()).hexdigest() if executed else None,
+            'safeTxHash': '0x' + hashlib.sha256(('safeTx:' + payload).encode()).hexdigest(),
+            'isExecuted': executed,
+            'isSuccessful': True if executed else None,
+            'confirmationsRequired': safe['threshold'],
+            'confirmations': [
+                {'owner': owner, 'submissionDate': submitted, 'signatureType': 'EOA',
+                 'signature': '0x' + hashlib.sha256((owner + payload).encode()).hexdigest() * 2}
+                for owner in confirming
+            ],
+        }
+        tx.update(fields)
+        self.transactions[(chain, tx['safeTxHash'])] = tx
+        return tx
+    
+    def safe(self, chain: str, address: str) -> Optional[Dict]:
+        """
+        Get (creating on first access) a synthetic Safe. Caller holds the lock.
+        
+        Returns:
+            Safe info dictionary, or None for a missing address
+        """
+        key = (chain, address.lower())
+        if key[1] in self.missing:
+            return None
+        if key not in self.safes:
+            rng = random.Random(f"{self.seed}:{chain}:{key[1]}")
+            owners = ['0x' + hashlib.sha1(f"{key[1]}:owner{i}".encode()).hexdigest()
+                      for i in range(rng.randint(2, 5))]
+            safe = {
+                'address': address,
+                'nonce': self.history_depth,
+                'threshold': rng.randint(2, len(owners)),
+                'owners': owners,
+                'masterCopy': ZERO_ADDRESS,
+                'modules': [],
+                'fallbackHandler': ZERO_ADDRESS,
+                'guard': ZERO_ADDRESS,
+                'version': '1.3.0',
+            }
+            queue = [self.make_transaction(chain, safe, nonce, rng, executed=nonce < safe['nonce'])
+                     for nonce in range(self.history_depth + self.queue_depth)]
+            self.safes[key] = safe
+            self.queues[key] = queue
+        return self.safes[key]
+    
+    def balances(self, safe: Dict) -> List[Dict]:
+        """Synthetic native and ERC20 balances of a Safe."""
+        rng = random.Random(f"{self.seed}:balances:{safe['address'].lower()}")
+        return [
+            {'tokenAddress': None, 'token': None, 'balance': str(rng.randint(0, 100) * 10 ** 17)},
+            {'tokenAddress': '0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48',
+             'token': {'name': 'USD Coin', 'symbol': 'USDC', 'decimals': 6, 'logoUri': ''},
+             'balance': str(rng.randint(0, 10 ** 6) * 10 ** 6)},
+        ]
+    
+    def list_transactions(self, chain: str, address: str, query: Dict[str, str]) -> List[Dict]:
+        """
+        Filter and order a Safe's transactions like the service does.
+        
+        Supported filters: executed, nonce, nonce__gte, nonce__lt,
+        modified__gt and modified__gte; ordering on any transaction field
+        (prefixed with '-' for descending, default '-nonce').
+        """
+        results = list(self.queues[(chain, address.lower())])
+        if 'executed' in query:
+            executed = query['executed'].lower() == 'true'
+            results = [tx for tx in results if tx['isExecuted'] == executed]
+        if 'nonce' in query:
+            results = [tx for tx in results if tx['nonce'] == int(query['nonce'])]
+        if 'nonce__gte' in query:
+            results = [tx for tx in results if tx['nonce'] >= int(query['nonce__gte'])]
+        if 'nonce__lt' in query:
+            results = [tx for tx in results if tx['nonce'] < int(query['nonce__lt'])]
+        if 'modified__gt' in query:
+            results = [tx for tx in results if tx['modified'] > query['modified__gt']]
+        if 'modified__gte' in query:
+            results = [tx for tx in results if tx['modified'] >= query['modified__gte']]
+        
+        ordering = query.get('ordering', '-nonce')
+        field = ordering.lstrip('-')
+        results.sort(key=lambda tx: (tx.get(field) is not None, tx.get(field) or 0, tx['submissionDate']),
+                     reverse=ordering.startswith('-'))
+        return results
+    
+    def propose(self, chain: str, address: str, body: Dict) -> Tuple[int, Dict]:
+        """
+        Add a proposed transaction to a Safe's queue.
+        
+        Returns:
+            (status, response body)
+        """
+        safe = self.safe(chain, address)
+        nonce = body.get('nonce')
+        if not isinstance(nonce, int) and not str(nonce).isdigit():
+            return 400, {'nonce': ['A valid integer is required.']}
+        if int(nonce) < safe['nonce']:
+            return 422, {'nonce': [f"Nonce={nonce} too low for safe={address}"]}
+        rng = random.Random(f"{self.seed}:propose:{len(self.transactions)}")
+        fields = {key: body[key] for key in ('to', 'value', 'data', 'operation', 'safeTxGas', 'baseGas',
+                                             'gasPrice', 'gasToken', 'refundReceiver') if key in body}
+        if body.get('contractTransactionHash'):
+            fields['safeTxHash'] = body['contractTransactionHash']
+        if (chain, fields.get('safeTxHash')) in self.transactions:
+            return 422, {'safeTxHash': ['Transaction already exists']}
+        tx = self.make_transaction(chain, safe, int(nonce), rng, executed=False, confirmations=[], **fields)
+        self.queues[(chain, address.lower())].append(tx)
+        return 201, tx
+    
+    def simulate_activity(self) -> Optional[Dict]:
+        """
+        Apply one random change to a known Safe's queue: confirm a pending
+        transaction, or execute the next one once it has enough confirmations
+        (and top the queue up again).
+        
+        Returns:
+            The changed transaction, or None if no Safe was accessed yet
+        """
+        with self._lock:
+            if not self.safes:
+                return None
+            key = self.random.choice(sorted(self.safes))
+            safe = self.safes[key]
+            pending = [tx for tx in self.queues[key] if not tx['isExecuted']]
+            if not pending:
+                return None
+            tx = min(pending, key=lambda tx: tx['nonce'])
+            if len(tx['confirmations']) >= tx['confirmationsRequired']:
+                now = self.tick()
+                tx.update(isExecuted=True, isSuccessful=True, executionDate=now, modified=now,
+                          transactionHash='0x' + hashlib.sha256(tx['safeTxHash'].encode()).hexdigest())
+                safe['nonce'] = tx['nonce'] + 1
+                rng = random.Random(f"{self.seed}:refill:{len(self.transactions)}")
+                self.queues[key].append(self.make_transaction(
+                    key[0], safe, max(t['nonce'] for t in self.queues[key]) + 1, rng, executed=False))
+                return tx
+            tx = self.random.choice(pending)
+            signed = {conf['owner'] for conf in tx['confirmations']}
+            owner = next((owner for owner in safe['owners'] if owner not in signed), None)
+            if owner:
+                now = self.tick()
+                tx['confirmations'].append({'owner': owner, 'submissionDate': now,
+                                            'signatureType': 'EOA', 'signature': '0x'})
+                tx['modified'] = now
+            return tx
+    
+    def inject_fault(self, client: str) -> Optional[Tuple[int, Dict, Dict]]:
+        """
+        Decide whether a request gets a 429 or an injected error.
+        
+        Returns:
+            (status, body, headers) of the fault, or None to serve normally
+        """
+        if self.rate_limit > 0:
+            with self._lock:
+                bucket = self.clients.get(client)
+                if bucket is None:
+                    bucket = self.clients[client] = TokenBucket(self.rate_limit, self.burst)
+            if not bucket.try_acquire():
+                return 429, {'detail': 'Request was throttled.'}, {'Retry-After': f"{self.retry_after:g}"}
+        if self.error_rate > 0:
+            with self._lock:
+                failed = self.random.random() < self.error_rate
+                status = self.random.choice(INJECTED_ERRORS)
+            if failed:
+                return status, {'detail': 'Injected error'}, {}
+        return None
+    
+    def record(self, endpoint: str, status: int):
+        """Count a served request."""
+        with self._lock:
+            self.requests += 1
+            self.endpoints[endpoint] += 1
+            self.statuses[status] += 1
+    
+    def stats(self) -> Dict:
+        """Request counters, for benchmarks."""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'statuses': {str(status): count for status, count in sorted(self.statuses.items())},
+                'endpoints': dict(self.endpoints),
+                'safes': len(self.safes),
+                'transactions': len(self.transactions),
+            }
+    
+    def handle(self, method: str, url: str, body: Optional[Dict], client: str,
+               host: str) -> Tuple[int, Dict, Dict]:
+        """
+        Serve one request.
+        
+        Args:
+            method: HTTP method
+            url: Request path with query string
+            body: Parsed JSON body (POST)
+            client: Client address, for rate limiting
+            host: Host header, for absolute pagination links
+        
+        Returns:
+            (status, JSON body, extra headers)
+        """
+        parsed = urlparse(url)
+        if parsed.path == '/__stats__':
+            return 200, self.stats(), {}
+        
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+        
+        parts = parsed.path.strip('/').split('/')
+        if len(parts) < 4 or parts[1:3] != ['api', 'v1']:
+            return 404, {'detail': 'Not found.'}, {}
+        chain, resource = parts[0], parts[3:]
+        query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        
+        endpoint = '/'.join('{id}' if part.startswith('0x') else part for part in resource)
+        
+        fault = self.inject_fault(client)
+        if fault:
+            self.record(endpoint, fault[0])
+            return fault
+        
+        status, payload = self.route(method, chain, resource, query, body, host, parsed.path)
+        self.record(endpoint, status)
+        return status, payload, {}
+    
+    def route(self, method: str, chain: str, resource: List[str], query: Dict[str, str],
+              body: Optional[Dict], host: str, path: str) -> Tuple[int, Dict]:
+        """Dispatch a request below /{chain}/api/v1/ to its endpoint."""
+        if resource[0] == 'multisig-transactions' and len(resource) == 2 and method == 'GET':
+            with self._lock:
+                tx = self.transactions.get((chain, resource[1]))
+            return (200, tx) if tx else (404, {'detail': 'Not found.'})
+        
+        if resource[0] != 'safes' or len(resource) < 2:
+            return 404, {'detail': 'Not found.'}
+        address = resource[1]
+        if not ADDRESS_PATTERN.match(address):
+            return 422, {'code': 1, 'message': 'Checksum address validation failed', 'arguments': [address]}
+        
+        with self._lock:
+            safe = self.safe(chain, address)
+            if safe is None:
+                return 404, {'detail': 'Not found.'}
+            endpoint = resource[2] if len(resource) > 2 else ''
+            
+            if endpoint == '' and method == 'GET':
+                return 200, dict(safe)
+            if endpoint == 'balances' and method == 'GET':
+                return 200, self.balances(safe)
+            if endpoint == 'multisig-transactions' and method == 'POST':
+                return self.propose(chain, address, body or {})
+            if endpoint == 'multisig-transactions' and method == 'GET':
+                results = self.list_transactions(chain, address, query)
+                limit = int(query.get('limit', DEFAULT_PAGE_SIZE))
+                offset = int(query.get('offset', 0))
+                
+                def page_link(page_offset: int) -> str:
+                    return f"http://{host}{path}?" + urlencode(dict(query, limit=limit, offset=page_offset))
+                
+                return 200, {
+                    'count': len(results),
+                    'next': page_link(offset + limit) if offset + limit < len(results) else None,
+                    'previous': page_link(max(0, offset - limit)) if offset > 0 else None,
+                    'results': results[offset:offset + limit],
+                }
+        if endpoint in ('', 'balances', 'multisig-transactions'):
+            return 405, {'detail': f'Method "{method}" not allowed.'}
+        return 404, {'detail': 'Not found.'}
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    """Translates HTTP requests into MockSafeService.handle calls."""
+    
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without TCP_NODELAY
+    # keep-alive clients would wait for delayed ACKs on every response
+    disable_nagle_algorithm = True
+    service: MockSafeService = None
+    
+    def respond(self, method: str):
+        body = None
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            try:
+                body = json.loads(self.rfile.read(length))
+            except json.JSONDecodeError:
+                body = None
+        status, payload, headers = self.service.handle(
+            method, self.path, body, self.client_address[0], self.headers.get('Host', ''))
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def do_GET(self):
+        self.respond('GET')
+    
+    def do_POST(self):
+        self.respond('POST')
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(service: MockSafeService, host: str = '127.0.0.1',
+                 port: int = 0) -> ThreadingHTTPServer:
+    """
+    Serve a MockSafeService on a background thread.
+    
+    Args:
+        service: Service state
+        host: Interface to bind
+        port: Port to bind (0 picks a free one)
+    
+    Returns:
+        Running server (server.server_address has the bound port)
+    """
+    handler = type('BoundMockRequestHandler', (MockRequestHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@contextmanager
+def running_mock_service(**options) -> Iterator[Tuple[MockSafeService, str]]:
+    """
+    Run a mock service for the duration of a with-block.
+    
+    Args:
+        **options: MockSafeService arguments
+    
+    Yields:
+        (service, base URL to pass as SafeApiClient base_url)
+    """
+    service = MockSafeService(**options)
+    server = start_server(service)
+    try:
+        yield service, f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Serve synthetic Safes through a local mock of the Safe Transaction Service'
+    )
+    parser.add_argument(
+        '--host',
+        default='127.0.0.1',
+        help='Interface to bind (default: 127.0.0.1)'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8799,
+        help='Port to listen on (default: 8799)'
+    )
+    parser.add_argument(
+        '--queue-depth',
+        type=int,
+        default=5,
+        help='Pending transactions per Safe (default: 5)'
+    )
+    parser.add_argument(
+        '--history-depth',
+        type=int,
+        default=20,
+        help='Executed transactions per Safe (default: 20)'
+    )
+    parser.add_argument(
+        '--latency',
+        type=float,
+        default=0.0,
+        help='Seconds added to every response (default: 0)'
+    )
+    parser.add_argument(
+        '--jitter',
+        type=float,
+        default=0.0,
+        help='Extra random latency of up to this many seconds (default: 0)'
+    )
+    parser.add_argument(
+        '--error-rate',
+        type=float,
+        default=0.0,
+        help='Fraction of requests answered with a random 5xx (default: 0)'
+    )
+    parser.add_argument(
+        '--rate-limit',
+        type=float,
+        default=0.0,
+        help='Requests per second per client before answering 429 (default: 0 = unlimited)'
+    )
+    parser.add_argument(
+        '--burst',
+        type=float,
+        help='Requests a client may send at once before --rate-limit applies'
+    )
+    parser.add_argument(
+        '--retry-after',
+        type=float,
+        default=1.0,
+        help='Retry-After seconds sent with 429 responses (default: 1)'
+    )
+    parser.add_argument(
+        '--missing',
+        action='append',
+        default=[],
+        help='Address answered with 404 (repeatable)'
+    )
+    parser.add_argument(
+        '--activity',
+        type=float,
+        default=0.0,
+        help='Random confirmations/executions per second on accessed Safes (default: 0)'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+        help='Seed of the synthetic data (default: 0)'
+    )
+    
+    args = parser.parse_args()
+    
+    service = MockSafeService(
+        queue_depth=args.queue_depth,
+        history_depth=args.history_depth,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        retry_after=args.retry_after,
+        missing=tuple(args.missing),
+        seed=args.seed,
+    )
+    server = start_server(service, args.host, args.port)
+    print(f"🧪 Mock Safe Transaction Service on http://{args.host}:{server.server_address[1]}")
+    print(f"   export SAFE_API_BASE_URL=http://{args.host}:{server.server_address[1]}")
+    
+    try:
+        while True:
+            if args.activity > 0:
+                time.sleep(1.0 / args.activity)
+                service.simulate_activity()
+            else:
+                time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"\n📊 {json.dumps(service.stats())}")
+
+
+if __name__ == '__main__':
+    main()
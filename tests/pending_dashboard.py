@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Pending Transactions Dashboard
+
+Non-interactive batch report of the pending queues of many Safes across
+chains. Safes are fetched concurrently, with a request rate limit per chain,
+and the result is written as one aggregated JSON report and/or a CSV with
+one row per pending transaction.
+
+Usage:
+    python pending_dashboard.py --safe eth:0x... --safe base:0x... --json report.json
+    python pending_dashboard.py --safes safes.txt --csv report.csv
+
+The --safes file lists one "chain:address" (or "chain,address") per line;
+blank lines and lines starting with # are ignored.
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import requests
+
+from get_pending_transactions import CLIENT, SUPPORTED_CHAINS, transaction_fields
+from generate_safe_transaction_link import generate_link_from_transaction_data
+from rate_limiter import HostRateLimiter
+
+
+# Columns of the CSV report (transaction fields first, then links)
+CSV_FIELDS = [
+    'chain', 'safe_address', 'safe_tx_hash', 'nonce', 'to', 'value_wei', 'value_eth',
+    'gas_price', 'confirmations', 'confirmations_required', 'missing_signatures',
+    'confirmed_by', 'is_executed', 'is_successful', 'has_data', 'operation',
+    'submission_date', 'modified', 'transaction_hash',
+    'specific_transaction', 'queue', 'history',
+]
+
+
+def parse_safe_spec(spec: str) -> Tuple[str, str]:
+    """
+    Parse a "chain:address" (or "chain,address") Safe specification.
+    
+    Args:
+        spec: Safe specification
+    
+    Returns:
+        Tuple of (chain, address)
+    
+    Raises:
+        ValueError: If the specification is malformed
+    """
+    for separator in (':', ','):
+        if separator in spec:
+            chain, address = (part.strip() for part in spec.split(separator, 1))
+            if chain and address:
+                return chain.lower(), address
+    raise ValueError(f"Expected chain:address, got '{spec}'")
+
+
+def load_safe_list(path: str) -> List[Tuple[str, str]]:
+    """
+    Read (chain, address) pairs from a file.
+    
+    Args:
+        path: File with one chain:address per line
+    
+    Returns:
+        List of (chain, address) pairs
+    """
+    safes = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                safes.append(parse_safe_spec(line))
+    return safes
+
+
+def fetch_safe_queue(chain: str, safe_address: str, limiter: HostRateLimiter) -> Dict:
+    """
+    Fetch a Safe's info and its whole pending queue.
+    
+    Args:
+        chain: Chain identifier
+        safe_address: Safe address
+        limiter: Per-chain rate limiter (keyed by chain identifier)
+    
+    Returns:
+        Dictionary with the Safe summary under 'safe' and its pending
+        transactions (fields and links) under 'transactions'
+    """
+    bucket = limiter.bucket_for(chain)
+    summary = {
+        'chain': chain,
+        'chain_name': SUPPORTED_CHAINS.get(chain, chain.upper()),
+        'safe_address': safe_address,
+        'found': False,
+        'threshold': None,
+        'owners': None,
+        'nonce': None,
+        'pending_count': 0,
+        'elapsed_seconds': 0.0,
+        'error': None,
+    }
+    transactions = []
+    start = time.perf_counter()
+    
+    try:
+        bucket.acquire()
+        response = CLIENT.get_cached(chain, safe_address)
+        if response.status_code == 404:
+            summary['error'] = 'Safe not found'
+        else:
+            response.raise_for_status()
+            safe_info = response.json()
+            summary.update(found=True, threshold=safe_info.get('threshold'),
+                           owners=len(safe_info.get('owners', [])),
+                           nonce=safe_info.get('nonce'))
+            
+            pages = CLIENT.iter_pages(chain, f"safes/{safe_address}/multisig-transactions/",
+                                      params={"executed": "false", "ordering": "-nonce"})
+            while True:
+                bucket.acquire()
+                page = next(pages, None)
+                if page is None:
+                    break
+                for tx in page.get('results', []):
+                    links = generate_link_from_transaction_data(dict(tx, safe=tx.get('safe') or safe_address), chain)
+                    transactions.append(dict(
+                        {'chain': chain, 'safe_address': safe_address},
+                        **transaction_fields(tx),
+                        links={key: links[key] for key in ('specific_transaction', 'queue', 'history')},
+                    ))
+    except (requests.exceptions.RequestException, ValueError) as e:
+        summary['error'] = str(e)
+    
+    summary['pending_count'] = len(transactions)
+    summary['elapsed_seconds'] = round(time.perf_counter() - start, 3)
+    return {'safe': summary, 'transactions': transactions}
+
+
+def build_report(safes: List[Tuple[str, str]], concurrency: int = 8,
+                 chain_rate: float = 2.0) -> Dict:
+    """
+    Fetch the pending queues of many Safes concurrently.
+    
+    Args:
+        safes: (chain, address) pairs
+        concurrency: Number of Safes fetched at once
+        chain_rate: Requests per second allowed per chain
+    
+    Returns:
+        Aggregated report with per-Safe summaries and all pending transactions,
+        in input order
+    """
+    limiter = HostRateLimiter(chain_rate)
+    start = time.perf_counter()
+    
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        results = list(executor.map(lambda pair: fetch_safe_queue(pair[0], pair[1], limiter), safes))
+    
+    return {
+        'generated_at': datetime.now().isoformat(),
+        'elapsed_seconds': round(time.perf_counter() - start, 3),
+        'total_safes': len(safes),
+        'total_pending': sum(result['safe']['pending_count'] for result in results),
+        'safes': [result['safe'] for result in results],
+        'transactions': [tx for result in results for tx in result['transactions']],
+    }
+
+
+def write_csv(report: Dict, path: str):
+    """
+    Write one CSV row per pending transaction.
+    
+    Args:
+        report: Report from build_report
+        path: Destination CSV file
+    """
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for tx in report['transactions']:
+            row = {key: value for key, value in tx.items() if key != 'links'}
+            row.update(tx['links'])
+            row['confirmed_by'] = ';'.join(row['confirmed_by'])
+            writer.writerow(row)
+
+
+def print_summary(report: Dict):
+    """Print one line per Safe with its queue size and timing."""
+    print("\n" + "="*70)
+    print("⏳ PENDING TRANSACTIONS DASHBOARD")
+    print("="*70)
+    for safe in report['safes']:
+        status = f"{safe['pending_count']} pending" if not safe['error'] else f"⚠️ {safe['error']}"
+        print(f"  {safe['chain_name']:<20} {safe['safe_address']}  {status}  ({safe['elapsed_seconds']:.2f}s)")
+    print("-"*70)
+    print(f"📊 {report['total_pending']} pending transaction(s) across {report['total_safes']} Safe(s) "
+          f"in {report['elapsed_seconds']:.2f}s")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Report the pending queues of many Safes across chains'
+    )
+    parser.add_argument(
+        '--safe',
+        action='append',
+        default=[],
+        help='Safe to include as chain:address (repeatable)'
+    )
+    parser.add_argument(
+        '--safes',
+        help='File with one chain:address per line'
+    )
+    parser.add_argument(
+        '--json',
+        help='Write the aggregated report to this JSON file'
+    )
+    parser.add_argument(
+        '--csv',
+        help='Write one row per pending transaction to this CSV file'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=8,
+        help='Number of Safes fetched at once (default: 8)'
+    )
+    parser.add_argument(
+        '--chain-rate',
+        type=float,
+        default=2.0,
+        help='Requests per second allowed per chain (default: 2)'
+    )
+    
+    args = parser.parse_args()
+    
+    try:
+        safes = [parse_safe_spec(spec) for spec in args.safe]
+        if args.safes:
+            safes.extend(load_safe_list(args.safes))
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if not safes:
+        parser.error('no Safes given (use --safe chain:address or --safes FILE)')
+    
+    report = build_report(safes, concurrency=args.concurrency, chain_rate=args.chain_rate)
+    print_summary(report)
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ JSON report saved to: {args.json}")
+    if args.csv:
+        write_csv(report, args.csv)
+        print(f"✅ CSV report saved to: {args.csv}")
+    
+    # Non-zero exit when a Safe could not be read, for cron/CI use
+    sys.exit(1 if any(safe['error'] for safe in report['safes']) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,14 +5,16 @@ Uses Crawlee's PlaywrightCrawler for sites that require JavaScript rendering
 """
 
 import asyncio
-import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict
 import re
 
 from crawlee.crawlers import PlaywrightCrawler, PlaywrightCrawlingContext
 from trafilatura import extract, extract_metadata
 from trafilatura.settings import use_config
+from trafilatura.utils import load_html
+
+from sitemap_reader import SitemapEntry, iter_sitemap_urls
 
 
 class JavaScriptSiteCrawler:
@@ -32,29 +34,25 @@ class JavaScriptSiteCrawler:
         self.config = use_config()
         self.config.set("DEFAULT", "EXTRACTION_TIMEOUT", "0")
         
-    def parse_sitemap(self) -> List[Dict[str, str]]:
-        """Parse sitemap XML."""
-        tree = ET.parse(self.sitemap_path)
-        root = tree.getroot()
-        namespace = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-        
-        urls = []
-        for url_elem in root.findall('ns:url', namespace):
-            loc = url_elem.find('ns:loc', namespace)
-            if loc is not None:
-                lastmod = url_elem.find('ns:lastmod', namespace)
-                priority = url_elem.find('ns:priority', namespace)
-                urls.append({
-                    'url': loc.text,
-                    'lastmod': lastmod.text if lastmod is not None else '',
-                    'priority': priority.text if priority is not None else ''
-                })
-        return urls
+    def parse_sitemap(self) -> Dict[str, SitemapEntry]:
+        """
+        Parse sitemap XML (plain, gzip-compressed or sitemap index), streamed
+        entry by entry.
+        
+        Returns:
+            Sitemap entries keyed by URL, in sitemap order
+        """
+        return {entry.url: entry for entry in iter_sitemap_urls(self.sitemap_path)}
     
     def extract_content(self, html: str, url: str) -> Dict:
         """Extract content using Trafilatura."""
+        # Parse the rendered HTML once and share the tree (extract() works on a copy)
+        tree = load_html(html)
+        if tree is None:
+            tree = html
+        
         extracted_text = extract(
-            html,
+            tree,
             output_format='markdown',
             include_comments=False,
             include_tables=True,
@@ -63,7 +61,7 @@ class JavaScriptSiteCrawler:
             config=self.config
         )
         
-        metadata = extract_metadata(html)
+        metadata = extract_metadata(tree)
         
         result = {
             'url': url,
@@ -126,15 +124,14 @@ class JavaScriptSiteCrawler:
         print(f"🎭 Playwright Crawler - For JavaScript-Heavy Sites")
         print(f"📁 Output directory: {self.output_dir}\n")
         
-        urls = self.parse_sitemap()
-        print(f"🔍 Found {len(urls)} URLs\n")
+        sitemap_lookup = self.parse_sitemap()
+        print(f"🔍 Found {len(sitemap_lookup)} URLs\n")
         
-        sitemap_lookup = {item['url']: item for item in urls}
         stats = {'processed': 0, 'successful': 0, 'failed': 0}
         
         # Configure Playwright crawler
         crawler = PlaywrightCrawler(
-            max_requests_per_crawl=len(urls),
+            max_requests_per_crawl=len(sitemap_lookup),
             max_request_retries=3,
             headless=True,  # Run in headless mode
             browser_type='chromium',  # Can be 'chromium', 'firefox', or 'webkit'
@@ -146,7 +143,7 @@ class JavaScriptSiteCrawler:
             url = context.request.url
             stats['processed'] += 1
             
-            print(f"[{stats['processed']}/{len(urls)}] 🎭 Rendering: {url}")
+            print(f"[{stats['processed']}/{len(sitemap_lookup)}] 🎭 Rendering: {url}")
             
             try:
                 # Wait for page to fully load
@@ -184,13 +181,13 @@ class JavaScriptSiteCrawler:
                 print(f"  ✗ Error: {e}")
         
         # Run crawler
-        await crawler.run([url_data['url'] for url_data in urls])
+        await crawler.run(list(sitemap_lookup))
         
         # Summary
         print(f"\n{'='*50}")
         print("📊 Summary")
         print(f"{'='*50}")
-        print(f"Total: {len(urls)}")
+        print(f"Total: {len(sitemap_lookup)}")
         print(f"✓ Successful: {stats['successful']}")
         print(f"✗ Failed: {stats['failed']}")
         print(f"📁 Output: {self.output_dir.absolute()}")
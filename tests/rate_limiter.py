@@ -0,0 +1,530 @@
+#!/usr/bin/env python3
+"""
+Rate Limiting Utilities
+Thread-safe token buckets used to keep crawlers and API clients polite, and
+an AIMD controller that adapts the request rate and concurrency to how the
+server is coping.
+"""
+
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Deque, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+
+# AIMD control: on an error (429, 5xx or no response), a Retry-After header
+# or a p95 latency above the target, the rate and concurrency are multiplied
+# by BACKOFF_FACTOR (once per round trip). Every healthy response adds
+# RECOVERY_STEP of the initial rate and 1/concurrency requests in flight, up
+# to the configured maximums. The rate never drops below MIN_ADAPTIVE_RATE
+# requests per second.
+BACKOFF_FACTOR = 0.5
+RECOVERY_STEP = 0.05
+MIN_ADAPTIVE_RATE = 0.5
+
+# p95 latency and error rate are measured over the last LATENCY_WINDOW
+# responses; the latency is only judged once MIN_SAMPLES have arrived
+LATENCY_WINDOW = 50
+MIN_SAMPLES = 10
+ERROR_RATE_TARGET = 0.05
+
+# Without an explicit latency target, a p95 latency of SLOW_LATENCY_FACTOR
+# times the best median seen (and at least MIN_SLOW_LATENCY seconds) is overload
+SLOW_LATENCY_FACTOR = 3.0
+MIN_SLOW_LATENCY = 0.5
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+    
+    Args:
+        value: Header value, either seconds or an HTTP date
+    
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """
+    Classic token bucket: holds up to `capacity` tokens and refills at
+    `rate` tokens per second. Each request consumes one token.
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the bucket.
+        
+        Args:
+            rate: Refill rate in tokens per second
+            capacity: Maximum burst size (defaults to max(1, rate))
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float):
+        # updated_at lies in the future while the bucket is paused
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+    
+    def set_rate(self, rate: float, capacity: Optional[float] = None):
+        """
+        Change the refill rate (and optionally the burst size) in place.
+        
+        Args:
+            rate: New refill rate in tokens per second
+            capacity: New maximum burst size
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+            if capacity:
+                self.capacity = float(capacity)
+                self.tokens = min(self.tokens, self.capacity)
+    
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket, going into debt if needed.
+        
+        Args:
+            tokens: Number of tokens to take
+        
+        Returns:
+            Seconds the caller must wait before the reservation is honoured
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= tokens
+            paused = max(0.0, self.updated_at - now)
+            if self.tokens >= 0:
+                return paused
+            return paused - self.tokens / self.rate
+    
+    def pause(self, seconds: float):
+        """
+        Hold back the bucket so no token is available for the given time,
+        e.g. to honour a Retry-After header. The pause does not depend on the
+        rate, so changing the rate afterwards neither shortens nor stretches it.
+        
+        Args:
+            seconds: Seconds before the next request may be sent
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # One request at the end of the pause, the rest at the rate after it
+            self.tokens = min(self.tokens, 1.0)
+            self.updated_at = max(self.updated_at, now + seconds)
+    
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        Take tokens only if they are available right now.
+        
+        Args:
+            tokens: Number of tokens to take
+        
+        Returns:
+            True if the tokens were taken, False if the bucket is short
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self.updated_at or self.tokens < tokens:
+                return False
+            self.tokens -= tokens
+            return True
+    
+    def acquire(self, tokens: float = 1.0):
+        """
+        Block until the requested tokens are available.
+        
+        Args:
+            tokens: Number of tokens to take
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+
+class AdaptiveRateController:
+    """
+    AIMD (additive increase, multiplicative decrease) control of the request
+    rate and the number of requests in flight to one server.
+    
+    Both grow slowly while the p95 latency and the error rate stay under
+    target, and are cut in half on 429/5xx responses, requests that get no
+    response, Retry-After headers and latency spikes. Callers bracket every
+    request with acquire() (or try_start() and reserve() from asyncio) and
+    finish().
+    """
+    
+    def __init__(self, rate: float, concurrency: int = 1, max_rate: Optional[float] = None,
+                 max_concurrency: Optional[int] = None, burst: Optional[float] = None,
+                 min_rate: float = MIN_ADAPTIVE_RATE, latency_target: Optional[float] = None,
+                 error_target: float = ERROR_RATE_TARGET, window: int = LATENCY_WINDOW):
+        """
+        Initialize the controller.
+        
+        Args:
+            rate: Initial requests per second
+            concurrency: Initial requests in flight
+            max_rate: Highest rate to grow to (defaults to rate)
+            max_concurrency: Most requests in flight to grow to (defaults to concurrency)
+            burst: Burst size of the token bucket
+            min_rate: Lowest rate to back off to
+            latency_target: p95 latency in seconds above which the controller
+                backs off (None = derived from the best median latency seen)
+            error_target: Error rate above which the controller stops growing
+            window: Responses the p95 latency and error rate are measured over
+        """
+        self.bucket = TokenBucket(rate, burst)
+        self.max_rate = max(rate, max_rate or rate)
+        self.min_rate = min(rate, min_rate)
+        self.rate_step = rate * RECOVERY_STEP
+        self.limit = float(max(1, concurrency))
+        self.max_concurrency = max(int(self.limit), max_concurrency or 0)
+        self.latency_target = latency_target
+        self.error_target = error_target
+        self.fixed_rate = False
+        self.samples: Deque[Tuple[float, bool]] = deque(maxlen=window)
+        self.best_median: Optional[float] = None
+        self.in_flight = 0
+        self.backoffs = 0
+        self.backoff_at = float('-inf')
+        self._slots = threading.Condition()
+    
+    @property
+    def rate(self) -> float:
+        """Current requests per second."""
+        return self.bucket.rate
+    
+    @property
+    def concurrency(self) -> int:
+        """Current limit of requests in flight."""
+        return int(self.limit)
+    
+    def set_rate(self, rate: float, burst: Optional[float] = None, fixed: bool = False):
+        """
+        Change the rate in place.
+        
+        Args:
+            rate: Requests per second
+            burst: Burst size
+            fixed: Whether the rate is imposed by the server (e.g. robots.txt
+                Crawl-delay) and must not be adapted
+        """
+        with self._slots:
+            self.bucket.set_rate(rate, burst)
+            if fixed:
+                self.fixed_rate = True
+                self.max_rate = rate
+    
+    def try_start(self) -> bool:
+        """
+        Claim a request slot if one is free.
+        
+        Returns:
+            True if the caller may send a request (and must call finish())
+        """
+        with self._slots:
+            if self.in_flight >= self.limit:
+                return False
+            self.in_flight += 1
+            return True
+    
+    def start(self):
+        """Block until a request slot is free and claim it."""
+        with self._slots:
+            while self.in_flight >= self.limit:
+                self._slots.wait()
+            self.in_flight += 1
+    
+    def reserve(self) -> float:
+        """
+        Take a token without blocking.
+        
+        Returns:
+            Seconds the caller must wait before sending the request
+        """
+        return self.bucket.reserve()
+    
+    def acquire(self):
+        """Block until a request may be sent: a slot is free and the rate allows it."""
+        self.start()
+        self.bucket.acquire()
+    
+    def release(self):
+        """Release a request slot without feedback, e.g. for a cancelled request."""
+        with self._slots:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._slots.notify_all()
+    
+    def finish(self, status_code: Optional[int], seconds: float,
+               retry_after: Optional[float] = None) -> Optional[str]:
+        """
+        Release the request slot and adapt to the outcome of the request.
+        
+        Args:
+            status_code: HTTP status code, or None if no response arrived
+            seconds: Response time in seconds
+            retry_after: Seconds asked for by a Retry-After header
+        
+        Returns:
+            Reason of the backoff if the controller backed off, otherwise None
+        """
+        failed = status_code is None or status_code == 429 or status_code >= 500
+        with self._slots:
+            try:
+                self.in_flight = max(0, self.in_flight - 1)
+                self.samples.append((seconds, failed))
+                if failed or retry_after:
+                    reason = 'no response' if status_code is None else f"HTTP {status_code}"
+                    reason = self._backoff(reason, seconds)
+                    if retry_after:
+                        self.bucket.pause(retry_after)
+                    return reason
+                if len(self.samples) >= MIN_SAMPLES:
+                    latencies = sorted(latency for latency, _ in self.samples)
+                    median = latencies[len(latencies) // 2]
+                    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+                    self.best_median = median if self.best_median is None else min(self.best_median, median)
+                    target = self.latency_target or max(MIN_SLOW_LATENCY, self.best_median * SLOW_LATENCY_FACTOR)
+                    if p95 > target:
+                        return self._backoff(f"p95 latency {p95:.2f}s", median)
+                
+                errors = sum(1 for _, error in self.samples if error)
+                if errors / len(self.samples) <= self.error_target:
+                    self._increase()
+                return None
+            finally:
+                self._slots.notify_all()
+    
+    def _backoff(self, reason: str, round_trip: float) -> Optional[str]:
+        now = time.monotonic()
+        # Responses already in flight report the same overload; back off once per round trip
+        if now - self.backoff_at < max(round_trip, 1.0 / self.bucket.rate):
+            return None
+        self.backoff_at = now
+        self.backoffs += 1
+        self.limit = max(1.0, self.limit * BACKOFF_FACTOR)
+        if not self.fixed_rate:
+            self.bucket.set_rate(max(self.min_rate, self.bucket.rate * BACKOFF_FACTOR))
+        # Judge the new settings on fresh responses
+        self.samples.clear()
+        return reason
+    
+    def _increase(self):
+        self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+        if not self.fixed_rate and self.bucket.rate < self.max_rate:
+            self.bucket.set_rate(min(self.max_rate, self.bucket.rate + self.rate_step))
+    
+    def snapshot(self) -> Dict:
+        """
+        Current state, for stats and reports.
+        
+        Returns:
+            Dictionary with rate, concurrency, in_flight, p95_latency,
+            error_rate and backoffs
+        """
+        with self._slots:
+            latencies = sorted(latency for latency, _ in self.samples)
+            errors = sum(1 for _, error in self.samples if error)
+            return {
+                'rate': round(self.bucket.rate, 3),
+                'concurrency': self.concurrency,
+                'in_flight': self.in_flight,
+                'p95_latency': (round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 4)
+                                if latencies else None),
+                'error_rate': round(errors / len(latencies), 4) if latencies else None,
+                'backoffs': self.backoffs,
+            }
+
+
+class HostRateLimiter:
+    """
+    Keeps one AdaptiveRateController per host so that concurrent workers stay
+    polite to every server individually instead of sharing one global sleep.
+    Each host's rate and concurrency start at the defaults and adapt to its
+    responses (see record_response), unless the host imposes a fixed rate.
+    """
+    
+    def __init__(self, rate: float, burst: Optional[float] = None, concurrency: int = 1,
+                 max_rate: Optional[float] = None, max_concurrency: Optional[int] = None,
+                 latency_target: Optional[float] = None):
+        """
+        Initialize the limiter.
+        
+        Args:
+            rate: Default requests per second allowed for each host
+            burst: Default burst size for each host
+            concurrency: Requests in flight allowed for each host at first
+            max_rate: Highest rate a host may grow to (defaults to rate)
+            max_concurrency: Most requests in flight a host may grow to
+                (defaults to concurrency)
+            latency_target: p95 latency target in seconds (None = adaptive)
+        """
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.max_rate = max_rate
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+        self.controllers: Dict[str, AdaptiveRateController] = {}
+        self._lock = threading.Lock()
+    
+    def controller_for(self, host: str) -> AdaptiveRateController:
+        """
+        Get (or create) the controller for a host.
+        
+        Args:
+            host: Hostname (netloc) of the target server
+        
+        Returns:
+            AdaptiveRateController for the host
+        """
+        with self._lock:
+            controller = self.controllers.get(host)
+            if controller is None:
+                controller = AdaptiveRateController(
+                    self.rate, self.concurrency, max_rate=self.max_rate,
+                    max_concurrency=self.max_concurrency, burst=self.burst,
+                    latency_target=self.latency_target)
+                self.controllers[host] = controller
+            return controller
+    
+    def bucket_for(self, host: str) -> TokenBucket:
+        """
+        Get (or create) the token bucket for a host.
+        
+        Args:
+            host: Hostname (netloc) of the target server
+        
+        Returns:
+            TokenBucket for the host
+        """
+        return self.controller_for(host).bucket
+    
+    def set_host_rate(self, host: str, rate: float, burst: Optional[float] = None,
+                      fixed: bool = False):
+        """
+        Override the request rate for a single host.
+        
+        Args:
+            host: Hostname (netloc) of the target server
+            rate: Requests per second allowed for the host
+            burst: Burst size for the host
+            fixed: Whether the rate is imposed by the host (e.g. robots.txt
+                Crawl-delay) and must not be adapted
+        """
+        self.controller_for(host).set_rate(rate, burst, fixed)
+    
+    def try_start(self, url: str) -> bool:
+        """
+        Claim a request slot on the URL's host without blocking.
+        
+        Args:
+            url: URL about to be requested
+        
+        Returns:
+            True if a slot was claimed (report the request with record_response)
+        """
+        return self.controller_for(urlparse(url).netloc).try_start()
+    
+    def reserve(self, url: str) -> float:
+        """
+        Reserve a request to the URL's host without blocking, e.g. for an
+        asyncio caller that sleeps on the event loop instead.
+        
+        Args:
+            url: URL about to be requested
+        
+        Returns:
+            Seconds the caller must wait before sending the request
+        """
+        return self.controller_for(urlparse(url).netloc).reserve()
+    
+    def acquire(self, url: str):
+        """
+        Block until a request to the URL's host is allowed. The request must
+        be reported with record_response.
+        
+        Args:
+            url: URL about to be requested
+        """
+        self.controller_for(urlparse(url).netloc).acquire()
+    
+    def record_response(self, url: str, status_code: Optional[int], seconds: float,
+                        retry_after: Optional[float] = None) -> Optional[str]:
+        """
+        Release the request slot and adapt the host's rate to the outcome.
+        
+        Args:
+            url: Requested URL
+            status_code: HTTP status code, or None if no response arrived
+            seconds: Response time in seconds
+            retry_after: Seconds asked for by a Retry-After header
+        
+        Returns:
+            Reason of the backoff if the host's rate was cut, otherwise None
+        """
+        return self.controller_for(urlparse(url).netloc).finish(status_code, seconds, retry_after)
+    
+    def release(self, url: str):
+        """
+        Release a request slot on the URL's host without feedback, e.g. when
+        the request was cancelled before it got an answer.
+        
+        Args:
+            url: URL whose request was abandoned
+        """
+        self.controller_for(urlparse(url).netloc).release()
+    
+    def host_rate(self, host: str) -> float:
+        """
+        Current request rate of a host.
+        
+        Args:
+            host: Hostname (netloc) of the target server
+        
+        Returns:
+            Requests per second
+        """
+        return self.controller_for(host).rate
+    
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Current state of every host's controller.
+        
+        Returns:
+            Dictionary of host -> AdaptiveRateController.snapshot()
+        """
+        with self._lock:
+            controllers = dict(self.controllers)
+        return {host: controller.snapshot() for host, controller in sorted(controllers.items())}
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Robots.txt Cache
+Fetches and caches robots.txt per host so crawlers can honour Disallow rules,
+Crawl-delay and the sitemaps a site lists, without requesting robots.txt
+again for every URL.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+
+# Seconds a fetched robots.txt is trusted before it is fetched again
+ROBOTS_TTL = 3600.0
+
+# Seconds before retrying a robots.txt that could not be fetched
+ROBOTS_RETRY_TTL = 300.0
+
+
+class RobotsCache:
+    """
+    Thread-safe per-host cache of parsed robots.txt files.
+    
+    A missing robots.txt (4xx) allows everything. An unreachable one (5xx,
+    network error) also allows everything but is retried after
+    ROBOTS_RETRY_TTL, so a transient outage does not drop pages from a crawl.
+    """
+    
+    def __init__(self, fetch: Callable[[str], Tuple[Optional[int], str]], user_agent: str,
+                 ttl: float = ROBOTS_TTL,
+                 on_load: Optional[Callable[[str, RobotFileParser], None]] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            fetch: Downloads a robots.txt URL, returning (status code, text);
+                the status is None when the server could not be reached
+            user_agent: User agent matched against the robots.txt groups
+            ttl: Seconds a fetched robots.txt is cached
+            on_load: Called with (origin, rules) whenever a host's rules are
+                (re)loaded, e.g. to apply its Crawl-delay
+        """
+        self.fetch = fetch
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.on_load = on_load
+        self.rules: Dict[str, Tuple[RobotFileParser, float]] = {}
+        self._lock = threading.Lock()
+        self._host_locks: Dict[str, threading.Lock] = {}
+    
+    @staticmethod
+    def origin(url: str) -> str:
+        """Scheme and host of a URL, e.g. https://docs.example.com."""
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+    
+    def is_fresh(self, url: str) -> bool:
+        """Whether the rules for the URL's host are cached and not expired."""
+        with self._lock:
+            cached = self.rules.get(self.origin(url))
+        return cached is not None and cached[1] > time.monotonic()
+    
+    def cached(self, url: str) -> Optional[RobotFileParser]:
+        """The cached rules for the URL's host, even if expired; never fetches."""
+        with self._lock:
+            cached = self.rules.get(self.origin(url))
+        return cached[0] if cached is not None else None
+    
+    def rules_for(self, url: str) -> RobotFileParser:
+        """
+        Get the rules for the URL's host, fetching robots.txt if needed.
+        
+        Args:
+            url: Any URL on the host
+        
+        Returns:
+            Parsed robots.txt
+        """
+        origin = self.origin(url)
+        with self._lock:
+            cached = self.rules.get(origin)
+            if cached is not None and cached[1] > time.monotonic():
+                return cached[0]
+            host_lock = self._host_locks.setdefault(origin, threading.Lock())
+        
+        # One fetch per host; other threads wait for its result
+        with host_lock:
+            with self._lock:
+                cached = self.rules.get(origin)
+            if cached is not None and cached[1] > time.monotonic():
+                return cached[0]
+            status, text = self.fetch(f"{origin}/robots.txt")
+            return self.store(origin, status, text)
+    
+    def store(self, url: str, status: Optional[int], text: str) -> RobotFileParser:
+        """
+        Parse and cache a downloaded robots.txt.
+        
+        Args:
+            url: Any URL on the host
+            status: HTTP status code, or None if the server could not be reached
+            text: Content of robots.txt
+        
+        Returns:
+            Parsed robots.txt
+        """
+        origin = self.origin(url)
+        rules = RobotFileParser(f"{origin}/robots.txt")
+        ttl = self.ttl
+        if status is not None and 200 <= status < 300:
+            rules.parse(text.splitlines())
+        else:
+            rules.allow_all = True
+            if status is None or status >= 500:
+                ttl = min(ttl, ROBOTS_RETRY_TTL)
+        
+        with self._lock:
+            self.rules[origin] = (rules, time.monotonic() + ttl)
+        if self.on_load:
+            self.on_load(origin, rules)
+        return rules
+    
+    def allowed(self, url: str) -> bool:
+        """
+        Check the URL against its host's Disallow rules.
+        
+        Args:
+            url: URL to check
+        
+        Returns:
+            True if the URL may be crawled
+        """
+        return self.rules_for(url).can_fetch(self.user_agent, url)
+    
+    def crawl_delay(self, url: str) -> Optional[float]:
+        """
+        Seconds between requests asked for by the host (Crawl-delay, or
+        Request-rate converted to a delay).
+        
+        Args:
+            url: Any URL on the host
+        
+        Returns:
+            Delay in seconds, or None if robots.txt does not set one
+        """
+        return rules_crawl_delay(self.rules_for(url), self.user_agent)
+    
+    def sitemaps(self, url: str) -> List[str]:
+        """
+        Sitemaps listed in the host's robots.txt.
+        
+        Args:
+            url: Any URL on the host
+        
+        Returns:
+            Sitemap URLs
+        """
+        return self.rules_for(url).site_maps() or []
+
+
+def rules_crawl_delay(rules: RobotFileParser, user_agent: str) -> Optional[float]:
+    """
+    Crawl delay of parsed robots.txt rules.
+    
+    Args:
+        rules: Parsed robots.txt
+        user_agent: User agent whose group is read
+    
+    Returns:
+        Delay in seconds, or None if the rules do not set a positive one
+    """
+    delay = rules.crawl_delay(user_agent)
+    if delay is None:
+        rate = rules.request_rate(user_agent)
+        if rate is not None and rate.requests > 0:
+            delay = rate.seconds / rate.requests
+    if delay is None or float(delay) <= 0:
+        return None
+    return float(delay)
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Safe API Client
+Shared client for the Safe Transaction Service used by the API scripts: one
+pooled keep-alive session, request timeouts, retries with exponential
+backoff (honouring Retry-After), adaptive client-side rate control and a
+TTL cache for per-Safe lookups.
+"""
+
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from rate_limiter import AdaptiveRateController, retry_after_seconds
+from ttl_cache import TTLCache
+
+
+# Safe Transaction Service Base URL
+BASE_URL = "https://api.safe.global/tx-service"
+
+# (connect, read) timeout in seconds for every request
+DEFAULT_TIMEOUT = (5, 30)
+
+# Requests per second allowed by the API key, overridable with SAFE_API_RATE_LIMIT
+DEFAULT_REQUESTS_PER_SECOND = 5.0
+
+# Responses worth retrying; only 429 is retried for non-idempotent requests,
+# since the service rejected those before processing them
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+# Results requested per page when walking a paginated endpoint
+PAGE_SIZE = 100
+
+# Per-Safe endpoints served through the cache: name -> (path, TTL in seconds).
+# Safe info (owners, threshold, nonce) rarely changes and is the most
+# requested call; balances move more often.
+CACHED_ENDPOINTS = {
+    'safe': ('safes/{address}/', 300.0),
+    'balances': ('safes/{address}/balances/', 30.0),
+}
+
+
+class SafeApiClient:
+    """
+    Thread-safe client for the Safe Transaction Service.
+    
+    Methods return the final requests.Response so callers keep their own
+    status code handling; connection errors still raise once retries are
+    exhausted.
+    """
+    
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 timeout: Union[float, tuple] = DEFAULT_TIMEOUT, max_retries: int = 3,
+                 backoff_factor: float = 0.5, max_backoff: float = 30.0,
+                 requests_per_second: Optional[float] = None,
+                 burst: Optional[float] = None, pool_size: int = 10):
+        """
+        Initialize the client.
+        
+        Args:
+            api_key: Safe API key (defaults to SAFE_API_KEY from the environment)
+            base_url: Transaction Service base URL (defaults to SAFE_API_BASE_URL
+                from the environment, e.g. a local mock_safe_service.py, or BASE_URL)
+            timeout: Request timeout in seconds, or a (connect, read) tuple
+            max_retries: Retries after the first attempt (0 disables retrying)
+            backoff_factor: First backoff delay in seconds, doubled on each retry
+            max_backoff: Upper bound for a single backoff or Retry-After wait
+            requests_per_second: Rate allowed by the API key (defaults to
+                SAFE_API_RATE_LIMIT or DEFAULT_REQUESTS_PER_SECOND; 0 disables
+                limiting). The adaptive rate control backs off below it on
+                429/5xx responses and latency spikes, and never exceeds it
+            burst: Requests allowed at once before the rate applies
+            pool_size: Keep-alive connections kept open for concurrent callers,
+                and the most requests the rate control lets into flight
+        """
+        self.api_key = api_key if api_key is not None else os.getenv('SAFE_API_KEY')
+        self.base_url = (base_url or os.getenv('SAFE_API_BASE_URL') or BASE_URL).rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max(0, max_retries)
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        
+        if requests_per_second is None:
+            requests_per_second = float(os.getenv('SAFE_API_RATE_LIMIT', DEFAULT_REQUESTS_PER_SECOND))
+        self.limiter: Optional[AdaptiveRateController] = None
+        if requests_per_second > 0:
+            self.limiter = AdaptiveRateController(requests_per_second, concurrency=pool_size,
+                                                  burst=burst)
+        
+        self.cache = TTLCache()
+        
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+        if self.api_key:
+            self.session.headers["Authorization"] = f"Bearer {self.api_key}"
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def close(self):
+        """Close the pooled connections."""
+        self.session.close()
+    
+    def url(self, chain: str, path: str) -> str:
+        """
+        Build an API URL.
+        
+        Args:
+            chain: Chain identifier (e.g., 'eth', 'sep', 'matic')
+            path: Path below /api/v1/ (e.g., 'safes/0x.../')
+        
+        Returns:
+            Absolute URL
+        """
+        return f"{self.base_url}/{chain}/api/v1/{path.lstrip('/')}"
+    
+    def retry_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """
+        Compute how long to wait before retrying.
+        
+        Args:
+            attempt: Number of the failed attempt (0 for the first request)
+            response: Failed response, if the server answered
+        
+        Returns:
+            Retry-After when the server sent one, else exponential backoff with jitter
+        """
+        if response is not None:
+            retry_after = retry_after_seconds(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        backoff = min(self.backoff_factor * (2 ** attempt), self.max_backoff)
+        return random.uniform(backoff / 2, backoff)
+    
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request with rate limiting, timeouts and retries.
+        
+        Args:
+            method: HTTP method
+            url: Absolute URL (see url())
+            **kwargs: Passed to requests.Session.request
+        
+        Returns:
+            Final response (may have an error status)
+        
+        Raises:
+            requests.exceptions.RequestException: If the request still fails
+                to complete after all retries
+        """
+        method = method.upper()
+        kwargs.setdefault('timeout', self.timeout)
+        idempotent = method in IDEMPOTENT_METHODS
+        
+        attempt = 0
+        while True:
+            try:
+                response = self.send(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+                time.sleep(self.retry_delay(attempt))
+            else:
+                retryable = response.status_code == 429 or (
+                    idempotent and response.status_code in RETRY_STATUSES)
+                if not retryable or attempt >= self.max_retries:
+                    return response
+                time.sleep(self.retry_delay(attempt, response))
+            attempt += 1
+    
+    def send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a single attempt through the adaptive rate control, which waits
+        for a request slot and the rate, and adapts to the outcome.
+        
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            **kwargs: Passed to requests.Session.request
+        
+        Returns:
+            Response
+        """
+        if not self.limiter:
+            return self.session.request(method, url, **kwargs)
+        
+        self.limiter.acquire()
+        started = time.monotonic()
+        response = None
+        try:
+            response = self.session.request(method, url, **kwargs)
+            return response
+        finally:
+            if response is None:
+                self.limiter.finish(None, time.monotonic() - started)
+            else:
+                # Pause no longer than request() waits for the same header
+                retry_after = retry_after_seconds(response.headers.get('Retry-After'))
+                if retry_after is not None:
+                    retry_after = min(retry_after, self.max_backoff)
+                self.limiter.finish(response.status_code, time.monotonic() - started, retry_after)
+    
+    def get(self, chain: str, path: str, params: Optional[Dict] = None, **kwargs) -> requests.Response:
+        """
+        GET an API endpoint.
+        
+        Args:
+            chain: Chain identifier
+            path: Path below /api/v1/
+            params: Query parameters
+        
+        Returns:
+            Final response
+        """
+        return self.request('GET', self.url(chain, path), params=params, **kwargs)
+    
+    def post(self, chain: str, path: str, json: Optional[Dict] = None, **kwargs) -> requests.Response:
+        """
+        POST a JSON payload to an API endpoint.
+        
+        Args:
+            chain: Chain identifier
+            path: Path below /api/v1/
+            json: JSON body
+        
+        Returns:
+            Final response
+        """
+        return self.request('POST', self.url(chain, path), json=json, **kwargs)
+    
+    def get_cached(self, chain: str, address: str, endpoint: str = 'safe') -> requests.Response:
+        """
+        GET a per-Safe endpoint through the TTL cache. Successful responses
+        are cached for the endpoint's TTL; concurrent identical lookups share
+        one request.
+        
+        Args:
+            chain: Chain identifier
+            address: Safe address
+            endpoint: Name in CACHED_ENDPOINTS ('safe' or 'balances')
+        
+        Returns:
+            Cached or fresh response
+        """
+        path, ttl = CACHED_ENDPOINTS[endpoint]
+        key = (chain.lower(), address.lower(), endpoint)
+        return self.cache.get_or_load(
+            key, lambda: self.get(chain, path.format(address=address)), ttl,
+            cache_if=lambda response: response.status_code == 200)
+    
+    def invalidate(self, chain: str, address: str, endpoint: Optional[str] = None):
+        """
+        Drop cached lookups for a Safe, e.g. after proposing a transaction.
+        
+        Args:
+            chain: Chain identifier
+            address: Safe address
+            endpoint: Endpoint to drop (None = all endpoints of the Safe)
+        """
+        chain, address = chain.lower(), address.lower()
+        self.cache.invalidate(lambda key: key[0] == chain and key[1] == address
+                              and (endpoint is None or key[2] == endpoint))
+    
+    def fetch_page(self, url: str, params: Optional[Dict] = None) -> Dict:
+        """
+        Fetch one page of a paginated endpoint.
+        
+        Args:
+            url: Absolute page URL (a 'next' link already carries its query)
+            params: Query parameters for the first page
+        
+        Returns:
+            Page dictionary with 'count', 'next', 'previous' and 'results'
+        
+        Raises:
+            requests.exceptions.RequestException: If the page cannot be fetched
+        """
+        response = self.request('GET', url, params=params)
+        response.raise_for_status()
+        return response.json()
+    
+    def iter_pages(self, chain: str, path: str, params: Optional[Dict] = None,
+                   prefetch: bool = False) -> Iterator[Dict]:
+        """
+        Walk a paginated endpoint page by page, following 'next' links.
+        
+        Args:
+            chain: Chain identifier
+            path: Path below /api/v1/
+            params: Query parameters (filters, ordering); 'limit' defaults to PAGE_SIZE
+            prefetch: Whether to fetch the next page in the background while
+                the caller processes the current one
+        
+        Yields:
+            Page dictionaries
+        
+        Raises:
+            requests.exceptions.RequestException: If a page cannot be fetched
+        """
+        params = dict(params or {})
+        params.setdefault('limit', PAGE_SIZE)
+        url = self.url(chain, path)
+        
+        if not prefetch:
+            while url:
+                page = self.fetch_page(url, params)
+                yield page
+                url, params = page.get('next'), None
+            return
+        
+        # At most one page is in flight ahead of the caller
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self.fetch_page, url, params)
+            while future:
+                page = future.result()
+                next_url = page.get('next')
+                future = executor.submit(self.fetch_page, next_url) if next_url else None
+                yield page
+    
+    def iter_results(self, chain: str, path: str, params: Optional[Dict] = None,
+                     prefetch: bool = False, max_items: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Stream the results of a paginated endpoint across all of its pages.
+        Only the current (and prefetched) page is held in memory.
+        
+        Args:
+            chain: Chain identifier
+            path: Path below /api/v1/
+            params: Query parameters (filters, ordering)
+            prefetch: Whether to fetch the next page while results are consumed
+            max_items: Stop after this many results (None = all)
+        
+        Yields:
+            Result dictionaries in API order
+        """
+        params = dict(params or {})
+        if max_items is not None:
+            params.setdefault('limit', min(max_items, PAGE_SIZE) or 1)
+        results = (result for page in self.iter_pages(chain, path, params, prefetch)
+                   for result in page.get('results', []))
+        if max_items is not None:
+            results = islice(results, max_items)
+        yield from results
+
+
+_default_client: Optional[SafeApiClient] = None
+
+
+def get_client() -> SafeApiClient:
+    """
+    Get the process-wide client, created on first use from the environment.
+    
+    Returns:
+        Shared SafeApiClient
+    """
+    global _default_client
+    if _default_client is None:
+        _default_client = SafeApiClient()
+    return _default_client
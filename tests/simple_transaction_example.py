@@ -5,10 +5,11 @@ A minimal example to create a Safe wallet transaction using the API key from .en
 """
 
 import os
-import requests
 import json
 from dotenv import load_dotenv
 
+from safe_api_client import get_client
+
 # Load API key from .env file
 load_dotenv()
 SAFE_API_KEY = os.getenv('SAFE_API_KEY')
@@ -18,6 +19,8 @@ if not SAFE_API_KEY:
 
 print(f"✅ Loaded API key: {SAFE_API_KEY[:30]}...\n")
 
+CLIENT = get_client()
+
 
 def create_safe_transaction(
     chain: str,
@@ -40,16 +43,8 @@ def create_safe_transaction(
         Transaction data as dictionary
     """
     
-    url = f"https://api.safe.global/tx-service/{chain}/api/v1/safes/{safe_address}/multisig-transactions/"
-    
-    headers = {
-        "Authorization": f"Bearer {SAFE_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    
-    # Get current nonce
-    safe_info_url = f"https://api.safe.global/tx-service/{chain}/api/v1/safes/{safe_address}/"
-    safe_info_response = requests.get(safe_info_url, headers=headers)
+    # Get current nonce, bypassing the cache so it is never stale
+    safe_info_response = CLIENT.get(chain, f"safes/{safe_address}/")
     
     if safe_info_response.status_code == 200:
         nonce = safe_info_response.json().get('nonce', 0)
@@ -80,10 +75,11 @@ def create_safe_transaction(
     print(f"Value: {value} wei\n")
     
     # Send the transaction
-    response = requests.post(url, headers=headers, json=transaction_data)
+    response = CLIENT.post(chain, f"safes/{safe_address}/multisig-transactions/", json=transaction_data)
     
     if response.status_code == 201:
         print("✅ Transaction created successfully!\n")
+        CLIENT.invalidate(chain, safe_address)
         result = response.json()
         print("📦 Transaction Data:")
         print(json.dumps(result, indent=2))
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Sitemap Reader
+Streaming sitemap parser shared by the crawlers. Sitemaps are read with
+iterparse and every finished entry is cleared, so memory stays flat even for
+50,000-URL sitemaps; entries come out as compact SitemapEntry records.
+Gzip-compressed sitemaps (.xml.gz) are detected by their magic bytes and
+decompressed on the fly.
+"""
+
+import gzip
+import io
+import xml.etree.ElementTree as ET
+from typing import BinaryIO, Callable, Dict, Iterator, Optional, Set, Union
+
+import requests
+
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Child elements read from each <url> and <sitemap> entry
+ENTRY_FIELDS = ('url', 'lastmod', 'priority')
+
+
+class SitemapEntry:
+    """
+    One <url> entry of a sitemap or <sitemap> entry of a sitemap index.
+    
+    Uses __slots__ instead of a per-entry dict, but reads like the
+    dictionaries the crawlers used before (entry['lastmod'],
+    entry.get('priority')), so it can be passed wherever sitemap data is.
+    """
+    
+    __slots__ = ('url', 'lastmod', 'priority', 'is_index')
+    
+    def __init__(self, url: str, lastmod: str = '', priority: str = '', is_index: bool = False):
+        self.url = url
+        self.lastmod = lastmod
+        self.priority = priority
+        self.is_index = is_index
+    
+    def __getitem__(self, key: str) -> str:
+        if key not in ENTRY_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in ENTRY_FIELDS else default
+    
+    def to_dict(self) -> Dict[str, str]:
+        """Plain dictionary for JSON output."""
+        return {'url': self.url, 'lastmod': self.lastmod, 'priority': self.priority}
+    
+    def __repr__(self) -> str:
+        kind = 'sitemap' if self.is_index else 'url'
+        return f"SitemapEntry({kind}={self.url!r}, lastmod={self.lastmod!r}, priority={self.priority!r})"
+
+
+def open_sitemap(source: Union[str, bytes]) -> BinaryIO:
+    """
+    Open a sitemap for reading, decompressing gzip transparently.
+    
+    Args:
+        source: Path of a local sitemap file or the downloaded document
+    
+    Returns:
+        Binary stream of the sitemap XML (close it when done)
+    """
+    if isinstance(source, bytes):
+        if source.startswith(GZIP_MAGIC):
+            return gzip.GzipFile(fileobj=io.BytesIO(source))
+        return io.BytesIO(source)
+    
+    stream = open(source, 'rb')
+    if stream.peek(2)[:2] == GZIP_MAGIC:
+        # GzipFile does not close a file object it was given
+        stream.close()
+        return gzip.open(source, 'rb')
+    return stream
+
+
+def local_name(tag: str) -> str:
+    """Tag name without its namespace."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def iter_sitemap_entries(stream: BinaryIO) -> Iterator[SitemapEntry]:
+    """
+    Read a sitemap or sitemap index entry by entry.
+    
+    Args:
+        stream: Binary stream of the sitemap XML
+    
+    Yields:
+        SitemapEntry per <url> (page) or <sitemap> (sub-sitemap, is_index set)
+    """
+    loc = lastmod = priority = ''
+    depth = 0
+    root = None
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = elem
+            depth += 1
+            continue
+        
+        depth -= 1
+        if depth == 2:
+            name = local_name(elem.tag)
+            if name == 'loc':
+                loc = (elem.text or '').strip()
+            elif name == 'lastmod':
+                lastmod = (elem.text or '').strip()
+            elif name == 'priority':
+                priority = (elem.text or '').strip()
+        elif depth == 1:
+            name = local_name(elem.tag)
+            if loc and name in ('url', 'sitemap'):
+                yield SitemapEntry(loc, lastmod, priority, is_index=name == 'sitemap')
+            loc = lastmod = priority = ''
+            # Drop the finished entry so the tree never grows
+            root.clear()
+
+
+def download_sitemap(url: str) -> bytes:
+    """
+    Download a remote sitemap.
+    
+    Args:
+        url: Sitemap URL
+    
+    Returns:
+        Document bytes (possibly gzip-compressed)
+    """
+    response = requests.get(url, timeout=30)
+    response.raise_for_status()
+    return response.content
+
+
+def iter_sitemap_urls(source: Union[str, bytes], fetch: Optional[Callable[[str], bytes]] = download_sitemap,
+                      seen: Optional[Set[str]] = None) -> Iterator[SitemapEntry]:
+    """
+    Stream the page entries of a sitemap, following sitemap indexes.
+    Sub-sitemaps that fail to download or parse are reported and skipped.
+    
+    Args:
+        source: Path of a local sitemap, sitemap URL, or downloaded document
+        fetch: Downloads remote sitemaps (None skips remote sub-sitemaps)
+        seen: Sitemaps already read, to break index cycles
+    
+    Yields:
+        SitemapEntry per page, in sitemap order
+    
+    Raises:
+        Exception: If the top-level sitemap cannot be downloaded or parsed
+    """
+    seen = seen if seen is not None else set()
+    if isinstance(source, str) and source.startswith(('http://', 'https://')):
+        if fetch is None:
+            return
+        source = fetch(source)
+    
+    sub_sitemaps = []
+    with open_sitemap(source) as stream:
+        for entry in iter_sitemap_entries(stream):
+            if entry.is_index:
+                sub_sitemaps.append(entry.url)
+            else:
+                yield entry
+    
+    for sub_sitemap in sub_sitemaps:
+        if sub_sitemap not in seen:
+            seen.add(sub_sitemap)
+            try:
+                yield from iter_sitemap_urls(sub_sitemap, fetch, seen)
+            except Exception as e:
+                print(f"  ✗ Failed to parse sitemap {sub_sitemap}: {e}")
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Parser Parity Check
+Runs the crawler's extraction with two HTML parser backends on the same pages
+and reports any difference in the JSON page data or the markdown output.
+Pages come from the sitemap (fetched live), local HTML files (--html-dir) or
+the offline fixture site (--fixture-pages).
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from crawler import SafeDocsCrawler
+from fixture_site import DEFAULT_SITEMAP, FixtureSite
+from html_parsers import DEFAULT_PARSER, PARSER_BACKENDS, parse_html, resolve_parser
+
+
+def comparable_page(page_data: Dict) -> Dict:
+    """
+    Drop the fields that legitimately differ between two extractions.
+    
+    Args:
+        page_data: Page data from extract_page
+    
+    Returns:
+        Copy of the page data without timestamps, with sorted languages
+    """
+    page = dict(page_data)
+    page.pop('crawled_at', None)
+    page['code_languages'] = sorted(page['code_languages'])
+    return page
+
+
+def extract_with(crawler: SafeDocsCrawler, content: bytes, url: str,
+                 sitemap_data: Optional[Dict]) -> Tuple[Dict, List[str], str]:
+    """
+    Parse and extract one page with the crawler's parser backend.
+    
+    Args:
+        crawler: Crawler configured with the backend under test
+        content: Raw HTML
+        url: Page URL
+        sitemap_data: Sitemap entry for the page
+    
+    Returns:
+        Tuple of (comparable page data, navigation links, markdown)
+    """
+    soup = parse_html(content, crawler.parser)
+    page_data, nav_links = crawler.extract_page(soup, url, None, 0, sitemap_data)
+    markdown = (crawler.output_dir / page_data['filename']).read_text(encoding='utf-8')
+    return comparable_page(page_data), nav_links, markdown
+
+
+def describe_difference(baseline: Tuple, candidate: Tuple) -> List[str]:
+    """
+    List which outputs differ between two extractions.
+    
+    Returns:
+        Human-readable differences (empty if the outputs match)
+    """
+    differences = []
+    base_page, base_nav, base_md = baseline
+    cand_page, cand_nav, cand_md = candidate
+    for key in base_page:
+        if base_page[key] != cand_page.get(key):
+            differences.append(f"page_data['{key}']")
+    if base_nav != cand_nav:
+        differences.append('navigation links')
+    if base_md != cand_md:
+        differences.append(f"markdown ({len(base_md)} vs {len(cand_md)} chars)")
+    return differences
+
+
+def load_pages(args, crawler: SafeDocsCrawler) -> List[Tuple[str, Optional[Dict], bytes]]:
+    """
+    Load the pages to compare, from local HTML files, the fixture site or by
+    fetching the sitemap URLs.
+    
+    Returns:
+        List of (url, sitemap data, raw HTML) tuples
+    """
+    pages = []
+    if args.fixture_pages:
+        site = FixtureSite(pages=args.fixture_pages, sitemap_path=Path(args.sitemap))
+        for number, entry in enumerate(site.entries[:args.limit]):
+            pages.append((f"https://{args.base_domain}{entry['path']}", None, site.render(number)))
+        return pages
+    
+    if args.html_dir:
+        for path in sorted(Path(args.html_dir).rglob('*.html'))[:args.limit]:
+            url = f"https://{args.base_domain}/{path.relative_to(args.html_dir).as_posix()}"
+            pages.append((url, None, path.read_bytes()))
+        return pages
+    
+    for url_data in crawler.parse_sitemap(args.sitemap)[:args.limit]:
+        url = crawler.normalize_url(url_data['url'])
+        _, response = crawler.fetch_page(url)
+        if response is not None:
+            pages.append((url, url_data, response.content))
+    return pages
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Check that a parser backend produces the same crawl output as the baseline'
+    )
+    parser.add_argument(
+        '--sitemap',
+        default=str(DEFAULT_SITEMAP),
+        help='Sitemap whose pages are compared (default: data/safe-sitemap.xml in the repository)'
+    )
+    parser.add_argument(
+        '--html-dir',
+        help='Compare local .html files instead of fetching the sitemap pages'
+    )
+    parser.add_argument(
+        '--fixture-pages',
+        type=int,
+        help='Compare N pages of the synthetic fixture site (fixture_site.py) offline instead'
+    )
+    parser.add_argument(
+        '--parser',
+        default='lxml',
+        choices=['auto'] + PARSER_BACKENDS,
+        help='Parser backend under test (default: lxml)'
+    )
+    parser.add_argument(
+        '--baseline',
+        default=DEFAULT_PARSER,
+        choices=PARSER_BACKENDS,
+        help=f'Reference parser backend (default: {DEFAULT_PARSER})'
+    )
+    parser.add_argument(
+        '--base-domain',
+        default='docs.safe.global',
+        help='Base domain used to classify internal links'
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=None,
+        help='Only compare the first N pages'
+    )
+    
+    args = parser.parse_args()
+    candidate_parser = resolve_parser(args.parser)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = SafeDocsCrawler(args.sitemap, str(Path(tmp) / 'baseline'),
+                                   base_domain=args.base_domain, parser=args.baseline)
+        candidate = SafeDocsCrawler(args.sitemap, str(Path(tmp) / 'candidate'),
+                                    base_domain=args.base_domain, parser=candidate_parser)
+        for crawler in (baseline, candidate):
+            crawler.output_dir.mkdir(parents=True)
+        
+        pages = load_pages(args, baseline)
+        print(f"🔍 Comparing {args.baseline} and {candidate_parser} on {len(pages)} pages\n")
+        
+        mismatches = 0
+        for url, sitemap_data, content in pages:
+            differences = describe_difference(
+                extract_with(baseline, content, url, sitemap_data),
+                extract_with(candidate, content, url, sitemap_data),
+            )
+            if differences:
+                mismatches += 1
+                print(f"  ✗ {url}")
+                for difference in differences:
+                    print(f"      - {difference}")
+    
+    print("\n" + "="*60)
+    print(f"✓ Identical: {len(pages) - mismatches}")
+    print(f"✗ Different: {mismatches}")
+    print("="*60)
+    
+    if not pages:
+        print("❌ No pages were compared, check --sitemap, --html-dir or --fixture-pages")
+    sys.exit(1 if mismatches or not pages else 0)
+
+
+if __name__ == '__main__':
+    main()
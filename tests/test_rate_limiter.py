@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter Check
+Exercises the token bucket and the AIMD controller arithmetic: Retry-After
+pauses, backoff and recovery steps, slot accounting and the latency target.
+Runs in a few seconds without a network.
+"""
+
+import sys
+import time
+from typing import List
+
+from rate_limiter import (BACKOFF_FACTOR, MIN_SAMPLES, AdaptiveRateController,
+                          HostRateLimiter, TokenBucket, retry_after_seconds)
+
+
+def check_retry_after_pause() -> List[str]:
+    """A Retry-After pause lasts as asked, whatever the rate does afterwards."""
+    errors = []
+    controller = AdaptiveRateController(10, 1, burst=1)
+    controller.start()
+    controller.finish(429, 0.05, retry_after=2.0)
+    wait = controller.reserve()
+    if not 1.9 <= wait <= 2.05:
+        errors.append(f"reserve() after Retry-After 2s waits {wait:.2f}s")
+    if controller.rate != 10 * BACKOFF_FACTOR:
+        errors.append(f"rate after a 429 is {controller.rate}, expected {10 * BACKOFF_FACTOR}")
+    
+    bucket = TokenBucket(10, 1)
+    bucket.pause(1.0)
+    bucket.set_rate(1)
+    wait = bucket.reserve()
+    if not 0.9 <= wait <= 1.05:
+        errors.append(f"pause of 1s stretched to {wait:.2f}s by a rate change")
+    if bucket.try_acquire():
+        errors.append("try_acquire() succeeded while the bucket was paused")
+    return errors
+
+
+def check_backoff_and_recovery() -> List[str]:
+    """Backoff halves rate and concurrency once per round trip; recovery is additive."""
+    errors = []
+    controller = AdaptiveRateController(10, concurrency=4, max_rate=20, max_concurrency=8)
+    if controller.finish(503, 0.01) != 'HTTP 503':
+        errors.append("a 503 did not back off")
+    if controller.finish(503, 0.01) is not None:
+        errors.append("a second 503 in the same round trip backed off again")
+    if (controller.rate, controller.concurrency) != (5.0, 2):
+        errors.append(f"after one backoff: {controller.rate} req/s, {controller.concurrency} in flight")
+    
+    # The second 503 stays in the window until the error rate is under target again
+    for _ in range(3 * MIN_SAMPLES):
+        controller.start()
+        controller.finish(200, 0.01)
+    if not controller.rate > 5.0 or not controller.concurrency > 2:
+        errors.append(f"no recovery after healthy responses: {controller.snapshot()}")
+    
+    for _ in range(500):
+        controller.start()
+        controller.finish(200, 0.01)
+    if (controller.rate, controller.concurrency) != (20.0, 8):
+        errors.append(f"growth not capped at the maximums: {controller.snapshot()}")
+    if controller.in_flight != 0:
+        errors.append(f"{controller.in_flight} slots still held after every request finished")
+    return errors
+
+
+def check_latency_target() -> List[str]:
+    """A p95 latency above the target backs off, one below it does not."""
+    errors = []
+    controller = AdaptiveRateController(10, concurrency=2, latency_target=0.5)
+    reasons = [controller.finish(200, 0.1) for _ in range(MIN_SAMPLES)]
+    if any(reasons):
+        errors.append(f"backed off under the latency target: {reasons}")
+    reasons = [controller.finish(200, 2.0) for _ in range(MIN_SAMPLES)]
+    if not any(reason and reason.startswith('p95 latency') for reason in reasons):
+        errors.append("no backoff with p95 latency four times the target")
+    return errors
+
+
+def check_slots() -> List[str]:
+    """Request slots are limited per host and released by finish()."""
+    errors = []
+    limiter = HostRateLimiter(100, concurrency=1)
+    if not limiter.try_start('http://a.example/1'):
+        errors.append("first slot on a host was refused")
+    if limiter.try_start('http://a.example/2'):
+        errors.append("second slot granted above the concurrency limit")
+    if not limiter.try_start('http://b.example/1'):
+        errors.append("a busy host blocked another host")
+    limiter.record_response('http://a.example/1', 200, 0.01)
+    if not limiter.try_start('http://a.example/2'):
+        errors.append("slot not released by record_response")
+    
+    limiter.set_host_rate('c.example', 1, burst=1, fixed=True)
+    limiter.record_response('http://c.example/1', 429, 0.01)
+    if limiter.host_rate('c.example') != 1:
+        errors.append("a fixed (Crawl-delay) rate was backed off")
+    return errors
+
+
+def check_retry_after_parsing() -> List[str]:
+    """Retry-After accepts seconds and HTTP dates."""
+    errors = []
+    for value, expected in (('3', 3.0), ('1.5', 1.5), ('soon', None), (None, None)):
+        if retry_after_seconds(value) != expected:
+            errors.append(f"Retry-After {value!r} parsed as {retry_after_seconds(value)!r}")
+    if not retry_after_seconds('Wed, 21 Oct 2099 07:28:00 GMT'):
+        errors.append("Retry-After HTTP date not parsed")
+    return errors
+
+
+def main():
+    checks = [check_retry_after_pause, check_backoff_and_recovery, check_latency_target,
+              check_slots, check_retry_after_parsing]
+    started = time.monotonic()
+    failures = 0
+    for check in checks:
+        errors = check()
+        failures += bool(errors)
+        print(f"{'❌' if errors else '✅'} {check.__doc__}")
+        for error in errors:
+            print(f"   {error}")
+    
+    print(f"\n{len(checks) - failures}/{len(checks)} checks passed in {time.monotonic() - started:.1f}s")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
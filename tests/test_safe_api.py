@@ -9,6 +9,9 @@ import os
 import requests
 from dotenv import load_dotenv
 import json
+from typing import Optional
+
+from safe_api_client import get_client
 
 # Load API key
 load_dotenv()
@@ -19,11 +22,7 @@ if not SAFE_API_KEY:
 
 print(f"✅ Loaded API key: {SAFE_API_KEY[:30]}...\n")
 
-BASE_URL = "https://api.safe.global/tx-service"
-HEADERS = {
-    "Authorization": f"Bearer {SAFE_API_KEY}",
-    "Content-Type": "application/json"
-}
+CLIENT = get_client()
 
 
 def test_api_connectivity():
@@ -34,9 +33,7 @@ def test_api_connectivity():
     
     # Test with a known public Safe on Ethereum mainnet
     test_safe = "0x5298a93734c3d979ef1f23f78ebb871879a21f22"
-    url = f"{BASE_URL}/eth/api/v1/safes/{test_safe}/"
-    
-    response = requests.get(url, headers=HEADERS)
+    response = CLIENT.get_cached("eth", test_safe)
     
     if response.status_code == 200:
         print("✅ API Key is valid and working!\n")
@@ -55,9 +52,7 @@ def get_safe_info(chain: str, safe_address: str):
     print(f"Chain: {chain}")
     print(f"Safe Address: {safe_address}\n")
     
-    url = f"{BASE_URL}/{chain}/api/v1/safes/{safe_address}/"
-    
-    response = requests.get(url, headers=HEADERS)
+    response = CLIENT.get_cached(chain, safe_address)
     
     if response.status_code == 200:
         data = response.json()
@@ -86,41 +81,39 @@ def get_safe_info(chain: str, safe_address: str):
         return None
 
 
-def get_transactions(chain: str, safe_address: str, limit: int = 5):
-    """Get recent transactions for a Safe"""
+def get_transactions(chain: str, safe_address: str, limit: Optional[int] = 5):
+    """Get recent transactions for a Safe (limit=None walks the whole history)"""
     print("="*60)
     print(f"📜 Getting Transactions History")
     print("="*60)
     
-    url = f"{BASE_URL}/{chain}/api/v1/safes/{safe_address}/multisig-transactions/"
-    params = {"limit": limit, "ordering": "-nonce"}
+    params = {"ordering": "-nonce"}
     
-    response = requests.get(url, headers=HEADERS, params=params)
+    try:
+        results = list(CLIENT.iter_results(chain, f"safes/{safe_address}/multisig-transactions/",
+                                           params=params, max_items=limit or None))
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ Error fetching transactions: {e.response.status_code}")
+        print(f"Response: {e.response.text}\n")
+        return None
     
-    if response.status_code == 200:
-        data = response.json()
-        results = data.get('results', [])
-        
-        print(f"Found {data.get('count', 0)} total transactions")
-        print(f"Showing last {len(results)} transactions:\n")
-        
-        if results:
-            for i, tx in enumerate(results, 1):
-                print(f"Transaction #{i}:")
-                print(f"  To: {tx.get('to', 'N/A')}")
-                print(f"  Value: {int(tx.get('value', 0)) / 1e18} ETH")
-                print(f"  Executed: {'✅' if tx.get('isExecuted') else '⏳ Pending'}")
-                print(f"  Confirmations: {tx.get('confirmationsRequired', 0)}/{len(tx.get('confirmations', []))}")
-                print(f"  Safe Tx Hash: {tx.get('safeTxHash', 'N/A')[:20]}...")
-                print()
-        else:
-            print("No transactions found for this Safe.\n")
-        
-        return results
+    if not limit:
+        print(f"Found {len(results)} total transactions")
+    print(f"Showing last {len(results)} transactions:\n")
+    
+    if results:
+        for i, tx in enumerate(results, 1):
+            print(f"Transaction #{i}:")
+            print(f"  To: {tx.get('to', 'N/A')}")
+            print(f"  Value: {int(tx.get('value', 0)) / 1e18} ETH")
+            print(f"  Executed: {'✅' if tx.get('isExecuted') else '⏳ Pending'}")
+            print(f"  Confirmations: {tx.get('confirmationsRequired', 0)}/{len(tx.get('confirmations', []))}")
+            print(f"  Safe Tx Hash: {tx.get('safeTxHash', 'N/A')[:20]}...")
+            print()
     else:
-        print(f"❌ Error fetching transactions: {response.status_code}")
-        print(f"Response: {response.text}\n")
-        return None
+        print("No transactions found for this Safe.\n")
+    
+    return results
 
 
 def get_balances(chain: str, safe_address: str):
@@ -129,9 +122,7 @@ def get_balances(chain: str, safe_address: str):
     print(f"💰 Getting Safe Balances")
     print("="*60)
     
-    url = f"{BASE_URL}/{chain}/api/v1/safes/{safe_address}/balances/"
-    
-    response = requests.get(url, headers=HEADERS)
+    response = CLIENT.get_cached(chain, safe_address, "balances")
     
     if response.status_code == 200:
         balances = response.json()
@@ -167,32 +158,28 @@ def get_pending_transactions(chain: str, safe_address: str):
     print(f"⏳ Getting Pending Transactions")
     print("="*60)
     
-    url = f"{BASE_URL}/{chain}/api/v1/safes/{safe_address}/multisig-transactions/"
     params = {"executed": "false"}
     
-    response = requests.get(url, headers=HEADERS, params=params)
+    try:
+        results = list(CLIENT.iter_results(chain, f"safes/{safe_address}/multisig-transactions/", params))
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ Error: {e.response.status_code}")
+        return None
     
-    if response.status_code == 200:
-        data = response.json()
-        results = data.get('results', [])
-        
-        print(f"Found {len(results)} pending transaction(s)\n")
-        
-        if results:
-            for i, tx in enumerate(results, 1):
-                print(f"Pending Transaction #{i}:")
-                print(f"  To: {tx.get('to')}")
-                print(f"  Value: {int(tx.get('value', 0)) / 1e18} ETH")
-                print(f"  Confirmations: {len(tx.get('confirmations', []))}/{tx.get('confirmationsRequired')}")
-                print(f"  Missing: {tx.get('confirmationsRequired', 0) - len(tx.get('confirmations', []))} signature(s)")
-                print()
-        else:
-            print("✅ No pending transactions.\n")
-        
-        return results
+    print(f"Found {len(results)} pending transaction(s)\n")
+    
+    if results:
+        for i, tx in enumerate(results, 1):
+            print(f"Pending Transaction #{i}:")
+            print(f"  To: {tx.get('to')}")
+            print(f"  Value: {int(tx.get('value', 0)) / 1e18} ETH")
+            print(f"  Confirmations: {len(tx.get('confirmations', []))}/{tx.get('confirmationsRequired')}")
+            print(f"  Missing: {tx.get('confirmationsRequired', 0) - len(tx.get('confirmations', []))} signature(s)")
+            print()
     else:
-        print(f"❌ Error: {response.status_code}")
-        return None
+        print("✅ No pending transactions.\n")
+    
+    return results
 
 
 def main():
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+TTL Cache
+Thread-safe in-memory cache with per-entry expiry and request coalescing:
+concurrent lookups of the same missing key share a single load.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Load:
+    """A load in progress that other callers for the same key wait on."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class TTLCache:
+    """
+    Maps keys to values that expire after a per-entry time to live.
+    
+    get_or_load() calls the loader at most once per key at a time; callers
+    arriving while a load is running wait for it and receive the same value
+    (or exception). invalidate() drops entries and detaches running loads so
+    their result is not stored.
+    """
+    
+    def __init__(self):
+        self.entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self.loading: Dict[Hashable, _Load] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a fresh cached value.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+            return None
+    
+    def set(self, key: Hashable, value: Any, ttl: float):
+        """
+        Store a value.
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Seconds until the value expires
+        """
+        with self._lock:
+            self.entries[key] = (time.monotonic() + ttl, value)
+    
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], ttl: float,
+                    cache_if: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Get a cached value, loading it once if missing or expired.
+        
+        Args:
+            key: Cache key
+            loader: Called without arguments to produce the value
+            ttl: Seconds the loaded value stays fresh
+            cache_if: Predicate deciding whether a loaded value is stored
+                (e.g. only successful responses); waiting callers get it either way
+        
+        Returns:
+            Cached or freshly loaded value
+        
+        Raises:
+            Exception: Whatever the loader raised
+        """
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            load = self.loading.get(key)
+            leader = load is None
+            if leader:
+                self.misses += 1
+                load = self.loading[key] = _Load()
+            else:
+                self.coalesced += 1
+        
+        if not leader:
+            load.done.wait()
+            if load.error is not None:
+                raise load.error
+            return load.value
+        
+        try:
+            load.value = loader()
+        except BaseException as e:
+            load.error = e
+            raise
+        finally:
+            with self._lock:
+                # A load detached by invalidate() must not store its result
+                if self.loading.get(key) is load:
+                    del self.loading[key]
+                    if load.error is None and (cache_if is None or cache_if(load.value)):
+                        self.entries[key] = (time.monotonic() + ttl, load.value)
+            load.done.set()
+        return load.value
+    
+    def invalidate(self, predicate: Callable[[Hashable], bool]):
+        """
+        Drop every entry (and detach every running load) whose key matches.
+        
+        Args:
+            predicate: Called with each key; True drops it
+        """
+        with self._lock:
+            for key in [key for key in self.entries if predicate(key)]:
+                del self.entries[key]
+            for key in [key for key in self.loading if predicate(key)]:
+                del self.loading[key]
+    
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self.entries.clear()
+            self.loading.clear()
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Pending Transactions Watcher
+
+Long-running watch mode for the queues of one or more Safes. After an
+initial snapshot of each pending queue, every poll only asks the API for
+multisig transactions modified since the newest change seen so far
+(modified__gt high-water mark), and emits events when a transaction is
+proposed, gains confirmations or is executed. Polling speeds up while a Safe
+is active and slows down while it is idle.
+
+Usage:
+    python watch_pending.py --safe eth:0x... --safe base:0x... [--events events.jsonl]
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import requests
+
+from get_pending_transactions import CLIENT, SUPPORTED_CHAINS
+from pending_dashboard import load_safe_list, parse_safe_spec
+
+
+STATE_FILENAME = 'watch_state.json'
+
+# High-water mark of a Safe without any transaction yet
+EPOCH = '1970-01-01T00:00:00Z'
+
+
+class AdaptiveInterval:
+    """
+    Polling interval that drops to the minimum when something changed and
+    grows geometrically up to the maximum while nothing does.
+    """
+    
+    def __init__(self, minimum: float, maximum: float, growth: float = 1.5):
+        """
+        Initialize the interval.
+        
+        Args:
+            minimum: Interval in seconds right after activity
+            maximum: Upper bound in seconds while idle
+            growth: Factor applied after each quiet poll
+        """
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.growth = growth
+        self.current = minimum
+    
+    def update(self, active: bool) -> float:
+        """
+        Adjust the interval after a poll.
+        
+        Args:
+            active: Whether the poll found changes
+        
+        Returns:
+            Seconds until the next poll
+        """
+        if active:
+            self.current = self.minimum
+        else:
+            self.current = min(self.maximum, self.current * self.growth)
+        return self.current
+
+
+class SafeWatcher:
+    """
+    Tracks one Safe's queue between polls.
+    
+    `known` maps the safeTxHash of each pending transaction to the state
+    seen last (nonce and confirming owners); executed transactions are
+    dropped from it. `high_water` is the newest `modified` timestamp seen.
+    """
+    
+    def __init__(self, chain: str, safe_address: str, interval: AdaptiveInterval,
+                 state: Optional[Dict] = None):
+        """
+        Initialize the watcher.
+        
+        Args:
+            chain: Chain identifier
+            safe_address: Safe address
+            interval: Polling interval of this Safe
+            state: State saved by a previous run (see to_state)
+        """
+        self.chain = chain
+        self.safe_address = safe_address
+        self.interval = interval
+        self.high_water: Optional[str] = None
+        self.known: Dict[str, Dict] = {}
+        self.next_poll = 0.0
+        if state:
+            self.high_water = state.get('high_water')
+            self.known = state.get('known', {})
+    
+    @staticmethod
+    def state_key(chain: str, safe_address: str) -> str:
+        """Key of a Safe in the state file."""
+        return f"{chain}:{safe_address.lower()}"
+    
+    @property
+    def key(self) -> str:
+        return self.state_key(self.chain, self.safe_address)
+    
+    def to_state(self) -> Dict:
+        """Serializable state for the next run."""
+        return {'high_water': self.high_water, 'known': self.known}
+    
+    def event(self, event_type: str, tx: Dict, **details) -> Dict:
+        """Build an event record for a transaction."""
+        return dict({
+            'type': event_type,
+            'time': datetime.now().isoformat(),
+            'chain': self.chain,
+            'safe_address': self.safe_address,
+            'safe_tx_hash': tx.get('safeTxHash'),
+            'nonce': tx.get('nonce'),
+            'confirmations': len(tx.get('confirmations') or []),
+            'confirmations_required': tx.get('confirmationsRequired'),
+        }, **details)
+    
+    def track(self, tx: Dict):
+        """Remember a pending transaction's current state."""
+        self.known[tx['safeTxHash']] = {
+            'nonce': tx.get('nonce'),
+            'owners': [conf.get('owner') for conf in tx.get('confirmations') or []],
+        }
+    
+    def advance(self, tx: Dict):
+        """Move the high-water mark past a transaction's modification time."""
+        modified = tx.get('modified')
+        if modified and (self.high_water is None or modified > self.high_water):
+            self.high_water = modified
+    
+    def snapshot(self) -> List[Dict]:
+        """
+        Read the whole pending queue to start watching (no events).
+        
+        The high-water mark starts at the most recently modified transaction
+        of the Safe, read first so that nothing changing during the snapshot
+        is missed by the next poll. The state only changes once every page
+        has been read, so a failed snapshot is simply retried.
+        
+        Returns:
+            Empty list of events
+        """
+        path = f"safes/{self.safe_address}/multisig-transactions/"
+        latest = next(CLIENT.iter_results(self.chain, path, params={"ordering": "-modified"},
+                                          max_items=1), None)
+        pending = list(CLIENT.iter_results(self.chain, path, params={"executed": "false"}))
+        
+        self.high_water = (latest or {}).get('modified') or EPOCH
+        for tx in pending:
+            self.track(tx)
+        return []
+    
+    def poll(self) -> List[Dict]:
+        """
+        Fetch the transactions modified since the high-water mark and turn
+        them into events.
+        
+        All pages are read before `known` and `high_water` change, so a page
+        that fails leaves the state untouched and the next poll reads the
+        same changes again instead of losing the events of earlier pages.
+        
+        Returns:
+            Events in modification order
+        """
+        if self.high_water is None:
+            return self.snapshot()
+        
+        events = []
+        changes = list(CLIENT.iter_results(
+            self.chain, f"safes/{self.safe_address}/multisig-transactions/",
+            params={"modified__gt": self.high_water, "ordering": "modified"}))
+        for tx in changes:
+            safe_tx_hash = tx.get('safeTxHash')
+            previous = self.known.get(safe_tx_hash)
+            owners = [conf.get('owner') for conf in tx.get('confirmations') or []]
+            
+            if tx.get('isExecuted'):
+                events.append(self.event('executed', tx,
+                                         is_successful=tx.get('isSuccessful'),
+                                         transaction_hash=tx.get('transactionHash')))
+                # Other proposals for the same nonce can no longer execute
+                nonce = tx.get('nonce')
+                self.known = {key: known for key, known in self.known.items()
+                              if key != safe_tx_hash and (nonce is None or known['nonce'] is None
+                                                          or known['nonce'] > nonce)}
+            elif previous is None:
+                events.append(self.event('new_transaction', tx))
+                self.track(tx)
+            else:
+                added = [owner for owner in owners if owner not in previous['owners']]
+                if added:
+                    events.append(self.event('confirmation_added', tx, owners=added))
+                self.track(tx)
+            self.advance(tx)
+        return events
+
+
+def format_event(event: Dict) -> str:
+    """One-line description of an event."""
+    chain_name = SUPPORTED_CHAINS.get(event['chain'], event['chain'].upper())
+    prefix = f"[{event['time'][11:19]}] {chain_name} {event['safe_address'][:10]}… nonce {event['nonce']}"
+    progress = f"{event['confirmations']}/{event['confirmations_required']}"
+    if event['type'] == 'new_transaction':
+        return f"🆕 {prefix}: new transaction {event['safe_tx_hash'][:18]}… ({progress} confirmations)"
+    if event['type'] == 'confirmation_added':
+        return f"✍️ {prefix}: confirmed by {', '.join(event['owners'])} ({progress})"
+    status = '✅ succeeded' if event.get('is_successful') else '❌ failed'
+    return f"🚀 {prefix}: executed, {status} ({event.get('transaction_hash')})"
+
+
+def load_state(path: Path) -> Dict:
+    """Read the watcher state file, if any."""
+    if not path.exists():
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️ Ignoring unreadable state file {path}: {e}")
+        return {}
+
+
+def save_state(path: Path, watchers: List[SafeWatcher]):
+    """Write the high-water marks and tracked queues atomically."""
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({watcher.key: watcher.to_state() for watcher in watchers}, f, indent=2)
+    tmp_path.replace(path)
+
+
+def poll_watcher(watcher: SafeWatcher) -> List[Dict]:
+    """
+    Poll one Safe and schedule its next poll.
+    
+    Returns:
+        Events found (empty on errors, which slow the Safe's polling down)
+    """
+    try:
+        events = watcher.poll()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"⚠️ {watcher.key}: poll failed: {e}")
+        events = []
+    watcher.next_poll = time.monotonic() + watcher.interval.update(bool(events))
+    return events
+
+
+def watch(watchers: List[SafeWatcher], state_path: Path, events_path: Optional[str] = None,
+          once: bool = False):
+    """
+    Poll the Safes until interrupted, printing and recording events.
+    
+    Args:
+        watchers: One watcher per Safe
+        state_path: File keeping the high-water marks between runs
+        events_path: Optional JSONL file events are appended to
+        once: Poll every Safe a single time and return
+    """
+    events_file = open(events_path, 'a', encoding='utf-8') if events_path else None
+    try:
+        with ThreadPoolExecutor(max_workers=min(8, len(watchers))) as executor:
+            while True:
+                now = time.monotonic()
+                due = [watcher for watcher in watchers if watcher.next_poll <= now]
+                for events in executor.map(poll_watcher, due):
+                    for event in events:
+                        print(format_event(event))
+                        if events_file:
+                            events_file.write(json.dumps(event) + '\n')
+                            events_file.flush()
+                if due:
+                    save_state(state_path, watchers)
+                if once:
+                    return
+                time.sleep(max(0.0, min(watcher.next_poll for watcher in watchers) - time.monotonic()))
+    finally:
+        if events_file:
+            events_file.close()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Watch Safe queues and report new, confirmed and executed transactions'
+    )
+    parser.add_argument(
+        '--safe',
+        action='append',
+        default=[],
+        help='Safe to watch as chain:address (repeatable)'
+    )
+    parser.add_argument(
+        '--safes',
+        help='File with one chain:address per line'
+    )
+    parser.add_argument(
+        '--min-interval',
+        type=float,
+        default=5.0,
+        help='Seconds between polls of an active Safe (default: 5)'
+    )
+    parser.add_argument(
+        '--max-interval',
+        type=float,
+        default=120.0,
+        help='Upper bound in seconds between polls of an idle Safe (default: 120)'
+    )
+    parser.add_argument(
+        '--state',
+        default=STATE_FILENAME,
+        help=f'File keeping the high-water marks between runs (default: {STATE_FILENAME})'
+    )
+    parser.add_argument(
+        '--events',
+        help='Append events as JSON lines to this file'
+    )
+    parser.add_argument(
+        '--once',
+        action='store_true',
+        help='Poll every Safe once and exit (for cron)'
+    )
+    
+    args = parser.parse_args()
+    
+    try:
+        safes = [parse_safe_spec(spec) for spec in args.safe]
+        if args.safes:
+            safes.extend(load_safe_list(args.safes))
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if not safes:
+        parser.error('no Safes given (use --safe chain:address or --safes FILE)')
+    
+    state_path = Path(args.state)
+    state = load_state(state_path)
+    watchers = []
+    for chain, address in safes:
+        interval = AdaptiveInterval(args.min_interval, args.max_interval)
+        watchers.append(SafeWatcher(chain, address, interval,
+                                    state.get(SafeWatcher.state_key(chain, address))))
+    
+    print(f"👀 Watching {len(watchers)} Safe(s), polling every "
+          f"{args.min_interval:g}-{args.max_interval:g}s (Ctrl+C to stop)")
+    try:
+        watch(watchers, state_path, args.events, once=args.once)
+    except KeyboardInterrupt:
+        save_state(state_path, watchers)
+        print("\n✨ Stopped")
+
+
+if __name__ == '__main__':
+    main()